@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+'''
+This script measures the import time of myMain in fresh interpreters: as it is now, with its
+optional and heavy dependencies (tkinter, numpy, sqlite3, concurrent.futures, hashlib/xxhash)
+loaded on first use, as it is now with tkinter loaded eagerly, and the baseline module taken from
+git (the root commit by default), which imported all of them up front.
+
+Usage: python benchImport.py [number of runs] [baseline git revision]
+'''
+
+__author__  = 'Dr. GAO, Siyu'
+__version__ = '3.0.0'
+__date__    = '2026.10.17'
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CONST_INT_RUNS = 20
+
+# the statements timed in a fresh interpreter, after the interpreter start, and the module they import
+CONST_DICT_CASES = {
+    'lazy': ('current', 'import myMain'),
+    'eager tkinter': ('current', 'import myMain; myMain._loadTk()'),
+    'baseline': ('baseline', 'import myMain'),
+}
+
+CONST_STR_TIMER = ('import time; float_start = time.perf_counter(); {}; '
+                   'print(time.perf_counter() - float_start)')
+
+
+
+def floatTimeImport(str_stmt, str_dir):
+    '''
+    Return the seconds the statement takes in a fresh interpreter started in str_dir.
+    '''
+
+    # allow the bytecode cache, else every run compiles the module again
+    dict_env = dict(os.environ)
+
+    dict_env.pop('PYTHONDONTWRITEBYTECODE', None)
+
+    bytes_out = subprocess.check_output([sys.executable, '-c', CONST_STR_TIMER.format(str_stmt)],
+                                        cwd=str_dir, env=dict_env)
+
+    return float(bytes_out.decode().strip().splitlines()[-1])
+
+
+
+def strWriteBaseline(str_repo, str_rev, str_dir):
+    '''
+    Write myMain.py of the git revision str_rev into str_dir, and return str_dir. The revision
+    defaults to the root commit.
+    '''
+
+    if not str_rev:
+
+        str_rev = subprocess.check_output(['git', 'rev-list', '--max-parents=0', 'HEAD'],
+                                          cwd=str_repo).decode().split()[-1]
+
+    else:
+
+        pass
+
+    bytes_source = subprocess.check_output(['git', 'show', str_rev + ':myMain.py'], cwd=str_repo)
+
+    with open(os.path.join(str_dir, 'myMain.py'), 'wb') as fout:
+
+        fout.write(bytes_source)
+
+    return str_dir
+
+
+
+def main():
+
+    int_runs = int(sys.argv[1]) if len(sys.argv) > 1 else CONST_INT_RUNS
+
+    str_rev = sys.argv[2] if len(sys.argv) > 2 else ''
+
+    str_repo = os.path.dirname(os.path.abspath(__file__))
+
+    with tempfile.TemporaryDirectory() as str_dir_tmp:
+
+        dict_dir = {'current': str_repo, 'baseline': strWriteBaseline(str_repo, str_rev, str_dir_tmp)}
+
+        # warm up the file cache and the bytecode cache
+        for (str_module, str_stmt) in CONST_DICT_CASES.values():
+
+            floatTimeImport(str_stmt, dict_dir[str_module])
+
+        dict_median = {}
+
+        for (str_case, (str_module, str_stmt)) in CONST_DICT_CASES.items():
+
+            list_time = [floatTimeImport(str_stmt, dict_dir[str_module]) for i in range(int_runs)]
+
+            dict_median[str_case] = statistics.median(list_time)
+
+            print('{:<16}median {:8.2f} ms   min {:8.2f} ms   ({} runs)'.format(
+                str_case, dict_median[str_case] * 1000, min(list_time) * 1000, int_runs))
+
+    print('{:<16}{:8.2f} ms per import vs eager tkinter, {:8.2f} ms vs baseline'.format(
+        'saving', (dict_median['eager tkinter'] - dict_median['lazy']) * 1000,
+        (dict_median['baseline'] - dict_median['lazy']) * 1000))
+
+
+
+if __name__ == '__main__':
+
+    main()
@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+
+'''
+This module is written for Python 3.
+
+It provides awaitable counterparts of the file helpers in myMain for asyncio programs.
+'''
+
+__author__  = 'Dr. GAO, Siyu'
+__version__ = '3.0.0'
+__date__    = '2026.10.17'
+
+import asyncio
+import concurrent.futures
+import functools
+import time
+import weakref
+
+try:
+
+    from . import myMain
+
+except ImportError:
+
+    import myMain
+
+# default number of threads running the blocking helpers
+CONST_INT_MAX_WORKERS = 8
+
+# default max number of calls submitted (running or queued) at a time, per event loop
+CONST_INT_MAX_PENDING = 32
+
+# default number of paths fetched from the thread at a time by genPathRecursive
+CONST_INT_BATCH = 256
+
+_executor = None
+
+_int_max_workers = CONST_INT_MAX_WORKERS
+
+_int_max_pending = CONST_INT_MAX_PENDING
+
+# one semaphore per event loop
+_dict_semaphore = weakref.WeakKeyDictionary()
+
+
+
+# =============================================================================
+# <Function: configure the executor>
+# =============================================================================
+def setExecutor(int_max_workers=CONST_INT_MAX_WORKERS, int_max_pending=CONST_INT_MAX_PENDING):
+    '''
+    .. _setExecutor :
+
+    This function configures the bounded executor of this module. The current executor (if any)
+    is shut down without waiting; its running calls still complete.
+
+    All the helpers of this module run the blocking myMain helpers in a shared thread pool.
+    At most int_max_pending calls per event loop are submitted to the pool at a time; further
+    calls wait (asynchronously) for a free slot, so a burst of housekeeping cannot flood the
+    pool and the memory.
+
+    Parameters
+    ----------
+    int_max_workers : int
+        The number of threads. Default = CONST_INT_MAX_WORKERS
+
+    int_max_pending : int
+        The max number of calls submitted at a time, per event loop.
+
+        Default = CONST_INT_MAX_PENDING
+
+    Returns
+    -------
+    None
+    '''
+
+    global _executor, _int_max_workers, _int_max_pending
+
+    if _executor is not None:
+
+        _executor.shutdown(wait=False)
+
+    else:
+
+        pass
+
+    _executor = None
+
+    _int_max_workers = int_max_workers
+
+    _int_max_pending = int_max_pending
+
+    _dict_semaphore.clear()
+# =============================================================================
+# </Function: configure the executor>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: shut down the executor>
+# =============================================================================
+def shutdown(bool_wait=True):
+    '''
+    .. _shutdown :
+
+    This function shuts down the executor of this module. A new one is created on the next call.
+
+    Parameters
+    ----------
+    bool_wait : bool
+        Whether to wait for the running calls. Default = True
+
+    Returns
+    -------
+    None
+    '''
+
+    global _executor
+
+    if _executor is not None:
+
+        _executor.shutdown(wait=bool_wait, cancel_futures=True)
+
+    else:
+
+        pass
+
+    _executor = None
+# =============================================================================
+# </Function: shut down the executor>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: run a blocking function in the bounded executor>
+# =============================================================================
+async def run(func, *args, **kwargs):
+    '''
+    .. _run :
+
+    This function runs a blocking function in the bounded executor and returns its result.
+
+    If the awaiting task is cancelled before the call is started by a thread, the call is
+    never run. A call already running in a thread cannot be interrupted; it completes in the
+    background, but the awaiting task is cancelled right away.
+
+    Parameters
+    ----------
+    func : callable
+        The blocking function.
+
+    *args, **kwargs :
+        The arguments of the function.
+
+    Returns
+    -------
+    The result of the function.
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> await myAsync.run(myMain.intFileReplace, {'foo': 'bar'}, 'c:/dump.xml')
+        1024
+        >>>
+    '''
+
+    global _executor
+
+    loop = asyncio.get_running_loop()
+
+    if _executor is None:
+
+        _executor = concurrent.futures.ThreadPoolExecutor(max_workers=_int_max_workers,
+                                                          thread_name_prefix='myAsync')
+
+    else:
+
+        pass
+
+    if loop not in _dict_semaphore:
+
+        _dict_semaphore[loop] = asyncio.Semaphore(_int_max_pending)
+
+    else:
+
+        pass
+
+    # backpressure, wait for a free slot before submitting
+    async with _dict_semaphore[loop]:
+
+        return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+# =============================================================================
+# </Function: run a blocking function in the bounded executor>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: awaitable file helpers>
+# =============================================================================
+async def deleteFile(str_filepath, bool_verbose=False):
+    '''
+    .. _deleteFile :
+
+    Awaitable myMain.deleteFile.
+    '''
+
+    return await run(myMain.deleteFile, str_filepath, bool_verbose=bool_verbose)
+
+
+
+async def deleteDir(str_dir_path, bool_verbose=False, int_threads=1):
+    '''
+    .. _deleteDir :
+
+    Awaitable myMain.deleteDir.
+    '''
+
+    return await run(myMain.deleteDir, str_dir_path, bool_verbose=bool_verbose, int_threads=int_threads)
+
+
+
+async def deleteAll(str_dir_path, bool_also_dir=False, int_threads=1):
+    '''
+    .. _deleteAll :
+
+    Awaitable myMain.deleteAll.
+    '''
+
+    return await run(myMain.deleteAll, str_dir_path, bool_also_dir=bool_also_dir, int_threads=int_threads)
+
+
+
+async def dictDeleteTree(str_dir_path, bool_also_dir=True, bool_keep_root=True, bool_count_bytes=False,
+                         int_threads=None):
+    '''
+    .. _dictDeleteTree :
+
+    Awaitable myMain.dictDeleteTree.
+    '''
+
+    return await run(myMain.dictDeleteTree, str_dir_path, bool_also_dir=bool_also_dir,
+                     bool_keep_root=bool_keep_root, bool_count_bytes=bool_count_bytes, int_threads=int_threads)
+
+
+
+async def boolMakeDir(str_dir):
+    '''
+    .. _boolMakeDir :
+
+    Awaitable myMain.boolMakeDir.
+    '''
+
+    return await run(myMain.boolMakeDir, str_dir)
+
+
+
+async def csvConcat(list_csv_file, str_path_out, bool_check_header=False, int_threads=None):
+    '''
+    .. _csvConcat :
+
+    Awaitable myMain.csvConcat.
+    '''
+
+    return await run(myMain.csvConcat, list_csv_file, str_path_out, bool_check_header=bool_check_header,
+                     int_threads=int_threads)
+
+
+
+async def listGetPathRecursive(str_scr, str_filter, str_path_index=''):
+    '''
+    .. _listGetPathRecursive :
+
+    Awaitable myMain.listGetPathRecursive.
+    '''
+
+    return await run(myMain.listGetPathRecursive, str_scr, str_filter, str_path_index=str_path_index)
+# =============================================================================
+# </Function: awaitable file helpers>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: asynchronously generate all file paths with filters>
+# =============================================================================
+async def genPathRecursive(str_scr, list_include=('*',), list_exclude=(), list_prune=(), int_threads=1,
+                           int_batch=CONST_INT_BATCH):
+    '''
+    .. _genPathRecursive :
+
+    Asynchronous generator counterpart of myMain.genPathRecursive.
+
+    The paths are fetched from the walk in the executor int_batch at a time, so the walk can be
+    cancelled between batches. The walk is stopped when the generator is closed or cancelled.
+
+    Parameters
+    ----------
+    See myMain.genPathRecursive.
+
+    int_batch : int
+        The number of paths fetched at a time. Default = CONST_INT_BATCH
+
+    Returns
+    -------
+    async generator :
+        The file paths found.
+
+    Examples
+    --------
+    .. code:: python
+
+        async for str_path in myAsync.genPathRecursive(str_dir, ['*.log']):
+
+            await handle(str_path)
+    '''
+
+    gen_paths = myMain.genPathRecursive(str_scr, list_include=list_include, list_exclude=list_exclude,
+                                        list_prune=list_prune, int_threads=int_threads)
+
+    try:
+
+        while True:
+
+            list_paths = await run(_listNextBatch, gen_paths, int_batch)
+
+            for i in list_paths:
+
+                yield i
+
+            if len(list_paths) < int_batch:
+
+                break
+
+            else:
+
+                pass
+
+    finally:
+
+        # the generator may still be running a batch in a thread if cancelled
+        await asyncio.shield(run(_closeWhenIdle, gen_paths))
+
+
+
+def _listNextBatch(gen_paths, int_batch):
+    '''
+    Return the next int_batch items of a generator. Run in the executor.
+    '''
+
+    list_temp = []
+
+    for i in gen_paths:
+
+        list_temp.append(i)
+
+        if len(list_temp) >= int_batch:
+
+            break
+
+        else:
+
+            pass
+
+    return list_temp
+
+
+
+def _closeWhenIdle(gen_paths):
+    '''
+    Close a generator, waiting until it is not running. Run in the executor.
+    '''
+
+    while True:
+
+        try:
+
+            gen_paths.close()
+
+            return
+
+        except ValueError:
+
+            # generator already executing in another thread
+            time.sleep(0.01)
+# =============================================================================
+# </Function: asynchronously generate all file paths with filters>
+# =============================================================================
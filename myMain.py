@@ -8,25 +8,291 @@ __author__  = 'Dr. GAO, Siyu'
 __version__ = '3.0.0'
 __date__    = '2019.08.19'
 
-import os, csv
+import os, csv, sys
 import time
 import re
 import shutil
 import subprocess
-import tkinter as tk
-import tkinter.filedialog as fileDialog
-import tkinter.messagebox as msgbox
-import tkinter.simpledialog
-from collections import defaultdict
-
-from functools import wraps
+import heapq
+import tempfile
+import io
+import locale
+import zlib
+import mmap
+import struct
+import select
+import threading
+import math
+import errno
+import bisect
+import itertools
+from collections import defaultdict, namedtuple
+from itertools import groupby
+
+from functools import wraps, lru_cache
 
 
 import fnmatch
 from random import *
+from array import array
+from operator import itemgetter
 
 CONST_STR_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
 
+# Excel sheet size
+CONST_INT_EXCEL_ROWS = 1048576
+
+CONST_INT_EXCEL_COLS = 16384
+
+# default memory cap (bytes) of the external (on-disk) sorting and diffing
+CONST_INT_MAX_MEMORY = 64 * 1024 * 1024
+
+# max number of on-disk runs merged at once by the external sorting
+CONST_INT_MAX_RUNS = 128
+
+# default number of distinct items the duplicate detection is sized for
+CONST_INT_DEDUPE_CAPACITY = 1024 * 1024
+
+# standard modules only some functions need, imported on first use, see _loadModule
+dict_module = {}
+
+# optional numpy, imported on first use, see _loadNumpy. None = not installed or not loaded yet
+np = None
+
+bool_numpy_loaded = False
+
+# 128-bit digest of bytes, xxhash if installed else hashlib, chosen on first use, see _loadDigest
+func_digest = None
+
+# tkinter modules, imported on first use of a dialogue, see _loadTk
+tk = None
+
+fileDialog = None
+
+msgbox = None
+
+simpleDialog = None
+
+# answers of the dialogues without GUI, see boolHeadless. None = not set, use the environment
+dict_headless = {'headless': None, 'yesno': None, 'int': None, 'open': None, 'dir': None, 'save': None}
+
+
+
+# =============================================================================
+# <Function: optional dependencies>
+# =============================================================================
+def _loadModule(str_name):
+    '''
+    Import a module on first use, so importing this module does not load it, e.g.
+    _loadModule('sqlite3'). Return the module.
+    '''
+
+    module = dict_module.get(str_name)
+
+    if module is None:
+
+        __import__(str_name)
+
+        module = sys.modules[str_name]
+
+        dict_module[str_name] = module
+
+    else:
+
+        pass
+
+    return module
+
+
+
+def _loadNumpy():
+    '''
+    Import numpy on first use, so importing this module does not load it. Return numpy, or None if
+    it is not installed.
+    '''
+
+    global np, bool_numpy_loaded
+
+    if not bool_numpy_loaded:
+
+        try:
+
+            import numpy
+
+            np = numpy
+
+        except ImportError:
+
+            np = None
+
+        bool_numpy_loaded = True
+
+    else:
+
+        pass
+
+    return np
+
+
+
+def _boolNdarray(obj):
+    '''
+    Return whether obj is a numpy array. numpy is not imported for this unless the caller has
+    imported it, since obj cannot be an array otherwise.
+    '''
+
+    return ('numpy' in sys.modules) and (_loadNumpy() is not None) and isinstance(obj, np.ndarray)
+
+
+
+def _loadDigest():
+    '''
+    Choose the 128-bit digest of the duplicate detection on first use: xxhash (xxh3_128) if
+    installed, else hashlib.blake2b.
+    '''
+
+    global func_digest
+
+    if func_digest is None:
+
+        try:
+
+            import xxhash
+
+            func_digest = xxhash.xxh3_128_intdigest
+
+        except ImportError:
+
+            import hashlib
+
+            func_blake2b = hashlib.blake2b
+
+            func_digest = lambda bytes_item: int.from_bytes(func_blake2b(bytes_item, digest_size=16).digest(), 'little')
+
+    else:
+
+        pass
+# =============================================================================
+# </Function: optional dependencies>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: GUI dependencies and headless mode>
+# =============================================================================
+def _loadTk():
+    '''
+    Import the tkinter modules on first use, so importing this module does not load Tk.
+    '''
+
+    global tk, fileDialog, msgbox, simpleDialog
+
+    if tk is None:
+
+        import tkinter
+        import tkinter.filedialog
+        import tkinter.messagebox
+        import tkinter.simpledialog
+
+        (fileDialog, msgbox, simpleDialog) = (tkinter.filedialog, tkinter.messagebox, tkinter.simpledialog)
+
+        tk = tkinter
+
+    else:
+
+        pass
+
+
+
+def boolHeadless():
+    '''
+    .. _boolHeadless :
+
+    This function returns whether the dialogues run without GUI. Without GUI, promptMsg prints
+    to stderr and the other dialogues return the answers set in dict_headless, or else in the
+    environment variables MYLIB_ANSWER_<KEY> (e.g. MYLIB_ANSWER_YESNO=1), or else cancel.
+
+    ======  ===================================  =====================================
+    key     dialogue                             answer
+    ======  ===================================  =====================================
+    yesno   boolMsgYesno                         1/true/yes/y/on, else False
+    int     intAskInt                            an int, else None
+    open    listFileDialog                       the path(s), separated by '|'
+    dir     strDirDialog                         the path
+    save    strSaveAsDialog                      the path
+    ======  ===================================  =====================================
+
+    The mode is dict_headless['headless'] if set, else the environment variable MYLIB_HEADLESS
+    if set (0/false/no/off = GUI), else headless if tkinter cannot be imported, or if there is
+    no display on Linux (neither DISPLAY nor WAYLAND_DISPLAY).
+
+    Returns
+    -------
+    bool :
+        True = no GUI; False = tk dialogues.
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> dict_headless.update({'headless': True, 'yesno': True})
+        >>> boolMsgYesno('Overwrite', 'Overwrite the file?')
+        True
+        >>>
+    '''
+
+    if dict_headless['headless'] is not None:
+
+        return bool(dict_headless['headless'])
+
+    else:
+
+        pass
+
+    str_env = os.environ.get('MYLIB_HEADLESS', '')
+
+    if str_env:
+
+        return str_env.lower() not in ('0', 'false', 'no', 'off')
+
+    elif sys.platform.startswith('linux') and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+
+        return True
+
+    else:
+
+        pass
+
+    try:
+
+        _loadTk()
+
+    except ImportError:
+
+        return True
+
+    return False
+
+
+
+def _strHeadlessAnswer(str_key):
+    '''
+    Return the headless answer of a dialogue as a str, '' if not set.
+    '''
+
+    if dict_headless[str_key] is not None:
+
+        return str(dict_headless[str_key])
+
+    else:
+
+        return os.environ.get('MYLIB_ANSWER_' + str_key.upper(), '')
+# =============================================================================
+# </Function: GUI dependencies and headless mode>
+# =============================================================================
+
+
 # =============================================================================
 # <Function: file select dialogue>
 # =============================================================================
@@ -72,6 +338,22 @@ def listFileDialog(bool_multi=False, str_init_dir=os.getcwd(), str_title='', lis
         str_paths = gsyMain.listFileDialog(bool_multi=True, str_init_dir=os.getcwd(), str_title='Choose SAV, DYR and SLD files')
     """
 
+    if boolHeadless():
+
+        str_path = _strHeadlessAnswer('open')
+
+        if bool_multi == False:
+
+            return str_path.split('|')
+
+        else:
+
+            return [i for i in str_path.split('|') if i]
+
+    else:
+
+        _loadTk()
+
     try:
 
         root = tk.Tk()
@@ -283,6 +565,14 @@ def strDirDialog(str_title='', str_init_dir=os.getcwd(), bool_mustexist=True):
         str_path_export = gsyMain.strDirDialog(str_title='Select an export folder')
     """
 
+    if boolHeadless():
+
+        return _strHeadlessAnswer('dir')
+
+    else:
+
+        _loadTk()
+
     try:
 
         root = tk.Tk()
@@ -356,6 +646,14 @@ def strSaveAsDialog(str_title='', str_init_dir=os.getcwd(), str_ext='', list_fil
         str_path_xlsx = gsyMain.strSaveAsDialog(str_title='XLSX save as', list_filetypes=list_filter, str_ext='.xlsx')
     """
 
+    if boolHeadless():
+
+        return _strHeadlessAnswer('save')
+
+    else:
+
+        _loadTk()
+
     try:
 
         root = tk.Tk()
@@ -550,6 +848,17 @@ def promptMsg(str_title='', str_msg='', str_type='info'):
 
         gsyMain.promptMsg('message title', 'message body', 'err')
     """
+    # no GUI, print the message-----------------------------------------------#
+    if boolHeadless():
+
+        print('[' + str_type + '] ' + str_title + ': ' + str_msg, file=sys.stderr)
+
+        return
+
+    else:
+
+        _loadTk()
+
     # make tk main window-----------------------------------------------------#
     root = tk.Tk()
 
@@ -787,7 +1096,7 @@ def deleteFile(str_filepath, bool_verbose=False):
 # =============================================================================
 # <Function: delete folder>
 # =============================================================================
-def deleteDir(str_dir_path, bool_verbose=False):
+def deleteDir(str_dir_path, bool_verbose=False, int_threads=1):
     """
     .. _deleteDir :
     
@@ -798,6 +1107,11 @@ def deleteDir(str_dir_path, bool_verbose=False):
     str_dir_path : str
         The path of the directory.
 
+    int_threads : int
+        If larger than 1, the directory is deleted by dictDeleteTree with this many threads.
+
+        Default = 1 (shutil.rmtree)
+
     Returns
     -------
     boolean :
@@ -816,7 +1130,33 @@ def deleteDir(str_dir_path, bool_verbose=False):
 
     try:
 
-        if os.path.isdir(str_dir_path):
+        if os.path.isdir(str_dir_path) and (int_threads > 1):
+
+            dict_report = dictDeleteTree(str_dir_path, bool_keep_root=False, int_threads=int_threads)
+
+            for (str_path, str_error) in dict_report['errors']:
+
+                print(str_error)
+
+            if dict_report['errors']:
+
+                return False
+
+            else:
+
+                pass
+
+            if bool_verbose:
+
+                print(('Direcotry deleted : ' + str_dir_path))
+
+            else:
+
+                pass
+
+            return True
+
+        elif os.path.isdir(str_dir_path):
 
             shutil.rmtree(str_dir_path)
 
@@ -848,12 +1188,14 @@ def deleteDir(str_dir_path, bool_verbose=False):
 # =============================================================================
 # <Function: delete all>
 # =============================================================================
-def deleteAll(str_dir_path, bool_also_dir=False):
+def deleteAll(str_dir_path, bool_also_dir=False, int_threads=1):
     """
     .. _deleteDir :
     
     Delete all files under a directory. Optionally delete all subdirectories and their files.
 
+    The deletion is done by dictDeleteTree. The errors on single entries are printed.
+
     Parameters
     ----------
     str_dir_path : str
@@ -867,6 +1209,11 @@ def deleteAll(str_dir_path, bool_also_dir=False):
 
         Default = False
 
+    int_threads : int
+        The number of threads deleting the subdirectories in parallel.
+
+        Default = 1
+
     Returns
     -------
     boolean :
@@ -885,27 +1232,11 @@ def deleteAll(str_dir_path, bool_also_dir=False):
 
     try:
 
-        for i in os.listdir(str_dir_path):
-
-            str_temp = os.path.join(str_dir_path, i)
-
-            if os.path.isfile(str_temp):
-
-                    deleteFile(str_temp)
+        dict_report = dictDeleteTree(str_dir_path, bool_also_dir=bool_also_dir, int_threads=int_threads)
 
-            else:
-
-                pass
-
-            if bool_also_dir:
-
-                if os.path.isdir(str_temp):
-
-                    deleteDir(str_temp)
-
-            else:
+        for (str_path, str_error) in dict_report['errors']:
 
-               pass
+            print(str_error)
 
         return True
 
@@ -921,1420 +1252,7385 @@ def deleteAll(str_dir_path, bool_also_dir=False):
 
 
 # =============================================================================
-# <Function: get all file paths with filter>
+# <Function: bulk delete a directory tree>
 # =============================================================================
-def listGetPathRecursive(str_scr, str_filter):
-    '''
-    .. _listGetPathRecursive :
-    
-    This function walks every sub dir inside the given source dir and returns the 
-    files' paths that matches the file filter.
+def dictDeleteTree(str_dir_path, bool_also_dir=True, bool_keep_root=True, bool_count_bytes=False, int_threads=None):
+    """
+    .. _dictDeleteTree :
 
-    Parameters
-    ----------
-    str_scr : str
-        The given source dir.
+    Delete the contents of a directory tree in bulk, and return a report.
 
-    str_filter : str
-        The file filter. Need to be in the format of '*.filter'.
+    First, the files of every directory are deleted, with the directories processed in parallel
+    by a thread pool, depth first and at most two queued per thread. The entry types are taken
+    from os.scandir, so no extra stat is needed, and where supported the files are unlinked
+    relative to an opened directory fd. Then the emptied directories are removed, deepest first.
+    Symbolic links are deleted, never followed.
 
-    Returns
-    -------
-    list_paths : list
-        The list containing all the file paths found. Or
-        and empty list.
+    A directory fd is kept open for opening its sub dirs only while the fds kept open stay under
+    half of the soft RLIMIT_NOFILE (less two per thread); past that, its sub dirs are opened by
+    path, still without following symlinks and checked against the identity the parent found.
 
-    Example
-    -------
-    .. code:: python
+    An error on a single entry does not stop the deletion; it is collected in the report.
 
-        >>> str_dir = '.../Global variables'
-        >>> listGetPathRecursive(str_dir, '*.txt')
-        ['.../Global variables\\Strong\\Strong_A_for_PSCAD.txt', '.../Global variables\\Strong\\Strong_B_for_PSCAD.txt']
-        >>> listGetPathRecursive(str_dir, '*.add')
-        []
-        >>> listGetPathRecursive(str_dir, 'txt')
-        []
-        >>>
-    '''
+    Parameters
+    ----------
+    str_dir_path : str
+        The path of the directory.
 
+    bool_also_dir : boolean
+        Whether to delete all subdirectories and their files. If False, only the files directly
+        under the directory are deleted.
 
-    bool_temp = boolPathExists(str_scr, bool_dir=True)
+        Default = True
 
-    if bool_temp:
+    bool_keep_root : boolean
+        Whether to keep the (emptied) directory itself.
 
-        list_paths = []
+        Default = True
 
-        for root, dirnames, filenames in os.walk(str_scr):
+    bool_count_bytes : boolean
+        Whether to count the bytes freed. This costs one stat per file.
 
-            for filename in fnmatch.filter(filenames, str_filter):
+        Default = False
 
-                list_paths.append(os.path.join(root, filename))
+    int_threads : int
+        The number of threads. Default = None (ThreadPoolExecutor default)
 
-        return list_paths
+    Returns
+    -------
+    dict_report : dict
+        'files' : int, the number of files (and links) deleted.
+
+        'dirs' : int, the number of directories deleted.
+
+        'bytes' : int, the bytes freed (0 if not bool_count_bytes).
+
+        'errors' : list, the tuples of (str_path, str_error) of the failures.
+
+    Raises
+    ----------
+    OSError :
+        When the directory itself cannot be listed, or when the process runs out of fds
+        (EMFILE / ENFILE), which would otherwise leave entries behind.
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> dictDeleteTree(r'c:/scratch', int_threads=16)
+        {'files': 4000000, 'dirs': 20000, 'bytes': 0, 'errors': []}
+        >>>
+    """
+
+    dict_report = {'files': 0, 'dirs': 0, 'bytes': 0, 'errors': []}
+
+    # raise if the directory itself cannot be listed
+    os.scandir(str_dir_path).close()
+
+    # in the order found, parents before children
+    list_dirs = []
+
+    def update(tuple_result):
+
+        (int_files, int_bytes, list_errors, list_subdirs) = tuple_result
+
+        dict_report['files'] = dict_report['files'] + int_files
+
+        dict_report['bytes'] = dict_report['bytes'] + int_bytes
+
+        dict_report['errors'].extend(list_errors)
+
+        list_dirs.extend(i[0] for i in list_subdirs)
+
+        return list_subdirs
+
+    # depth first, so the sub dirs waiting hold the fds of few parents
+    list_stack = [(str_dir_path, None, None)]
+
+    if (not bool_also_dir) or (int_threads == 1):
+
+        semaphore_fd = threading.BoundedSemaphore(_intFdBudget(1))
+
+        try:
+
+            while list_stack:
+
+                list_stack.extend(update(_tupleDeleteFiles(list_stack.pop(), bool_also_dir, bool_count_bytes,
+                                                           semaphore_fd)))
+
+        finally:
+
+            _releaseSubdirs(list_stack)
+
+    else:
+
+        futures = _loadModule('concurrent.futures')
+
+        int_workers = int_threads if int_threads else min(32, (os.cpu_count() or 1) + 4)
+
+        semaphore_fd = threading.BoundedSemaphore(_intFdBudget(int_workers))
+
+        set_pending = set()
+
+        with futures.ThreadPoolExecutor(max_workers=int_workers) as executor:
+
+            try:
+
+                while list_stack or set_pending:
+
+                    # a bounded window, so each wait is cheap however wide the tree is
+                    while list_stack and (len(set_pending) < int_workers * 2):
+
+                        set_pending.add(executor.submit(_tupleDeleteFiles, list_stack.pop(), bool_also_dir,
+                                                        bool_count_bytes, semaphore_fd))
+
+                    (set_done, set_pending) = futures.wait(set_pending, return_when=futures.FIRST_COMPLETED)
+
+                    for future in set_done:
+
+                        list_stack.extend(update(future.result()))
+
+            finally:
+
+                # on an error, close the fds the sub dirs not yet opened still hold
+                for future in futures.as_completed(set_pending):
+
+                    if future.exception() is None:
+
+                        _releaseSubdirs(future.result()[3])
+
+                    else:
+
+                        pass
+
+                _releaseSubdirs(list_stack)
+
+    if not bool_keep_root:
+
+        list_dirs.insert(0, str_dir_path)
+
+    else:
+
+        pass
+
+    # children before parents
+    for str_dir in reversed(list_dirs):
+
+        try:
+
+            os.rmdir(str_dir)
+
+            dict_report['dirs'] = dict_report['dirs'] + 1
+
+        except OSError as e:
+
+            dict_report['errors'].append((str_dir, str(e)))
+
+    return dict_report
+
+
+
+def _intFdBudget(int_workers):
+    """
+    Return how many directory fds dictDeleteTree may keep open for opening sub dirs: half of the
+    soft RLIMIT_NOFILE, less two per thread for the fd and the os.scandir dup each one has open.
+    """
+
+    try:
+
+        resource = _loadModule('resource')
+
+        int_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+        if int_limit == resource.RLIM_INFINITY:
+
+            int_limit = 65536
+
+        else:
+
+            pass
+
+    except ImportError:
+
+        # no rlimit (Windows), where the dir_fd functions are not supported anyway
+        int_limit = 512
+
+    return max(0, int_limit // 2 - 2 * int_workers)
+
+
+
+def _releaseSubdirs(list_subdirs):
+    """
+    Release the parent fds held by sub dir tuples that will not be opened.
+    """
+
+    for (str_dir, dir_fd_parent, tuple_id) in list_subdirs:
+
+        if dir_fd_parent is not None:
+
+            dir_fd_parent.release()
+
+        else:
+
+            pass
+
+
+
+def _tupleDeleteFiles(tuple_dir, bool_also_dir, bool_count_bytes, semaphore_fd):
+    """
+    Delete the files directly under a directory. Run in the thread pool of dictDeleteTree.
+
+    The tuple_dir is the path, the _DirFd of the parent and the (st_dev, st_ino) the parent
+    found, or (path, None, None) for the root. Where the dir_fd functions are supported, a sub
+    dir is opened without following symlinks, and only deleted from if it is still the
+    directory the parent found, so a directory swapped for a symlink during the deletion is
+    never followed out of the tree. It is opened relative to the parent fd if the parent could
+    keep its fd open (a slot of semaphore_fd), else by path (parent None).
+
+    Returns a tuple of the number of files, the bytes freed, the errors and the sub dir tuples.
+    EMFILE / ENFILE are raised, not collected.
+    """
+
+    (str_dir, dir_fd_parent, tuple_id) = tuple_dir
+
+    int_files = 0
+
+    int_bytes = 0
+
+    list_errors = []
+
+    list_subdirs = []
+
+    bool_dir_fd = (os.unlink in os.supports_dir_fd) and (os.scandir in os.supports_fd) \
+                  and (os.stat in os.supports_dir_fd)
+
+    dir_fd = None
+
+    bool_keep_fd = None
+
+    try:
+
+        if bool_dir_fd:
+
+            int_flag = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0)
+
+            if tuple_id is None:
+
+                int_fd = os.open(str_dir, int_flag)
+
+            elif dir_fd_parent is None:
+
+                int_fd = os.open(str_dir, int_flag | getattr(os, 'O_NOFOLLOW', 0))
+
+            else:
+
+                try:
+
+                    int_fd = os.open(os.path.basename(str_dir), int_flag | getattr(os, 'O_NOFOLLOW', 0),
+                                     dir_fd=dir_fd_parent.int_fd)
+
+                finally:
+
+                    dir_fd_parent.release()
+
+            if tuple_id is not None:
+
+                try:
+
+                    stat = os.fstat(int_fd)
+
+                    if (stat.st_dev, stat.st_ino) != tuple_id:
+
+                        raise OSError('Directory replaced during the deletion: ' + str_dir)
+
+                    else:
+
+                        pass
+
+                except OSError:
+
+                    os.close(int_fd)
+
+                    raise
+
+            dir_fd = _DirFd(int_fd)
+
+            iter_entry = os.scandir(int_fd)
+
+        else:
+
+            iter_entry = os.scandir(str_dir)
+
+        with iter_entry:
+
+            for entry in iter_entry:
+
+                str_path = os.path.join(str_dir, entry.name)
+
+                try:
+
+                    if bool_also_dir and entry.is_dir(follow_symlinks=False):
+
+                        if dir_fd is not None:
+
+                            stat = entry.stat(follow_symlinks=False)
+
+                            # keep the fd open for the sub dirs only if a slot of the fd budget is free
+                            if bool_keep_fd is None:
+
+                                bool_keep_fd = dir_fd.boolTakeSlot(semaphore_fd)
+
+                            else:
+
+                                pass
+
+                            if bool_keep_fd:
+
+                                # kept open until the sub dir is opened
+                                dir_fd.acquire()
+
+                                list_subdirs.append((str_path, dir_fd, (stat.st_dev, stat.st_ino)))
+
+                            else:
+
+                                list_subdirs.append((str_path, None, (stat.st_dev, stat.st_ino)))
+
+                        else:
+
+                            list_subdirs.append((str_path, None, None))
+
+                        continue
+
+                    elif (not bool_also_dir) and entry.is_dir():
+
+                        continue
+
+                    else:
+
+                        pass
+
+                    if bool_count_bytes:
+
+                        int_size = entry.stat(follow_symlinks=False).st_size
+
+                    else:
+
+                        int_size = 0
+
+                    if dir_fd is not None:
+
+                        os.unlink(entry.name, dir_fd=dir_fd.int_fd)
+
+                    else:
+
+                        os.unlink(str_path)
+
+                    int_files = int_files + 1
+
+                    int_bytes = int_bytes + int_size
+
+                except OSError as e:
+
+                    list_errors.append((str_path, str(e)))
+
+    except OSError as e:
+
+        # out of fds, the directory would be left behind
+        if e.errno in (errno.EMFILE, errno.ENFILE):
+
+            _releaseSubdirs(list_subdirs)
+
+            raise
+
+        else:
+
+            list_errors.append((str_dir, str(e)))
+
+    finally:
+
+        if dir_fd is not None:
+
+            dir_fd.release()
+
+        else:
+
+            pass
+
+    return (int_files, int_bytes, list_errors, list_subdirs)
+
+
+
+class _DirFd(object):
+    """
+    A directory fd shared by the deletion of a directory and of its sub dirs, closed when the
+    last of them releases it.
+    """
+
+    def __init__(self, int_fd):
+
+        self.int_fd = int_fd
+
+        self._int_refs = 1
+
+        self._lock = threading.Lock()
+
+        # the slot of the fd budget taken, released on close
+        self._semaphore = None
+
+    def boolTakeSlot(self, semaphore_fd):
+
+        if semaphore_fd.acquire(blocking=False):
+
+            self._semaphore = semaphore_fd
+
+            return True
+
+        else:
+
+            return False
+
+    def acquire(self):
+
+        with self._lock:
+
+            self._int_refs = self._int_refs + 1
+
+    def release(self):
+
+        with self._lock:
+
+            self._int_refs = self._int_refs - 1
+
+            if self._int_refs == 0:
+
+                os.close(self.int_fd)
+
+                if self._semaphore is not None:
+
+                    self._semaphore.release()
+
+                else:
+
+                    pass
+
+            else:
+
+                pass
+# =============================================================================
+# </Function: bulk delete a directory tree>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: get all file paths with filter>
+# =============================================================================
+def listGetPathRecursive(str_scr, str_filter, str_path_index=''):
+    '''
+    .. _listGetPathRecursive :
+    
+    This function walks every sub dir inside the given source dir and returns the 
+    files' paths that matches the file filter.
+
+    Parameters
+    ----------
+    str_scr : str
+        The given source dir.
+
+    str_filter : str
+        The file filter. Need to be in the format of '*.filter'.
+
+    str_path_index : str
+        The full file path of a persistent file index (see genPathIndexed). If given, only the
+        directories changed since the last call are rescanned.
+
+        Default = '' (no index)
+
+    Returns
+    -------
+    list_paths : list
+        The list containing all the file paths found. Or
+        and empty list.
+
+    Example
+    -------
+    .. code:: python
+
+        >>> str_dir = '.../Global variables'
+        >>> listGetPathRecursive(str_dir, '*.txt')
+        ['.../Global variables\\Strong\\Strong_A_for_PSCAD.txt', '.../Global variables\\Strong\\Strong_B_for_PSCAD.txt']
+        >>> listGetPathRecursive(str_dir, '*.add')
+        []
+        >>> listGetPathRecursive(str_dir, 'txt')
+        []
+        >>>
+    '''
+
+
+    bool_temp = boolPathExists(str_scr, bool_dir=True)
+
+    if bool_temp:
+
+        if str_path_index:
+
+            list_paths = list(genPathIndexed(str_scr, str_path_index, [str_filter]))
+
+        else:
+
+            list_paths = list(genPathRecursive(str_scr, [str_filter]))
+
+        return list_paths
+
+    else:
+
+        print('Source directory not found.')
+
+        return list()
+# =============================================================================
+# </Function: get all file paths with filter>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: generate all file paths with filters>
+# =============================================================================
+def genPathRecursive(str_scr, list_include=('*',), list_exclude=(), list_prune=(), int_threads=1):
+    '''
+    .. _genPathRecursive :
+
+    This function walks every sub dir inside the given source dir with os.scandir, and yields
+    the paths of the files matching the filters as soon as they are found.
+
+    The filters are glob patterns ('*.txt') matched against the filenames, like fnmatch. Each
+    list of patterns is compiled once into a single regular expression. Symbolic links to
+    directories are neither yielded nor followed, like os.walk. Directories that cannot be read
+    are skipped.
+
+    With int_threads larger than 1, the directories are scanned by a thread pool, which helps
+    on slow (e.g. network) file systems, with at most two directories queued per thread. The
+    paths are then yielded in no particular order.
+    Otherwise, the order is the same as os.walk.
+
+    Parameters
+    ----------
+    str_scr : str
+        The given source dir.
+
+    list_include : list
+        The filters of the filenames to yield. Default = ('*',)
+
+    list_exclude : list
+        The filters of the filenames not to yield. Default = ()
+
+    list_prune : list
+        The filters of the directory names not to walk into. Default = ()
+
+    int_threads : int
+        The number of directory scanning threads. Default = 1
+
+    Returns
+    -------
+    generator :
+        The file paths found.
+
+    Example
+    -------
+    .. code:: python
+
+        >>> str_dir = '.../project'
+        >>> gen_paths = genPathRecursive(str_dir, ['*.py', '*.pyx'], ['test_*'], ['.git', '__pycache__'])
+        >>> next(gen_paths)
+        '.../project\\setup.py'
+        >>>
+    '''
+
+    regex_include = _regexGlobs(list_include)
+
+    regex_exclude = _regexGlobs(list_exclude)
+
+    regex_prune = _regexGlobs(list_prune)
+
+    normcase = os.path.normcase
+
+    if int_threads <= 1:
+
+        list_stack = [str_scr]
+
+        while list_stack:
+
+            (str_dir, list_files, list_dirs) = _tupleScanDir(list_stack.pop(), regex_prune)
+
+            for i in list_files:
+
+                str_name = normcase(i)
+
+                if ((regex_include is None) or regex_include.match(str_name)) \
+                        and ((regex_exclude is None) or (not regex_exclude.match(str_name))):
+
+                    yield os.path.join(str_dir, i)
+
+                else:
+
+                    pass
+
+            # depth first, in the order of os.walk
+            list_stack.extend(reversed(list_dirs))
+
+    else:
+
+        futures = _loadModule('concurrent.futures')
+
+        executor = futures.ThreadPoolExecutor(max_workers=int_threads)
+
+        # the directories found but not submitted yet
+        list_stack = [str_scr]
+
+        set_pending = set()
+
+        try:
+
+            while list_stack or set_pending:
+
+                # a bounded window, so each wait is cheap however wide the tree is
+                while list_stack and (len(set_pending) < int_threads * 2):
+
+                    set_pending.add(executor.submit(_tupleScanDir, list_stack.pop(), regex_prune))
+
+                (set_done, set_pending) = futures.wait(set_pending, return_when=futures.FIRST_COMPLETED)
+
+                for future in set_done:
+
+                    (str_dir, list_files, list_dirs) = future.result()
+
+                    list_stack.extend(list_dirs)
+
+                    for i in list_files:
+
+                        str_name = normcase(i)
+
+                        if ((regex_include is None) or regex_include.match(str_name)) \
+                                and ((regex_exclude is None) or (not regex_exclude.match(str_name))):
+
+                            yield os.path.join(str_dir, i)
+
+                        else:
+
+                            pass
+
+        finally:
+
+            # also when the consumer stops early
+            for future in set_pending:
+
+                future.cancel()
+
+            executor.shutdown(wait=True)
+
+
+
+def _regexGlobs(list_globs):
+    '''
+    Compile glob patterns into one regular expression. Return None if there is no pattern.
+    '''
+
+    if isinstance(list_globs, str):
+
+        list_globs = [list_globs]
+
+    else:
+
+        pass
+
+    if not list_globs:
+
+        return None
+
+    else:
+
+        return re.compile('|'.join([fnmatch.translate(os.path.normcase(i)) for i in list_globs]))
+
+
+
+def _tupleScanDir(str_dir, regex_prune=None, bool_raise=False):
+    '''
+    Scan one directory. Return a tuple of the directory, the filenames and the sub dir paths.
+    A directory that cannot be listed is empty, or raises the OSError if bool_raise.
+    '''
+
+    list_files = []
+
+    list_dirs = []
+
+    try:
+
+        with os.scandir(str_dir) as iter_entry:
+
+            for entry in iter_entry:
+
+                try:
+
+                    bool_dir = entry.is_dir()
+
+                except OSError:
+
+                    bool_dir = False
+
+                if not bool_dir:
+
+                    list_files.append(entry.name)
+
+                elif entry.is_symlink():
+
+                    pass
+
+                elif (regex_prune is None) or (not regex_prune.match(os.path.normcase(entry.name))):
+
+                    list_dirs.append(entry.path)
+
+                else:
+
+                    pass
+
+    except OSError:
+
+        if bool_raise:
+
+            raise
+
+        else:
+
+            pass
+
+    return (str_dir, list_files, list_dirs)
+# =============================================================================
+# </Function: generate all file paths with filters>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: generate all file paths with filters from a persistent index>
+# =============================================================================
+def genPathIndexed(str_scr, str_path_index, list_include=('*',), list_exclude=(), list_prune=()):
+    '''
+    .. _genPathIndexed :
+
+    This function yields the same paths as genPathRecursive (in the order of os.walk), but keeps
+    a persistent index of the directory tree in an SQLite file.
+
+    The index stores the mtime and the entries (files and sub dirs) of each directory. A
+    directory's mtime changes when an entry is added, removed or renamed, so on later calls a
+    directory with an unchanged mtime is answered from the index, and only the changed ones are
+    rescanned. Each directory still costs one stat, but no listing.
+
+    A directory modified within CONST_FLOAT_INDEX_RACY seconds of its scan is always rescanned
+    on the next call, since a later change in the same mtime tick could not be noticed. A
+    directory that cannot be listed (e.g. no permission) is not stored, so it is retried.
+
+    One index file can hold many roots. The paths are stored as walked, so use the same
+    spelling of str_scr on each call.
+
+    Parameters
+    ----------
+    str_scr : str
+        The given source dir.
+
+    str_path_index : str
+        The full file path of the index file. Created if not found.
+
+    list_include : list
+        The filters of the filenames to yield. Default = ('*',)
+
+    list_exclude : list
+        The filters of the filenames not to yield. Default = ()
+
+    list_prune : list
+        The filters of the directory names not to walk into. Default = ()
+
+    Returns
+    -------
+    generator :
+        The file paths found.
+
+    Example
+    -------
+    .. code:: python
+
+        >>> list_paths = list(genPathIndexed('//share/data', 'c:/temp/data.idx', ['*.csv']))
+        >>>
+    '''
+
+    regex_include = _regexGlobs(list_include)
+
+    regex_exclude = _regexGlobs(list_exclude)
+
+    regex_prune = _regexGlobs(list_prune)
+
+    normcase = os.path.normcase
+
+    sqlite3 = _loadModule('sqlite3')
+
+    conn = sqlite3.connect(str_path_index, timeout=60)
+
+    try:
+
+        conn.execute('CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime_ns INTEGER)')
+
+        conn.execute('CREATE TABLE IF NOT EXISTS entries (dir TEXT, name TEXT, is_dir INTEGER)')
+
+        conn.execute('CREATE INDEX IF NOT EXISTS entries_dir ON entries (dir)')
+
+        list_stack = [str_scr]
+
+        while list_stack:
+
+            str_dir = list_stack.pop()
+
+            (list_files, list_dirs) = _tupleIndexDir(conn, str_dir)
+
+            for i in list_files:
+
+                str_name = normcase(i)
+
+                if ((regex_include is None) or regex_include.match(str_name)) \
+                        and ((regex_exclude is None) or (not regex_exclude.match(str_name))):
+
+                    yield os.path.join(str_dir, i)
+
+                else:
+
+                    pass
+
+            list_dirs = [os.path.join(str_dir, i) for i in list_dirs
+                         if (regex_prune is None) or (not regex_prune.match(normcase(i)))]
+
+            # depth first, in the order of os.walk
+            list_stack.extend(reversed(list_dirs))
+
+    finally:
+
+        conn.commit()
+
+        conn.close()
+
+
+
+# a directory modified within this many seconds of its scan is rescanned on the next call
+CONST_FLOAT_INDEX_RACY = 2.0
+
+
+
+def _tupleIndexDir(conn, str_dir):
+    '''
+    Return a tuple of the filenames and the sub dir names of a directory, from the index of
+    genPathIndexed if the directory is unchanged, otherwise rescan it and update the index.
+    '''
+
+    try:
+
+        int_mtime = os.stat(str_dir).st_mtime_ns
+
+    except OSError:
+
+        # the directory is gone
+        _deleteIndexTree(conn, str_dir)
+
+        return ([], [])
+
+    tuple_row = conn.execute('SELECT mtime_ns FROM dirs WHERE path = ?', (str_dir,)).fetchone()
+
+    if (tuple_row is not None) and (tuple_row[0] == int_mtime):
+
+        list_files = []
+
+        list_dirs = []
+
+        for (str_name, int_dir) in conn.execute('SELECT name, is_dir FROM entries WHERE dir = ? ORDER BY rowid',
+                                                (str_dir,)):
+
+            if int_dir:
+
+                list_dirs.append(str_name)
+
+            else:
+
+                list_files.append(str_name)
+
+        return (list_files, list_dirs)
+
+    else:
+
+        pass
+
+    # rescan
+    try:
+
+        (str_dir, list_files, list_dirs) = _tupleScanDir(str_dir, bool_raise=True)
+
+    except OSError:
+
+        # unreadable (e.g. no permission), left out of the index so it is retried on the next call
+        _deleteIndexTree(conn, str_dir)
+
+        return ([], [])
+
+    list_dirs = [os.path.basename(i) for i in list_dirs]
+
+    if tuple_row is not None:
+
+        set_dirs = set(list_dirs)
+
+        for (str_name,) in conn.execute('SELECT name FROM entries WHERE dir = ? AND is_dir = 1', (str_dir,)).fetchall():
+
+            if str_name not in set_dirs:
+
+                _deleteIndexTree(conn, os.path.join(str_dir, str_name))
+
+            else:
+
+                pass
+
+        conn.execute('DELETE FROM entries WHERE dir = ?', (str_dir,))
+
+    else:
+
+        pass
+
+    conn.executemany('INSERT INTO entries (dir, name, is_dir) VALUES (?, ?, ?)',
+                     [(str_dir, i, 0) for i in list_files] + [(str_dir, i, 1) for i in list_dirs])
+
+    if time.time_ns() - int_mtime < CONST_FLOAT_INDEX_RACY * 1e9:
+
+        int_mtime = -1
+
+    else:
+
+        pass
+
+    conn.execute('INSERT OR REPLACE INTO dirs (path, mtime_ns) VALUES (?, ?)', (str_dir, int_mtime))
+
+    return (list_files, list_dirs)
+
+
+
+def _deleteIndexTree(conn, str_dir):
+    '''
+    Delete a directory and all its sub dirs from the index of genPathIndexed.
+    '''
+
+    # all the paths starting with str_dir + os.sep
+    str_low = str_dir.rstrip(os.sep) + os.sep
+
+    str_high = str_dir.rstrip(os.sep) + chr(ord(os.sep) + 1)
+
+    conn.execute('DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)', (str_dir, str_low, str_high))
+
+    conn.execute('DELETE FROM entries WHERE dir = ? OR (dir >= ? AND dir < ?)', (str_dir, str_low, str_high))
+# =============================================================================
+# </Function: generate all file paths with filters from a persistent index>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: get parent path>
+# =============================================================================
+def strGetParPath(str_scr):
+    '''
+    .. _strGetParPath :
+    
+    This function returns the parent path of the given path.
+
+    Parameters
+    ----------
+    str_scr : str
+        The given path.
+
+    Returns
+    -------
+    str_temp : str
+        The parent path of the given path.
+
+    Reference
+    ---------
+    https://stackoverflow.com/questions/19153462/get-excel-style-column-names-from-column-number
+
+    Example
+    -------
+    .. code:: python
+
+        >>> str_par = os.path.join('c:/', 'parent', 'scr')
+        >>> str_par
+        'c:/parent\\scr'
+        >>> strGetParPath(str_par)
+        'c:\\parent'
+        >>>
+    '''
+
+    str_temp = os.path.abspath(os.path.join(str_scr, os.pardir))
+
+    return str_temp
+# =============================================================================
+# </Function: get parent path>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: convert a string of numbers to a list>
+# =============================================================================
+def listNumStr2List(str_in, str_delimit=',', str_type='int'):
+    '''
+    .. _listNumStr2List :
+    
+    This function converts a delimited, numericable string into a list.
+
+    Supports all int or all float.
+
+    Parameters
+    ----------
+    str_in : str
+        The input string.
+
+    str_delimit : str
+        The delimiter. Default = ','
+
+    str_type : str
+        Specify the number type. Default = 'int'
+
+        If not default, this function would try to convert the string to float.
+        
+    Returns
+    -------
+    list_temp : list
+        The converted list.
+
+    Reference
+    ---------
+    https://stackoverflow.com/questions/19153462/get-excel-style-column-names-from-column-number
+
+    Example
+    -------
+    .. code:: python
+
+        >>> a = '1, 2, 3, 4, 5,     0'
+        >>> listNumStr2List(a)
+        [1, 2, 3, 4, 5, 0]
+        >>> a = '1.0,2.0,3.0'
+        >>> listNumStr2List(a)
+        Traceback (most recent call last):
+        File "<stdin>", line 1, in <module>
+        File "...\gsyMain.py", line 819, in listNumStr2List
+
+        ValueError: invalid literal for int() with base 10: '1.0'
+        >>> listNumStr2List(a, str_type='float')
+        [1.0, 2.0, 3.0]
+        >>> b = '1|2|3'
+        >>> listNumStr2List(b, '|')
+        [1, 2, 3]
+        >>>
+    '''
+
+    list_temp = []
+
+    if str_type == 'int':
+
+        list_temp = list(map(int, str_in.split(str_delimit)))
+
+    else:
+
+        list_temp = list(map(float, str_in.split(str_delimit)))
+
+    return list_temp
+# =============================================================================
+# </Function: convert a string of numbers to a list>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: increase the given char by 1>
+# =============================================================================
+def strAdd1(str_in):
+    '''
+    .. _strAdd1 :
+    
+    This function increase the given character by one and returns the next character.
+
+    Parameters
+    ----------
+    str_in : str
+        The input character. Only 1 character. Do not input strings.
+        
+    Returns
+    -------
+    str_temp : str
+        The character follows the given character.
+
+    Reference
+    ---------
+    https://stackoverflow.com/questions/19153462/get-excel-style-column-names-from-column-number
+
+    Example
+    -------
+    .. code:: python
+
+        >>> in_1 = 'a'
+        >>> strAdd1(in_1)
+        'b'
+        >>> in_2 = 'z'
+        >>> strAdd1(in_2)
+        '{'
+        >>> in_3 = 'Z'
+        >>> strAdd1(in_3)
+        '['
+        >>> in_4 = 'X'
+        >>> strAdd1(in_4)
+        'Y'
+        >>>
+    '''
+
+    str_temp = str_in
+
+    str_temp = chr(ord(str_temp) + 1)
+
+    return str_temp
+# =============================================================================
+# </Function: increase the given char by 1>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: decrease the given char by 1>
+# =============================================================================
+def strMinus1(str_in):
+    '''
+    
+    '''
+
+    str_temp = str_in
+
+    str_temp = chr(ord(str_temp) - 1)
+
+    return str_temp
+# =============================================================================
+# </Function: decrease the given char by 1>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: create Excel column address (string) from column index (int)>
+# =============================================================================
+def strExcelColAddr(int_col):
+    '''
+    1 based index
+
+    Columns in the Excel range are looked up in the table of tupleExcelColTables, others are
+    computed.
+    '''
+
+    if 0 <= int_col <= CONST_INT_EXCEL_COLS:
+
+        return (_tuple_excel_col_addr or tupleExcelColTables()[0])[int_col]
+
+    else:
+
+        pass
+
+    str_col = []
+
+    int_rem = 0
+
+    while int_col:
+
+        int_col, int_rem = divmod(int_col - 1, 26)
+
+        str_col[:0] = CONST_STR_LETTERS[int_rem]
+
+    str_temp = ''.join(str_col)
+
+    return str_temp
+# =============================================================================
+# </Function: create Excel column address (string) from column index (int)>
+# =============================================================================
+
+
+# =============================================================================
+# <Function: create Excel cell address>
+# =============================================================================
+def strExcelAddr(int_row, int_col):
+    """
+    .. _strExcelAddr :
+    
+    This function converts given row number and column number to an Excel-style cell name.
+
+    Parameters
+    ----------
+    *dicts : multiple given dictionaries.
+        
+    Returns
+    -------
+    int_row : int
+        The row number.
+
+    int_col : int
+        The column number.
+
+    Reference
+    ---------
+    https://stackoverflow.com/questions/19153462/get-excel-style-column-names-from-column-number
+
+    Example
+    -------
+    .. code:: python
+
+        >>> int_row = 2
+        >>> int_col = 10
+        >>> strExcelAddr(int_row, int_col)
+        'J2'
+        >>> int_row = 1
+        >>> int_col = 1
+        >>> strExcelAddr(int_row, int_col)
+        'A1'
+        >>> 
+    """
+    
+    # LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+    # result = []
+
+    # while int_col:
+
+    #     int_col, rem = divmod(int_col - 1, 26)
+
+    #     result[:0] = CONST_STR_LETTERS[rem]
+
+    str_col = strExcelColAddr(int_col)
+
+    # return ''.join(result) + str(int_row)
+
+    return str_col + str(int_row)
+# =============================================================================
+# </Function: create Excel cell address>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: calculate Excel column index>
+# =============================================================================
+def intExcelColIndex(str_Col, int_limit=16384):
+    '''
+    Columns in the Excel range are looked up in the table of tupleExcelColTables, others are
+    computed.
+    '''
+
+    int_index = (_dict_excel_col_index or tupleExcelColTables()[1]).get(str_Col)
+
+    if int_index is None:
+
+        str_Col = str_Col.upper()
+
+        int_index = _dict_excel_col_index.get(str_Col)
+
+    else:
+
+        pass
+
+    if (int_index is not None) and (int_index <= int_limit):
+
+        return int_index
+
+    else:
+
+        pass
+
+    str_Col = str_Col.upper()
+
+    int_index = 0
+
+    for str_temp in str_Col:
+
+        if str_temp in CONST_STR_LETTERS:
+
+            pass
+
+        else:
+
+            str_msg = 'Input column address contains non alphabetical letter.'
+
+            raise ValueError(str_msg)
+
+        # Horner's scheme, 'A' = 1
+        int_index = int_index * 26 + (ord(str_temp) - 64)
+
+    if int_index <= int_limit:
+
+        return int_index
+
+    else:
+
+        str_msg = ('The input column address '
+                    +'"'
+                    + str_Col
+                    + ' ('
+                    + str(int_index)
+                    + ') '
+                    + '"' +
+                    ' is larger than the limit '
+                    + str(int_limit))
+
+        raise ValueError(str_msg)
+# =============================================================================
+# </Function: calculate Excel column index>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: Excel column lookup tables>
+# =============================================================================
+
+# built on first use by tupleExcelColTables
+_tuple_excel_col_addr = None
+
+_dict_excel_col_index = None
+
+
+
+def tupleExcelColTables():
+    '''
+    .. _tupleExcelColTables :
+
+    This function returns the lookup tables of all the Excel columns (1 to CONST_INT_EXCEL_COLS).
+    The tables are built on the first call, and then shared.
+
+    Returns
+    -------
+    tuple :
+        (tuple_col_addr, dict_col_index)
+
+        tuple_col_addr : the column addresses by 1 based index, e.g. tuple_col_addr[28] = 'AB'.
+        Index 0 is an empty string.
+
+        dict_col_index : the 1 based column indices by (upper case) address, e.g.
+        dict_col_index['AB'] = 28.
+    '''
+
+    global _tuple_excel_col_addr, _dict_excel_col_index
+
+    if _tuple_excel_col_addr is None:
+
+        str_l = CONST_STR_LETTERS
+
+        # 'A' to 'Z', 'AA' to 'ZZ', then 'AAA' onwards, in order
+        list_temp = [''] + list(str_l) + [i + j for i in str_l for j in str_l]
+
+        list_temp.extend([i + j + k for i in str_l for j in str_l for k in str_l][:CONST_INT_EXCEL_COLS + 1 - len(list_temp)])
+
+        _dict_excel_col_index = {k: v for (v, k) in enumerate(list_temp) if k}
+
+        _tuple_excel_col_addr = tuple(list_temp)
+
+    else:
+
+        pass
+
+    return (_tuple_excel_col_addr, _dict_excel_col_index)
+# =============================================================================
+# </Function: Excel column lookup tables>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: batch Excel address conversion>
+# =============================================================================
+def listExcelColAddr(list_col):
+    '''
+    .. _listExcelColAddr :
+
+    This function converts many column indices (1 based) to Excel column addresses, see
+    strExcelColAddr. Uses the lookup table for the Excel column range.
+
+    Parameters
+    ----------
+    list_col : iterable
+        The column indices, e.g. a list, a range or a numpy array of int.
+
+    Returns
+    -------
+    list_temp : list
+        The column addresses.
+
+    Example
+    -------
+    .. code:: python
+
+        >>> listExcelColAddr([1, 26, 27, 16384])
+        ['A', 'Z', 'AA', 'XFD']
+        >>>
+    '''
+
+    (tuple_col_addr, dict_col_index) = tupleExcelColTables()
+
+    list_temp = [tuple_col_addr[i] if 0 < i <= CONST_INT_EXCEL_COLS else strExcelColAddr(i) for i in list_col]
+
+    return list_temp
+
+
+
+def listExcelAddr(list_row, list_col):
+    '''
+    .. _listExcelAddr :
+
+    This function converts many row and column numbers to Excel-style cell names, see
+    strExcelAddr. Uses the lookup table for the Excel column range.
+
+    Parameters
+    ----------
+    list_row : iterable
+        The row numbers.
+
+    list_col : iterable
+        The column numbers (1 based), pairwise with list_row.
+
+    Returns
+    -------
+    list_temp : list
+        The cell names.
+
+    Example
+    -------
+    .. code:: python
+
+        >>> listExcelAddr([2, 1], [10, 1])
+        ['J2', 'A1']
+        >>>
+    '''
+
+    (tuple_col_addr, dict_col_index) = tupleExcelColTables()
+
+    list_temp = [(tuple_col_addr[j] if 0 < j <= CONST_INT_EXCEL_COLS else strExcelColAddr(j)) + str(i)
+                 for (i, j) in zip(list_row, list_col)]
+
+    return list_temp
+
+
+
+def listExcelColIndex(list_col_addr, int_limit=CONST_INT_EXCEL_COLS):
+    '''
+    .. _listExcelColIndex :
+
+    This function converts many Excel column addresses to column indices (1 based), see
+    intExcelColIndex. Uses the lookup table for the Excel column range.
+
+    Parameters
+    ----------
+    list_col_addr : iterable
+        The column addresses, case insensitive.
+
+    int_limit : int
+        The max column index allowed. Default = CONST_INT_EXCEL_COLS
+
+    Returns
+    -------
+    list_temp : list
+        The column indices.
+
+    Raises
+    ----------
+    ValueError :
+        When an address contains a non alphabetical letter or is larger than the limit.
+
+    Example
+    -------
+    .. code:: python
+
+        >>> listExcelColIndex(['a', 'Z', 'AA', 'XFD'])
+        [1, 26, 27, 16384]
+        >>>
+    '''
+
+    (tuple_col_addr, dict_col_index) = tupleExcelColTables()
+
+    list_temp = []
+
+    for i in list_col_addr:
+
+        int_index = dict_col_index.get(i) or dict_col_index.get(i.upper())
+
+        if (int_index is None) or (int_index > int_limit):
+
+            # out of the table, or an error to report
+            int_index = intExcelColIndex(i, int_limit=int_limit)
+
+        else:
+
+            pass
+
+        list_temp.append(int_index)
+
+    return list_temp
+
+
+
+# an Excel cell address, e.g. 'AB12' or '$AB$12'
+_regex_excel_cell = re.compile(r'\$?([A-Za-z]+)\$?([0-9]+)$')
+
+# an Excel range bound, a cell, a column or a row, e.g. 'AB12', 'AB' or '12'
+_regex_excel_bound = re.compile(r'\$?([A-Za-z]*)\$?([0-9]*)$')
+
+
+
+def listExcelCellIndex(list_addr):
+    '''
+    .. _listExcelCellIndex :
+
+    This function converts many Excel-style cell names to row and column numbers.
+
+    Parameters
+    ----------
+    list_addr : iterable
+        The cell names, e.g. 'J2' or '$J$2'.
+
+    Returns
+    -------
+    list_temp : list
+        The tuples of (int_row, int_col).
+
+    Raises
+    ----------
+    ValueError :
+        When a cell name is not valid.
+
+    Example
+    -------
+    .. code:: python
+
+        >>> listExcelCellIndex(['J2', '$a$1'])
+        [(2, 10), (1, 1)]
+        >>>
+    '''
+
+    (tuple_col_addr, dict_col_index) = tupleExcelColTables()
+
+    list_temp = []
+
+    for i in list_addr:
+
+        match = _regex_excel_cell.match(i)
+
+        if match is None:
+
+            raise ValueError('Invalid Excel cell address "' + i + '".')
+
+        else:
+
+            pass
+
+        str_col = match.group(1).upper()
+
+        int_col = dict_col_index.get(str_col) or intExcelColIndex(str_col)
+
+        list_temp.append((int(match.group(2)), int_col))
+
+    return list_temp
+
+
+
+def tupleExcelRange(str_range):
+    '''
+    .. _tupleExcelRange :
+
+    This function parses an Excel-style range into its row and column bounds.
+
+    Supports cell ranges ('A1:XFD1048576'), single cells ('B2'), whole columns ('A:C') and
+    whole rows ('1:3'), with optional '$' and sheet name ('Sheet1!A1:B2'). The bounds are
+    ordered, e.g. 'B2:A1' gives the same as 'A1:B2'.
+
+    Parameters
+    ----------
+    str_range : str
+        The range.
+
+    Returns
+    -------
+    tuple :
+        (int_row_first, int_col_first, int_row_last, int_col_last), 1 based and inclusive.
+
+    Raises
+    ----------
+    ValueError :
+        When the range is not valid.
+
+    Example
+    -------
+    .. code:: python
+
+        >>> tupleExcelRange('A1:XFD1048576')
+        (1, 1, 1048576, 16384)
+        >>> tupleExcelRange('Sheet1!$B:$C')
+        (1, 2, 1048576, 3)
+        >>>
+    '''
+
+    (tuple_col_addr, dict_col_index) = tupleExcelColTables()
+
+    str_temp = str_range.rsplit('!', 1)[-1]
+
+    list_bound = str_temp.split(':')
+
+    if len(list_bound) == 1:
+
+        list_bound = list_bound * 2
+
+    else:
+
+        pass
+
+    list_match = [_regex_excel_bound.match(i) for i in list_bound]
+
+    if (len(list_bound) != 2) or (None in list_match) \
+            or any([not (i.group(1) or i.group(2)) for i in list_match]) \
+            or (bool(list_match[0].group(1)) != bool(list_match[1].group(1))) \
+            or (bool(list_match[0].group(2)) != bool(list_match[1].group(2))):
+
+        raise ValueError('Invalid Excel range "' + str_range + '".')
+
+    else:
+
+        pass
+
+    list_row = []
+
+    list_col = []
+
+    for match in list_match:
+
+        str_col = match.group(1).upper()
+
+        # whole rows, or whole columns
+        list_col.append((dict_col_index.get(str_col) or intExcelColIndex(str_col)) if str_col else None)
+
+        list_row.append(int(match.group(2)) if match.group(2) else None)
+
+    if list_col[0] is None:
+
+        list_col = [1, CONST_INT_EXCEL_COLS]
+
+    else:
+
+        list_col = sorted(list_col)
+
+    if list_row[0] is None:
+
+        list_row = [1, CONST_INT_EXCEL_ROWS]
+
+    else:
+
+        list_row = sorted(list_row)
+
+    return (list_row[0], list_col[0], list_row[1], list_col[1])
+# =============================================================================
+# </Function: batch Excel address conversion>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: merge dictionaries>
+# =============================================================================
+def dictMerge(*dicts):
+    '''
+    .. _dictMerge :
+    
+    This function mergers given dictionaries.
+
+    Parameters
+    ----------
+    *dicts : multiple given dictionaries.
+        
+    Returns
+    -------
+    dict_temp : dictionary
+        The merged dictionary.
+
+    Example
+    -------
+    .. code:: python
+
+        >>> aa = {'a':1, 'b':2}
+        >>> cc = {'c':3, 'd':4}
+        >>> dictMerge(aa, cc)
+        {'a': 1, 'c': 3, 'b': 2, 'd': 4}
+        >>> dictMerge(aa)
+        {'a': 1, 'b': 2}
+        >>> ee = {1:100, 2:200}
+        >>> dictMerge(aa, cc, ee)
+        {'a': 1, 1: 100, 'c': 3, 'b': 2, 'd': 4, 2: 200}
+        >>>
+    '''
+
+    # initialisation
+    dict_temp = {}
+
+    # loop through all the input parameters and merge them
+    for i in dicts:
+
+        dict_temp.update(i)
+
+    return dict_temp
+# =============================================================================
+# </Function: merge dictionaries>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: get an pseudo random int that is not in the list>
+# =============================================================================
+def intGet(list_range):
+    '''
+    .. _intGet :
+    
+    This function returns a pseudo randomly generated int that is not in the given list.
+
+    This function would first try to get an int inside the min and max of the given list
+    but not in the list. After len(list_range) attempts, the max would be doubled to allow
+    a wider range for randoming.
+
+    This function was originally written using recursion. But then I hit the limit of the 
+    stack. So I changed it to use iteration, which is limited by the size of memory.
+
+    The list is turned into a set once, so each draw is checked in O(1). For many draws against
+    the same list, use IdAllocator. For many ints at once, use listGetInts.
+
+    Parameters
+    ----------
+    list_range : list
+        A list of int. The return int will not be in this list.
+
+    Returns
+    -------
+    i : int
+        A pseudo randomly generated int that is not in the given list.
+
+    Example
+    -------
+    .. code:: python
+
+        >>> a = [1, 2, 3, 4, 5, 10]
+        >>> intGet(a)
+        7
+        >>> a = [1, 2, 3]
+        >>> intGet(a)
+        5
+        >>>
+    '''
+
+    set_range = set(list_range)
+
+    # get min of the list
+    int_min = min(set_range)
+
+    # get max of the list
+    int_max = max(set_range)
+
+    # get random
+    i = randint(int_min, int_max)
+
+    # iteration, limited by the size of memory
+    j = 0
+
+    while i in set_range:
+
+        i = randint(int_min, int_max)
+
+        j = j + 1
+
+        # this is to jump out of loop
+        if j > len(set_range):
+
+            int_max = max(set_range) * 2
+
+    return i
+# =============================================================================
+# </Function: get an pseudo random int that is not in the list>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: get many pseudo random ints that are not in the list>
+# =============================================================================
+def listGetInts(list_range, int_k, int_seed=None):
+    '''
+    .. _listGetInts :
+
+    This function returns int_k distinct pseudo random ints that are not in the given list,
+    i.e. int_k calls of intGet in one go, without the duplicates between the calls.
+
+    Like intGet, the ints are drawn between the min and the max of the list, and the max is
+    raised (the range is doubled) until there are enough free ints. The list is turned into a
+    set once. Every free int has the same chance.
+
+    If the free ints are plenty (sparse list), a sample of the range is drawn and the ints in
+    the list are rejected. If not (dense list, or int_k close to the number of free ints), the
+    free ints are listed and sampled, with numpy (setdiff1d and choice) if installed.
+
+    Parameters
+    ----------
+    list_range : iterable
+        Ints. The returned ints will not be in it.
+
+    int_k : int
+        The number of ints to return.
+
+    int_seed : int
+        The seed of the random generator, for reproducible runs (with or without numpy
+        installed gives different results). Default = None
+
+    Returns
+    -------
+    list :
+        The ints, in random order.
+
+    Example
+    -------
+    .. code:: python
+
+        >>> listGetInts([1, 2, 3, 1000], 3, int_seed=1)
+        [138, 583, 868]
+        >>>
+    '''
+
+    set_range = set(list_range)
+
+    int_min = min(set_range)
+
+    int_size = max(set_range) - int_min + 1
+
+    # the list is within the range, so the rest is free
+    while int_size - len(set_range) < int_k:
+
+        int_size = int_size * 2
+
+    int_free = int_size - len(set_range)
+
+    # sparse, sample the range and reject
+    if (len(set_range) * 2 <= int_size) and (int_k * 4 <= int_free):
+
+        random_gen = Random(int_seed)
+
+        range_all = range(int_min, int_min + int_size)
+
+        int_draw = int_k * int_size // int_free + 16
+
+        while True:
+
+            list_out = [i for i in random_gen.sample(range_all, min(int_draw, int_size)) if i not in set_range]
+
+            if len(list_out) >= int_k:
+
+                return list_out[:int_k]
+
+            else:
+
+                int_draw = int_draw * 2
+
+    # dense, sample the complement
+    elif _loadNumpy() is not None:
+
+        array_free = np.setdiff1d(np.arange(int_min, int_min + int_size, dtype=np.int64),
+                                  np.fromiter(set_range, dtype=np.int64, count=len(set_range)),
+                                  assume_unique=True)
+
+        return np.random.default_rng(int_seed).choice(array_free, int_k, replace=False).tolist()
+
+    else:
+
+        list_free = [i for i in range(int_min, int_min + int_size) if i not in set_range]
+
+        return Random(int_seed).sample(list_free, int_k)
+# =============================================================================
+# </Function: get many pseudo random ints that are not in the list>
+# =============================================================================
+
+
+
+# ===========================================================================================
+# <Class: random unique ID allocator>
+# ===========================================================================================
+class IdAllocator(object):
+    '''
+    .. _IdAllocator :
+
+    This class allocates pseudo random unique int IDs, i.e. a reusable intGet for many draws.
+
+    The free IDs of the range [int_low, int_high] are kept as a sorted list of gaps (runs of
+    free IDs, as start and length), split into chunks of up to 2 * CONST_INT_CHUNK gaps. The
+    number of free IDs of each chunk is kept in a Fenwick tree, so the n-th free ID of the
+    whole range is found in O(log n) by walking down the tree and then summing the gap lengths
+    of one chunk. The memory grows with the number of gaps, i.e. of used IDs, not with the size
+    of the range, so a sparse pool over a huge range is cheap. Every free ID is drawn with the
+    same probability, however dense the range is, and no draw is ever retried.
+
+    When there are not enough free IDs, the range is doubled upwards, like intGet does. Used
+    IDs outside the range are remembered and never drawn.
+
+    Parameters
+    ----------
+    iter_used : iterable
+        The IDs already in use. Default = ()
+
+    int_low : int
+        The smallest ID to draw. Default = None (the smallest used ID, or 0)
+
+    int_high : int
+        The largest ID to draw (before growing). Default = None (the largest used ID, or 1023)
+
+    int_seed : int
+        The seed of the random generator, for reproducible draws. Default = None
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> alloc = IdAllocator([1, 2, 3, 4, 5, 10], int_seed=1)
+        >>> alloc.intAlloc()
+        7
+        >>> alloc.listAlloc(2)
+        [9, 6]
+        >>> alloc.listAlloc(3)
+        [14, 11, 17]
+        >>> alloc.save('c:/ids.alloc')
+        >>> alloc = IdAllocator.load('c:/ids.alloc')
+        >>>
+    '''
+
+    # magic, low, size, number of gaps, number of used IDs outside the range
+    CONST_STR_FILE_FORMAT = '<8sqqQQ'
+
+    CONST_BYTES_FILE_MAGIC = b'MYIDGAPS'
+
+    # gaps per chunk of the Fenwick tree, a chunk is split at twice this
+    CONST_INT_CHUNK = 128
+
+    def __init__(self, iter_used=(), int_low=None, int_high=None, int_seed=None):
+
+        set_used = set(iter_used)
+
+        if int_low is None:
+
+            int_low = min(set_used) if set_used else 0
+
+        else:
+
+            pass
+
+        if int_high is None:
+
+            int_high = max(set_used) if set_used else int_low + 1023
+
+        else:
+
+            pass
+
+        self.int_low = int_low
+
+        self.int_size = 0
+
+        self.int_free = 0
+
+        self._random = Random(int_seed)
+
+        self._list_starts = []
+
+        self._list_lens = []
+
+        self._set_outside = set_used
+
+        self._resize(max(1, int_high - int_low + 1))
+
+    def __len__(self):
+
+        return self.int_size - self.int_free + len(self._set_outside)
+
+    def __contains__(self, int_id):
+
+        i = int_id - self.int_low
+
+        if 0 <= i < self.int_size:
+
+            (c, k) = self._tupleLocate(i)
+
+            return (c < 0) or (i >= self._list_starts[c][k] + self._list_lens[c][k])
+
+        else:
+
+            return int_id in self._set_outside
+
+    def intAlloc(self):
+        '''
+        Allocate and return a free ID.
+        '''
+
+        return self.listAlloc(1)[0]
+
+    def listAlloc(self, int_k):
+        '''
+        Allocate and return int_k distinct free IDs, in random order.
+        '''
+
+        while self.int_free < int_k:
+
+            self._resize(self.int_size * 2)
+
+        # the ranks among the free IDs
+        list_rank = self._random.sample(range(self.int_free), int_k)
+
+        list_order = sorted(range(int_k), key=list_rank.__getitem__)
+
+        list_out = [0] * int_k
+
+        # many ranks, one sweep over all the gaps (about CONST_INT_CHUNK per chunk)
+        if int_k * 16 >= len(self._list_starts) * self.CONST_INT_CHUNK:
+
+            for (i, int_id) in zip(list_order, self._listTakeRanks([list_rank[i] for i in list_order])):
+
+                list_out[i] = int_id
+
+        # a few ranks, one walk down the tree each, from the highest so the lower ranks stay valid
+        else:
+
+            for i in reversed(list_order):
+
+                list_out[i] = self._intTakeRank(list_rank[i])
+
+        return list_out
+
+    def add(self, int_id):
+        '''
+        Mark an ID as used, e.g. one taken elsewhere. Return True if it was free.
+        '''
+
+        i = int_id - self.int_low
+
+        if 0 <= i < self.int_size:
+
+            (c, k) = self._tupleLocate(i)
+
+            if (c < 0) or (i >= self._list_starts[c][k] + self._list_lens[c][k]):
+
+                return False
+
+            else:
+
+                self._takeId(c, k, i)
+
+                return True
+
+        elif int_id in self._set_outside:
+
+            return False
+
+        else:
+
+            self._set_outside.add(int_id)
+
+            return True
+
+    def release(self, int_id):
+        '''
+        Mark a used ID as free again. Raise KeyError if it is not used.
+        '''
+
+        i = int_id - self.int_low
+
+        if 0 <= i < self.int_size:
+
+            (c, k) = self._tupleLocate(i)
+
+            if (c >= 0) and (i < self._list_starts[c][k] + self._list_lens[c][k]):
+
+                raise KeyError(int_id)
+
+            else:
+
+                self._freeId(c, k, i)
+
+        else:
+
+            self._set_outside.remove(int_id)
+
+    def save(self, str_path):
+        '''
+        Save the used IDs and the range to a file. The random state is not saved.
+        '''
+
+        list_arrays = [array('q', itertools.chain.from_iterable(self._list_starts)),
+                       array('q', itertools.chain.from_iterable(self._list_lens)),
+                       array('q', sorted(self._set_outside))]
+
+        if sys.byteorder == 'big':
+
+            for i in list_arrays:
+
+                i.byteswap()
+
+        else:
+
+            pass
+
+        with open(str_path, 'wb') as fout:
+
+            fout.write(struct.pack(self.CONST_STR_FILE_FORMAT, self.CONST_BYTES_FILE_MAGIC,
+                                   self.int_low, self.int_size, len(list_arrays[0]), len(list_arrays[2])))
+
+            for i in list_arrays:
+
+                i.tofile(fout)
+
+    @classmethod
+    def load(cls, str_path, int_seed=None):
+        '''
+        Return the allocator saved in a file.
+        '''
+
+        alloc = cls.__new__(cls)
+
+        int_header = struct.calcsize(cls.CONST_STR_FILE_FORMAT)
+
+        with open(str_path, 'rb') as fin:
+
+            bytes_header = fin.read(int_header)
+
+            if (len(bytes_header) != int_header) or (bytes_header[:8] != cls.CONST_BYTES_FILE_MAGIC):
+
+                raise ValueError('Not an ID allocator file: ' + str_path)
+
+            else:
+
+                pass
+
+            (bytes_magic, alloc.int_low, alloc.int_size,
+             int_gaps, int_outside) = struct.unpack(cls.CONST_STR_FILE_FORMAT, bytes_header)
+
+            list_arrays = [array('q'), array('q'), array('q')]
+
+            try:
+
+                for (array_data, int_len) in zip(list_arrays, (int_gaps, int_gaps, int_outside)):
+
+                    array_data.fromfile(fin, int_len)
+
+            except EOFError:
+
+                raise ValueError('Truncated ID allocator file: ' + str_path)
+
+        if sys.byteorder == 'big':
+
+            for i in list_arrays:
+
+                i.byteswap()
+
+        else:
+
+            pass
+
+        alloc._random = Random(int_seed)
+
+        alloc._set_outside = set(list_arrays[2])
+
+        alloc._setGaps(list_arrays[0], list_arrays[1])
+
+        return alloc
+
+    def _resize(self, int_size):
+        '''
+        Grow the range to int_size IDs and rebuild the chunks and the tree.
+        '''
+
+        array_starts = array('q', itertools.chain.from_iterable(self._list_starts))
+
+        array_lens = array('q', itertools.chain.from_iterable(self._list_lens))
+
+        # the new IDs are one gap at the end
+        if array_lens and (array_starts[-1] + array_lens[-1] == self.int_size):
+
+            array_lens[-1] = array_lens[-1] + int_size - self.int_size
+
+        else:
+
+            array_starts.append(self.int_size)
+
+            array_lens.append(int_size - self.int_size)
+
+        self.int_size = int_size
+
+        # the used IDs now inside the range
+        list_inside = sorted([j for j in self._set_outside if 0 <= j - self.int_low < int_size])
+
+        self._set_outside.difference_update(list_inside)
+
+        self._setGaps(array_starts, array_lens, [j - self.int_low for j in list_inside])
+
+    def _setGaps(self, array_starts, array_lens, list_used=()):
+        '''
+        Set the gaps, less the IDs of list_used (sorted offsets from int_low), and rebuild the
+        chunks and the tree.
+        '''
+
+        if list_used:
+
+            array_starts_in = array_starts
+
+            array_lens_in = array_lens
+
+            array_starts = array('q')
+
+            array_lens = array('q')
+
+            int_used = len(list_used)
+
+            j = 0
+
+            for (int_start, int_len) in zip(array_starts_in, array_lens_in):
+
+                int_end = int_start + int_len
+
+                while (j < int_used) and (list_used[j] < int_start):
+
+                    j = j + 1
+
+                # split the gap around the used IDs in it
+                while (j < int_used) and (list_used[j] < int_end):
+
+                    if list_used[j] > int_start:
+
+                        array_starts.append(int_start)
+
+                        array_lens.append(list_used[j] - int_start)
+
+                    else:
+
+                        pass
+
+                    int_start = list_used[j] + 1
+
+                    j = j + 1
+
+                if int_end > int_start:
+
+                    array_starts.append(int_start)
+
+                    array_lens.append(int_end - int_start)
+
+                else:
+
+                    pass
+
+        else:
+
+            pass
+
+        int_chunk = self.CONST_INT_CHUNK
+
+        self._list_starts = [array_starts[i:i + int_chunk] for i in range(0, len(array_starts), int_chunk)]
+
+        self._list_lens = [array_lens[i:i + int_chunk] for i in range(0, len(array_lens), int_chunk)]
+
+        self._buildTree()
+
+    def _buildTree(self):
+        '''
+        Build the Fenwick tree of the free IDs per chunk, in O(number of gaps).
+        '''
+
+        int_chunks = len(self._list_lens)
+
+        array_tree = array('q', [0]) * (int_chunks + 1)
+
+        for (i, array_lens) in enumerate(self._list_lens):
+
+            array_tree[i + 1] = sum(array_lens)
+
+        self.int_free = sum(array_tree)
+
+        for i in range(1, int_chunks + 1):
+
+            j = i + (i & -i)
+
+            if j <= int_chunks:
+
+                array_tree[j] = array_tree[j] + array_tree[i]
+
+            else:
+
+                pass
+
+        self._tree = array_tree
+
+        # the first gap start of each chunk, for finding the chunk of an ID
+        self._list_first = [i[0] for i in self._list_starts]
+
+    def _updateTree(self, int_chunk_index, int_delta):
+        '''
+        Add int_delta to the free count of a chunk.
+        '''
+
+        array_tree = self._tree
+
+        int_chunks = len(array_tree) - 1
+
+        i = int_chunk_index + 1
+
+        while i <= int_chunks:
+
+            array_tree[i] = array_tree[i] + int_delta
+
+            i = i + (i & -i)
+
+        self.int_free = self.int_free + int_delta
+
+    def _tupleLocate(self, i):
+        '''
+        Return the chunk and the index in it of the last gap starting at or before the offset i,
+        or (-1, -1) if there is none.
+        '''
+
+        c = bisect.bisect_right(self._list_first, i) - 1
+
+        if c < 0:
+
+            return (-1, -1)
+
+        else:
+
+            return (c, bisect.bisect_right(self._list_starts[c], i) - 1)
+
+    def _takeId(self, c, k, i):
+        '''
+        Mark the free offset i of the gap k of the chunk c used.
+        '''
+
+        array_starts = self._list_starts[c]
+
+        array_lens = self._list_lens[c]
+
+        (int_start, int_len) = (array_starts[k], array_lens[k])
+
+        bool_rebuild = False
+
+        if int_len == 1:
+
+            del array_starts[k]
+
+            del array_lens[k]
+
+            if not array_starts:
+
+                del self._list_starts[c]
+
+                del self._list_lens[c]
+
+                bool_rebuild = True
+
+            else:
+
+                pass
+
+        elif i == int_start:
+
+            array_starts[k] = i + 1
+
+            array_lens[k] = int_len - 1
+
+        elif i == int_start + int_len - 1:
+
+            array_lens[k] = int_len - 1
+
+        else:
+
+            array_lens[k] = i - int_start
+
+            array_starts.insert(k + 1, i + 1)
+
+            array_lens.insert(k + 1, int_start + int_len - i - 1)
+
+            bool_rebuild = self._boolSplitChunk(c)
+
+        if bool_rebuild:
+
+            self._buildTree()
+
+        else:
+
+            self._updateTree(c, -1)
+
+            if k == 0:
+
+                self._list_first[c] = array_starts[0]
+
+            else:
+
+                pass
+
+    def _freeId(self, c, k, i):
+        '''
+        Mark the used offset i free, merged with the gaps next to it. The gap k of the chunk c
+        is the last one before i, or c = -1 if there is none.
+        '''
+
+        list_starts = self._list_starts
+
+        list_lens = self._list_lens
+
+        # the gap after i, in this chunk or at the start of the next one
+        if (c >= 0) and (k + 1 < len(list_starts[c])):
+
+            (c_next, k_next) = (c, k + 1)
+
+        elif c + 1 < len(list_starts):
+
+            (c_next, k_next) = (c + 1, 0)
+
+        else:
+
+            (c_next, k_next) = (-1, -1)
+
+        bool_prev = (c >= 0) and (list_starts[c][k] + list_lens[c][k] == i)
+
+        bool_next = (c_next >= 0) and (list_starts[c_next][k_next] == i + 1)
+
+        if bool_prev and bool_next:
+
+            int_len_next = list_lens[c_next][k_next]
+
+            list_lens[c][k] = list_lens[c][k] + 1 + int_len_next
+
+            del list_starts[c_next][k_next]
+
+            del list_lens[c_next][k_next]
+
+            if c_next == c:
+
+                self._updateTree(c, 1)
+
+            elif list_starts[c_next]:
+
+                # the next gap moved to the end of the chunk c
+                self._updateTree(c, 1 + int_len_next)
+
+                self._updateTree(c_next, -int_len_next)
+
+                self._list_first[c_next] = list_starts[c_next][0]
+
+            else:
+
+                del list_starts[c_next]
+
+                del list_lens[c_next]
+
+                self._buildTree()
+
+        elif bool_prev:
+
+            list_lens[c][k] = list_lens[c][k] + 1
+
+            self._updateTree(c, 1)
+
+        elif bool_next:
+
+            list_starts[c_next][k_next] = i
+
+            list_lens[c_next][k_next] = list_lens[c_next][k_next] + 1
+
+            self._updateTree(c_next, 1)
+
+            self._list_first[c_next] = list_starts[c_next][0]
+
+        elif not list_starts:
+
+            list_starts.append(array('q', [i]))
+
+            list_lens.append(array('q', [1]))
+
+            self._buildTree()
+
+        else:
+
+            # a new gap, after the gap k, or first in the first chunk
+            (c, k) = (c, k + 1) if c >= 0 else (0, 0)
+
+            list_starts[c].insert(k, i)
+
+            list_lens[c].insert(k, 1)
+
+            if self._boolSplitChunk(c):
+
+                self._buildTree()
+
+            else:
+
+                self._updateTree(c, 1)
+
+                self._list_first[c] = list_starts[c][0]
+
+    def _boolSplitChunk(self, c):
+        '''
+        Split the chunk c in two if it has grown too large. Return True if split.
+        '''
+
+        int_chunk = self.CONST_INT_CHUNK
+
+        array_starts = self._list_starts[c]
+
+        if len(array_starts) > 2 * int_chunk:
+
+            array_lens = self._list_lens[c]
+
+            self._list_starts[c:c + 1] = [array_starts[:int_chunk], array_starts[int_chunk:]]
+
+            self._list_lens[c:c + 1] = [array_lens[:int_chunk], array_lens[int_chunk:]]
+
+            return True
+
+        else:
+
+            return False
+
+    def _listTakeRanks(self, list_rank):
+        '''
+        Mark the free IDs of the given ranks (ascending) used and return them, sweeping the
+        gaps in order. The chunks and the tree are rebuilt at the end.
+        '''
+
+        array_starts = array('q', itertools.chain.from_iterable(self._list_starts))
+
+        array_lens = array('q', itertools.chain.from_iterable(self._list_lens))
+
+        int_ranks = len(list_rank)
+
+        list_used = []
+
+        # the number of free IDs before the gap of the sweep
+        int_before = 0
+
+        j = 0
+
+        for (int_start, int_len) in zip(array_starts, array_lens):
+
+            while (j < int_ranks) and (list_rank[j] < int_before + int_len):
+
+                list_used.append(int_start + list_rank[j] - int_before)
+
+                j = j + 1
+
+            if j == int_ranks:
+
+                break
+
+            else:
+
+                int_before = int_before + int_len
+
+        self._setGaps(array_starts, array_lens, list_used)
+
+        return [self.int_low + i for i in list_used]
+
+    def _intTakeRank(self, int_rank):
+        '''
+        Mark the free ID of the given rank (0-based, in ascending order) used and return it.
+        '''
+
+        array_tree = self._tree
+
+        int_chunks = len(array_tree) - 1
+
+        # walk down the tree to the chunk holding the rank
+        int_chunk_index = 0
+
+        int_step = 1 << (int_chunks.bit_length() - 1)
+
+        while int_step:
+
+            j = int_chunk_index + int_step
+
+            if (j <= int_chunks) and (array_tree[j] <= int_rank):
+
+                int_chunk_index = j
+
+                int_rank = int_rank - array_tree[j]
+
+            else:
+
+                pass
+
+            int_step = int_step >> 1
+
+        # the gap of the rank in the chunk
+        list_cum = list(itertools.accumulate(self._list_lens[int_chunk_index]))
+
+        k = bisect.bisect_right(list_cum, int_rank)
+
+        i = self._list_starts[int_chunk_index][k] + int_rank - (list_cum[k - 1] if k else 0)
+
+        self._takeId(int_chunk_index, k, i)
+
+        return self.int_low + i
+# ===========================================================================================
+# </Class: random unique ID allocator>
+# ===========================================================================================
+
+
+
+# =============================================================================
+# <Function: query the running processes>
+# =============================================================================
+# a running process; cmdline is a tuple of the arguments, empty if unknown (e.g. kernel threads,
+# or the TASKLIST backend)
+ProcessInfo = namedtuple('ProcessInfo', ['pid', 'name', 'cmdline'])
+
+
+
+def listProcessInfo():
+    '''
+    .. _listProcessInfo :
+
+    This function returns all the running processes, with a single scan of the process table.
+
+    On Linux, /proc is read directly (no subprocess): the name is the kernel process name
+    (/proc/<pid>/comm, as shown by ps and matched by pgrep) and the command line is from
+    /proc/<pid>/cmdline. On Windows, TASKLIST is run once, in CSV format. Elsewhere (e.g. macOS),
+    ps is run once.
+
+    Returns
+    -------
+    list :
+        The ProcessInfo(pid, name, cmdline) of the processes.
+
+    Example
+    -------
+    .. code:: python
+
+        >>> listProcessInfo()[0]
+        ProcessInfo(pid=1, name='systemd', cmdline=('/sbin/init', 'splash'))
+        >>>
+    '''
+
+    if sys.platform.startswith('linux') and os.path.isdir('/proc'):
+
+        return _listProcessInfoProc()
+
+    elif os.name == 'nt':
+
+        return _listProcessInfoTasklist()
+
+    else:
+
+        return _listProcessInfoPs()
+
+
+
+def dictProcessQuery(list_names):
+    '''
+    .. _dictProcessQuery :
+
+    This function finds the running processes of many names at once, with a single scan of the
+    process table (see listProcessInfo), e.g. for a supervisor polling hundreds of names.
+
+    The names are case insensitive. A process matches its name, or the file name of its first
+    command line argument (e.g. a name longer than the 15 chars Linux keeps, or a process
+    renaming itself).
+
+    Parameters
+    ----------
+    list_names : list
+        The process names, e.g. 'EXCEL.EXE' or 'nginx'.
+
+    Returns
+    -------
+    dict :
+        {name: list of ProcessInfo}, for each given name. An empty list if not running.
+
+    Example
+    -------
+    .. code:: python
+
+        >>> dictProcessQuery(['sshd', 'nosuchprocess'])
+        {'sshd': [ProcessInfo(pid=812, name='sshd', cmdline=('/usr/sbin/sshd', '-D'))], 'nosuchprocess': []}
+        >>>
+    '''
+
+    dict_out = {i: [] for i in list_names}
+
+    dict_lower = defaultdict(list)
+
+    for i in dict_out:
+
+        dict_lower[i.lower()].append(i)
+
+    for proc in listProcessInfo():
+
+        set_names = _setProcessNames(proc)
+
+        for str_lower in set_names.intersection(dict_lower):
+
+            for i in dict_lower[str_lower]:
+
+                dict_out[i].append(proc)
+
+    return dict_out
+
+
+
+def _setProcessNames(proc):
+    '''
+    Return the lower case names a process is matched by.
+    '''
+
+    set_names = {proc.name.lower()}
+
+    if proc.cmdline:
+
+        set_names.add(os.path.basename(proc.cmdline[0]).lower())
+
+    else:
+
+        pass
+
+    return set_names
+
+
+
+def _listProcessInfoProc():
+    '''
+    Read the processes from /proc.
+    '''
+
+    list_out = []
+
+    for entry in os.scandir('/proc'):
+
+        if not entry.name.isdigit():
+
+            continue
+
+        else:
+
+            pass
+
+        # the process may exit at any time, or be hidden
+        try:
+
+            with open(os.path.join(entry.path, 'comm'), 'rb') as fin:
+
+                str_name = os.fsdecode(fin.read().rstrip(b'\n'))
+
+            with open(os.path.join(entry.path, 'cmdline'), 'rb') as fin:
+
+                bytes_cmdline = fin.read()
+
+        except OSError:
+
+            continue
+
+        if bytes_cmdline:
+
+            tuple_cmdline = tuple(os.fsdecode(i) for i in bytes_cmdline.rstrip(b'\0').split(b'\0'))
+
+        else:
+
+            # kernel threads and zombies
+            tuple_cmdline = ()
+
+        list_out.append(ProcessInfo(int(entry.name), str_name, tuple_cmdline))
+
+    return list_out
+
+
+
+def _listProcessInfoTasklist():
+    '''
+    Read the processes from TASKLIST (Windows). The command lines are not available.
+    '''
+
+    bytes_out = subprocess.check_output(['TASKLIST', '/FO', 'CSV', '/NH'])
+
+    # console tools write in the OEM code page, not the ANSI one
+    str_out = bytes_out.decode('oem', errors='replace')
+
+    list_out = []
+
+    # "Image Name","PID","Session Name","Session#","Mem Usage"
+    for list_row in csv.reader(io.StringIO(str_out)):
+
+        if (len(list_row) >= 2) and list_row[1].isdigit():
+
+            list_out.append(ProcessInfo(int(list_row[1]), list_row[0], ()))
+
+        else:
+
+            pass
+
+    return list_out
+
+
+
+def _listProcessInfoPs():
+    '''
+    Read the processes from ps (macOS, BSD ...). The arguments are split on spaces.
+    '''
+
+    bytes_out = subprocess.check_output(['ps', '-A', '-ww', '-o', 'pid=', '-o', 'args='])
+
+    list_out = []
+
+    for bytes_line in bytes_out.splitlines():
+
+        list_temp = os.fsdecode(bytes_line).split(None, 1)
+
+        if list_temp and list_temp[0].isdigit():
+
+            tuple_cmdline = tuple(list_temp[1].split()) if len(list_temp) > 1 else ()
+
+            str_name = os.path.basename(tuple_cmdline[0]) if tuple_cmdline else ''
+
+            list_out.append(ProcessInfo(int(list_temp[0]), str_name, tuple_cmdline))
+
+        else:
+
+            pass
+
+    return list_out
+# =============================================================================
+# </Function: query the running processes>
+# =============================================================================
+
+
+
+# ===========================================================================================
+# <Class: cached snapshot of the running processes>
+# ===========================================================================================
+class ProcessSnapshot(object):
+    '''
+    .. _ProcessSnapshot :
+
+    This class keeps a snapshot of the process table (see listProcessInfo) with an index of the
+    names (see dictProcessQuery), so the lookups inside float_ttl seconds of the snapshot cost a
+    dict lookup, instead of a scan of the process table each. The snapshot is taken again on
+    the first lookup after float_ttl. It is safe to share between threads.
+
+    With bool_pidfd (Linux 5.3+, Python 3.9+), a pidfd is opened for each process found by a
+    lookup, and the next lookups of that name poll them, so the exit of a watched process is
+    seen right away instead of after float_ttl. A new process is still only seen after float_ttl
+    (inotify does not work on /proc). Without pidfd support, this option does nothing.
+
+    Parameters
+    ----------
+    float_ttl : float
+        The seconds a snapshot is used for. Default = 1.0
+
+    bool_pidfd : bool
+        Whether to watch the exit of the processes found. Default = False
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> snapshot = ProcessSnapshot(float_ttl=2.0, bool_pidfd=True)
+        >>> snapshot.boolExists('nginx')
+        True
+        >>> snapshot.listGet('nginx')
+        [ProcessInfo(pid=1201, name='nginx', cmdline=('nginx: master process /usr/sbin/nginx',))]
+        >>>
+    '''
+
+    def __init__(self, float_ttl=1.0, bool_pidfd=False):
+
+        self.float_ttl = float_ttl
+
+        self.bool_pidfd = bool_pidfd and hasattr(os, 'pidfd_open') and hasattr(select, 'poll')
+
+        self.float_time = None
+
+        self._dict_index = {}
+
+        self._dict_pidfd = {}
+
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *args):
+
+        self.close()
+
+    def refresh(self):
+        '''
+        Take the snapshot now.
+        '''
+
+        with self._lock:
+
+            self._refresh()
+
+    def invalidate(self):
+        '''
+        Take the snapshot again on the next lookup.
+        '''
+
+        self.float_time = None
+
+    def close(self):
+        '''
+        Close the pidfds.
+        '''
+
+        with self._lock:
+
+            self._closePidfd()
+
+    def listGet(self, str_name):
+        '''
+        Return the ProcessInfo of the processes of a name (case insensitive).
+        '''
+
+        str_name = str_name.lower()
+
+        with self._lock:
+
+            if (self.float_time is None) or (time.monotonic() - self.float_time > self.float_ttl):
+
+                self._refresh()
+
+            else:
+
+                pass
+
+            list_proc = self._dict_index.get(str_name, [])
+
+            if self.bool_pidfd and list_proc and self._boolAnyExited(list_proc):
+
+                self._refresh()
+
+                list_proc = self._dict_index.get(str_name, [])
+
+            else:
+
+                pass
+
+            return list(list_proc)
+
+    def boolExists(self, str_name):
+        '''
+        Return whether a process of a name (case insensitive) is running.
+        '''
+
+        return len(self.listGet(str_name)) > 0
+
+    def dictQuery(self, list_names):
+        '''
+        Return {name: list of ProcessInfo}, as dictProcessQuery.
+        '''
+
+        return {i: self.listGet(i) for i in list_names}
+
+    def _refresh(self):
+
+        dict_index = defaultdict(list)
+
+        for proc in listProcessInfo():
+
+            for i in _setProcessNames(proc):
+
+                dict_index[i].append(proc)
+
+        self._dict_index = dict(dict_index)
+
+        # a pid may be reused by a new process
+        self._closePidfd()
+
+        self.float_time = time.monotonic()
+
+    def _closePidfd(self):
+
+        for i in self._dict_pidfd.values():
+
+            os.close(i)
+
+        self._dict_pidfd = {}
+
+    def _boolAnyExited(self, list_proc):
+        '''
+        Return whether any of the processes has exited since the snapshot.
+        '''
+
+        poll = select.poll()
+
+        for proc in list_proc:
+
+            if proc.pid not in self._dict_pidfd:
+
+                try:
+
+                    self._dict_pidfd[proc.pid] = os.pidfd_open(proc.pid)
+
+                except ProcessLookupError:
+
+                    return True
+
+                except OSError:
+
+                    # e.g. not supported by the kernel
+                    self.bool_pidfd = False
+
+                    return False
+
+            else:
+
+                pass
+
+            # readable when the process exits
+            poll.register(self._dict_pidfd[proc.pid], select.POLLIN)
+
+        return len(poll.poll(0)) > 0
+# ===========================================================================================
+# </Class: cached snapshot of the running processes>
+# ===========================================================================================
+
+
+
+# the snapshot shared by boolProcessExists
+_snapshot_process = None
+
+
+
+# =============================================================================
+# <Function: check if a process is running>
+# =============================================================================
+def boolProcessExists(str_process_fullname, float_ttl=0):
+    '''
+    .. _boolProcessExists :
+    
+    This function checks whether a given process is running or not. The name is case
+    insensitive. See dictProcessQuery, for many names at once.
+
+    Parameters
+    ----------
+    str_process_fullname : string
+        The fullname of the process
+
+    float_ttl : float
+        If > 0, the answer comes from a ProcessSnapshot shared by all the calls, taken again
+        after float_ttl seconds, e.g. for a watchdog polling the same names in a loop.
+
+        Default = 0 (scan the process table now)
+
+    Returns
+    -------
+    bool_temp : bool
+        True = process found; False = process not found
+
+    Reference
+    ---------
+    # https://stackoverflow.com/questions/7787120/python-check-if-a-process-is-running-or-not
+
+    Example
+    -------
+    .. code:: python
+
+        >>> from gsyMain import *
+        >>> s = 'EXCEL.EXE'
+        >>> boolProcessExists(s)
+        True
+        >>> s = 'excel.exe'
+        >>> boolProcessExists(s)
+        True
+        >>> s = 'nosuchprocess.exe'
+        >>> boolProcessExists(s)
+        False
+        >>>
+    '''
+
+    global _snapshot_process
+
+    if float_ttl > 0:
+
+        if _snapshot_process is None:
+
+            _snapshot_process = ProcessSnapshot(float_ttl)
+
+        else:
+
+            _snapshot_process.float_ttl = float_ttl
+
+        return _snapshot_process.boolExists(str_process_fullname)
+
+    else:
+
+        pass
+
+    bool_temp = len(dictProcessQuery([str_process_fullname])[str_process_fullname]) > 0
+
+    return bool_temp
+# =============================================================================
+# </Function: check if a process is running>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: get the first smallest value in a list>
+# =============================================================================
+def intFirstMin(list_numeric):
+    '''
+    .. _intLastMin :
+    
+    This function scans the list from the start; finds the first smallest value and then returns
+    its index.
+
+    Parameters
+    ----------
+    list_numeric : list
+        The list to be scanned.
+
+        Ideally a numeric list (int or float). String lists also seems to work, but you need to know
+        what it means for string lists.
+
+        A 1-D numpy array or an array.array is scanned with vectorised comparisons (if numpy is
+        installed), block by block, so a long series is not walked in Python.
+
+    Returns
+    -------
+    j : int
+        The index of the first smallest element in the input list.
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> from gsyMain import *
+        >>> a = [4, 3, 2, 1, 5, 0, 6]
+        >>> b = intFirstMin(a)
+        >>> b
+        3
+        >>> a[b]
+        1
+        >>>
+    '''
+
+    if _boolNdarray(list_numeric) or (isinstance(list_numeric, array) and (_loadNumpy() is not None)):
+
+        return _intFirstMinNumpy(np.asarray(list_numeric))
+
+    else:
+
+        pass
+
+    # begin from the first element
+    i = 0
+
+    # initialisation
+    j = 0
+
+    # while loop search
+    while i <= (len(list_numeric) - 2):
+
+        # set old value as the current indexed one
+        old = list_numeric[i]
+
+        # new value as the one behind the old one
+        new = list_numeric[i + 1]
+
+        # if the new value is smaller than the old one, 
+        # need to look for the next one
+        if new < old:
+
+            # since the new is smaller than the old, 
+            # set the var holding the stat to the index
+            # of the one before the old
+            j = i + 1
+
+            pass
+
+        # if the new value if bigger than the old one,
+        # that means the last smallest is found, break loop
+        else:
+
+            # since the old one is smaller the new one, 
+            # set the state var to the old one's index
+            j = i
+            
+            break
+
+        # index increment
+        i += 1
+
+    # return the index found
+    return j
+
+
+
+def _intFirstMinNumpy(array_in):
+    '''
+    intFirstMin of a 1-D numpy array. The blocks grow from the start, so a short descending
+    run costs little.
+    '''
+
+    if array_in.ndim != 1:
+
+        raise ValueError('A 1-D array is expected.')
+
+    else:
+
+        pass
+
+    int_len = len(array_in)
+
+    int_start = 0
+
+    int_block = 4096
+
+    while int_start < int_len - 1:
+
+        int_end = min(int_len - 1, int_start + int_block)
+
+        # the i where array_in[i + 1] < array_in[i] does not hold
+        array_stop = ~(array_in[int_start + 1:int_end + 1] < array_in[int_start:int_end])
+
+        if array_stop.any():
+
+            return int_start + int(array_stop.argmax())
+
+        else:
+
+            pass
+
+        int_start = int_end
+
+        int_block = int_block * 2
+
+    return max(0, int_len - 1)
+# =============================================================================
+# </Function: get the first smallest value in a list>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: get the last smallest value in a list>
+# =============================================================================
+def intLastMin(list_numeric):
+    '''
+    .. _intLastMin :
+    
+    This function scans the list from the end; finds the first smallest value and then returns
+    its index.
+
+    Parameters
+    ----------
+    list_numeric : list
+        The list to be scanned.
+
+        Ideally a numeric list (int or float). String lists also seems to work, but you need to know
+        what it means for string lists.
+
+        A 1-D numpy array or an array.array is scanned with vectorised comparisons (if numpy is
+        installed), block by block, so a long series is not walked in Python.
+
+    Returns
+    -------
+    j : int
+        The index of the last smallest element in the input list.
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> from gsyMain import *
+        >>> a = [1, 2, 3, 1, 4]
+        >>> b = intLastMin(a)
+        >>> b
+        3
+        >>> a[b]
+        1
+        >>>
+    '''
+
+    if _boolNdarray(list_numeric) or (isinstance(list_numeric, array) and (_loadNumpy() is not None)):
+
+        return _intLastMinNumpy(np.asarray(list_numeric))
+
+    else:
+
+        pass
+
+    # begin from the last element
+    i = len(list_numeric) - 1
+
+    # initialisation
+    j = 0
+
+    # while loop search
+    while i >= 1:
+
+        # set old value as the current indexed one
+        old = list_numeric[i]
+
+        # new value as the one before the old one
+        new = list_numeric[i - 1]
+
+        # if the new value is smaller than the old one, 
+        # need to look for the next one
+        if new < old:
+            
+            # since the new is smaller than the old, 
+            # set the var holding the stat to the index
+            # of the one before the old
+            j = i - 1
+
+            pass
+
+        # if the new value if bigger than the old one,
+        # that means the last smallest is found, break loop
+        else:
+            
+            # since the old one is smaller the new one, 
+            # set the state var to the old one's index
+            j = i
+            
+            break
+
+        # index decrement
+        i -= 1
+
+    # return the index found
+    return j
+
+
+
+def _intLastMinNumpy(array_in):
+    '''
+    intLastMin of a 1-D numpy array. The blocks grow from the end, so a short descending run
+    costs little.
+    '''
+
+    if array_in.ndim != 1:
+
+        raise ValueError('A 1-D array is expected.')
+
+    else:
+
+        pass
+
+    int_end = len(array_in)
+
+    int_block = 4096
+
+    while int_end > 1:
+
+        int_start = max(1, int_end - int_block)
+
+        # the i where array_in[i - 1] < array_in[i] does not hold
+        array_stop = ~(array_in[int_start - 1:int_end - 1] < array_in[int_start:int_end])
+
+        if array_stop.any():
+
+            return int_end - 1 - int(array_stop[::-1].argmax())
+
+        else:
+
+            pass
+
+        int_end = int_start
+
+        int_block = int_block * 2
+
+    return 0
+# =============================================================================
+# </Function: get the last smallest value in a list>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: get the first / last smallest values of many series>
+# =============================================================================
+def listFirstMinBatch(list_series):
+    '''
+    .. _listFirstMinBatch :
+
+    This function returns intFirstMin of each series of a batch.
+
+    A 2-D numpy array (one series per row) is scanned at once with vectorised comparisons and
+    argmax along the rows. Any other batch (e.g. a list of lists) is scanned series by series.
+
+    Parameters
+    ----------
+    list_series : 2-D numpy array or iterable
+        The series.
+
+    Returns
+    -------
+    list :
+        The index of the first smallest value of each series.
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> listFirstMinBatch(np.array([[4, 3, 2, 1, 5], [1, 2, 3, 4, 5]]))
+        [3, 0]
+        >>>
+    '''
+
+    if not _boolNdarray(list_series):
+
+        return [intFirstMin(i) for i in list_series]
+
+    elif list_series.ndim != 2:
+
+        raise ValueError('A 2-D array is expected.')
+
+    else:
+
+        pass
+
+    (int_rows, int_cols) = list_series.shape
+
+    if int_cols <= 1:
+
+        return [0] * int_rows
+
+    else:
+
+        pass
+
+    array_stop = ~(list_series[:, 1:] < list_series[:, :-1])
+
+    return np.where(array_stop.any(axis=1), array_stop.argmax(axis=1), int_cols - 1).tolist()
+
+
+
+def listLastMinBatch(list_series):
+    '''
+    .. _listLastMinBatch :
+
+    This function returns intLastMin of each series of a batch. See listFirstMinBatch.
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> listLastMinBatch(np.array([[1, 2, 3, 1, 4], [5, 4, 3, 2, 1]]))
+        [3, 4]
+        >>>
+    '''
+
+    if not _boolNdarray(list_series):
+
+        return [intLastMin(i) for i in list_series]
+
+    elif list_series.ndim != 2:
+
+        raise ValueError('A 2-D array is expected.')
+
+    else:
+
+        pass
+
+    (int_rows, int_cols) = list_series.shape
+
+    if int_cols <= 1:
+
+        return [0] * int_rows
+
+    else:
+
+        pass
+
+    # reversed, so argmax finds the last i where list_series[i - 1] < list_series[i] does not hold
+    array_stop = ~(list_series[:, -2::-1] < list_series[:, :0:-1])
+
+    return np.where(array_stop.any(axis=1), int_cols - 1 - array_stop.argmax(axis=1), 0).tolist()
+# =============================================================================
+# </Function: get the first / last smallest values of many series>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: convert a string to a list>
+# =============================================================================
+def listStr2List(str_in, str_delimiter=','):
+    '''
+    .. listStr2List :
+    
+    This function converts a string into a list.
+
+    Parameters
+    ----------
+    str_in : string
+        The input string to be converted.
+
+    str_delimiter : string
+        The delimiter of the string. The default is the comma.
+
+        Default = ','
+
+    Returns
+    -------
+    list_temp : list
+        The list results from conversion.
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> a = 'abc|xyz'
+        >>> listStr2List(a, '|')
+        ['abc', 'xyz']
+        >>>
+    '''
+
+    list_temp = str_in.split(str_delimiter)
+
+    return list_temp
+# =============================================================================
+# </Function: convert a string to a list>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: create a dir>
+# =============================================================================
+def boolMakeDir(str_dir):
+    '''
+    .. boolMakeDir :
+    
+    This function would attempt to create a directory.
+
+    If the directory already exists, this function would do nothing and
+    returns False.
+
+    This function would also returns False on exception.
+
+    Parameters
+    ----------
+    str_dir : string
+        The directory path that this function would try to create.
+
+    Returns
+    -------
+    bool_temp : bool
+        True = dir not already exists and creation process has no exception.
+
+        False = dir already exists or exception during creation.
+    '''
+
+    bool_temp = boolPathExists(str_dir, True)
+
+    # dir already exists
+    if bool_temp:
+
+        print('The directory already exists.')
+
+        return False
+
+    else:
+
+        try:
+
+            os.makedirs(str_dir)
+
+        except:
+
+            print('Error during directory make.')
+
+            return False
+
+        return True
+# =============================================================================
+# </Function: create a dir>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: prompt a yes no message box>
+# =============================================================================
+def boolMsgYesno(str_title='', str_msg=''):
+    '''
+    '''
+
+    if boolHeadless():
+
+        return _strHeadlessAnswer('yesno').lower() in ('1', 'true', 'yes', 'y', 'on')
+
+    else:
+
+        _loadTk()
+
+    root = tk.Tk()
+
+    root.withdraw()
+
+    bool_temp = False
+
+    bool_temp = msgbox.askyesno(str_title, str_msg)
+
+    root.destroy()
+
+    return bool_temp
+# =============================================================================
+# </Function: prompt a yes no message box>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: ask user to input an int
+# =============================================================================
+def intAskInt(str_title='', str_lbl=''):
+    '''
+    '''
+
+    if boolHeadless():
+
+        try:
+
+            return int(_strHeadlessAnswer('int'))
+
+        except ValueError:
+
+            return None
+
+    else:
+
+        _loadTk()
+
+    root = tk.Tk()
+
+    root.withdraw()
+
+    int_temp = simpleDialog.askinteger(str_title, str_lbl, parent=root)
+
+    root.destroy()
+
+    return int_temp
+# =============================================================================
+# </Function: ask user to input an int
+# =============================================================================
+
+
+# ===========================================================================================
+# <Function: decorator for saving a list (returned by the actual func) as a CSV file>
+# ===========================================================================================
+def savAsCsv(func):
+    '''
+    '''
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+
+        # prompt file save as diglog
+        str_title = 'Save file as'
+
+        list_filter = [('CSV file', '.csv')]
+
+        str_path_suffix = strSaveAsDialog(str_title=str_title,
+                                          str_init_dir=os.getcwd(),
+                                          str_ext='',
+                                          list_filetypes=list_filter)
+
+        if str_path_suffix:
+
+            list_temp = func(*args, **kwargs)
+
+            # write to CSV file
+            with open(str_path_suffix, 'w') as fout:
+
+                for i in list_temp:
+
+                    fout.write(','.join(i))
+                    fout.write('\n')
+
+            str_msg = 'Suffix file exported : ' + str_path_suffix
+
+            print(str_msg)
+
+            return str_msg
+
+        else:
+
+            pass
+
+    return wrapper
+# ===========================================================================================
+# </Function: decorator for saving a list (returned by the actual func) as a CSV file>
+# ===========================================================================================
+
+
+
+# ===========================================================================================
+# <Function: to get the length of an integer>
+# ===========================================================================================
+def intLenInt(int_input):
+    '''
+    https://stackoverflow.com/questions/2189800/length-of-an-integer-in-python
+    '''
+
+    import math
+
+    if int_input < 0:
+
+        int_input = -1 * int_input
+
+    else:
+
+        pass
+
+    if (int_input > 0) and (int_input <= 999999999999997):
+
+        int_length = int(math.log10(int_input)) + 1
+
+    elif int_input > 999999999999997:
+
+        int_length = 15
+
+        while int_input >= 10**int_length:
+
+            int_length += 1
+
+    elif int_input == 0:
+
+        int_length = 1
+
+    else:
+
+        raise ValueError('Value Error')
+
+        # int_length = int(math.log10(-int_input)) + 1 # +1 if you don't count the '-' 
+
+    return int_length
+# ===========================================================================================
+# </Function: to get the length of an integer>
+# ===========================================================================================
+
+
+
+# ===========================================================================================
+# <Function: get CSV header>
+# ===========================================================================================
+def listGetCsvHeader(str_path, str_delimiter=','):
+    '''
+    '''
+
+    list_header = []
+
+    # get header
+    with open(str_path, 'r') as fin:
+
+        list_header = next(csv.reader(fin, delimiter=str_delimiter))
+
+    return list_header
+# ===========================================================================================
+# </Function: get CSV header>
+# ===========================================================================================
+
+
+
+# ===========================================================================================
+# <Function: get CSV column data by column index>
+# ===========================================================================================
+def listGetCsvCol(str_path, int_indexCol, str_delimiter=','):
+    '''
+    .. _listGetCsvCol :
+    
+    This function gets the column data in the given CSV file by column index.
+
+    The file is parsed once and only the requested column is kept, see dictGetCsvCols.
+
+    Parameters
+    ----------
+    str_path : str
+        The full file path of the CSV file.
+
+    int_indexCol : int
+        The column index (0 based).
+
+    Returns
+    -------
+    list_data : list
+        The column data.
+
+    Raises
+    ----------
+    IndexError :
+        When the column index is out of the range of the header.
+
+    Reference
+    ----------
+    https://stackoverflow.com/questions/16503560/read-specific-columns-from-a-csv-file-with-csv-module
+    '''
+
+    list_data = dictGetCsvCols(str_path, [int_indexCol], str_delimiter=str_delimiter)[int_indexCol]
+
+    return list_data
+# ===========================================================================================
+# </Function: get CSV column data by column index>
+# ===========================================================================================
+
+
+
+# ===========================================================================================
+# <Function: get multiple CSV columns in one pass>
+# ===========================================================================================
+def dictGetCsvCols(str_path, list_cols, str_delimiter=',', str_typecode='', bool_numpy=False,
+                   int_batch=65536):
+    '''
+    .. _dictGetCsvCols :
+
+    This function gets the data of multiple columns in the given CSV file in one pass.
+
+    Each row is parsed once and only the requested columns are kept. The data can be returned as
+    compact typed arrays (array.array, or numpy arrays if numpy is available) instead of lists of
+    str. The rows are converted in batches, so at most int_batch rows of str are held at a time.
+
+    Empty rows are skipped. Missing values of short rows are None for str columns and empty for
+    typed columns. Empty values are NaN for float typecodes, and raise ValueError for int typecodes.
+
+    Parameters
+    ----------
+    str_path : str
+        The full file path of the CSV file.
+
+    list_cols : list
+        The columns to get. Each element is a column index (int, 0 based) or a header name (str).
+
+    str_delimiter : str
+        The delimiter of the CSV file. Default = ','
+
+    str_typecode : str
+        The array.array typecode of the returned data, e.g. 'd' for float or 'q' for int.
+
+        Default = '' (lists of str)
+
+    bool_numpy : bool
+        Whether to return numpy arrays for typed data. Falls back to array.array if numpy is not
+        installed.
+
+        Default = False
+
+    int_batch : int
+        The number of rows converted at a time. Default = 65536
+
+    Returns
+    -------
+    dict_data : dict
+        The column data keyed by the elements of list_cols. Empty if list_cols is empty.
+
+    Raises
+    ----------
+    ValueError :
+        When a header name is not found.
+
+    IndexError :
+        When a column index is out of the range of the header.
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> dict_data = dictGetCsvCols(str_path, [0, 'Voltage'], str_typecode='d')
+        >>> dict_data['Voltage']
+        array('d', [1.0, 0.98, 1.02])
+        >>> dictGetCsvCols(str_path, [3])
+        Traceback (most recent call last):
+        IndexError: Column index 3 out of range of the 3 columns of ...
+        >>>
+    '''
+
+    if not list_cols:
+
+        return {}
+
+    else:
+
+        pass
+
+    with open(str_path, 'r') as fin:
+
+        reader = csv.reader(fin, delimiter=str_delimiter)
+
+        list_header = next(reader, [])
+
+        # resolve the column indices
+        list_index = []
+
+        for i in list_cols:
+
+            if isinstance(i, str):
+
+                if i not in list_header:
+
+                    raise ValueError('Column "' + i + '" not found in the header of ' + str_path)
+
+                else:
+
+                    list_index.append(list_header.index(i))
+
+            elif not (-len(list_header) <= i < len(list_header)):
+
+                raise IndexError('Column index ' + str(i) + ' out of range of the ' + str(len(list_header))
+                                 + ' columns of ' + str_path)
+
+            else:
+
+                list_index.append(i % len(list_header))
+
+        int_width = max(list_index) + 1 if list_index else 0
+
+        if str_typecode:
+
+            list_data = [array(str_typecode) for i in list_index]
+
+            func_convert = _funcCsvConvert(str_typecode)
+
+            str_missing = ''
+
+        else:
+
+            list_data = [[] for i in list_index]
+
+            func_convert = None
+
+            str_missing = None
+
+        # always return tuples, also for a single column
+        getter = itemgetter(*list_index) if len(list_index) > 1 else (lambda row: (row[list_index[0]],))
+
+        list_batch = []
+
+        for row in reader:
+
+            if not row:
+
+                continue
+
+            elif len(row) < int_width:
+
+                row = row + [str_missing] * (int_width - len(row))
+
+            else:
+
+                pass
+
+            list_batch.append(getter(row))
+
+            if len(list_batch) >= int_batch:
+
+                _extendCsvCols(list_data, list_batch, func_convert)
+
+                list_batch = []
+
+        _extendCsvCols(list_data, list_batch, func_convert)
+
+    if str_typecode and bool_numpy and (_loadNumpy() is not None):
+
+        list_data = [np.frombuffer(i, dtype=i.typecode) for i in list_data]
+
+    else:
+
+        pass
+
+    dict_data = dict(zip(list_cols, list_data))
+
+    return dict_data
+
+
+
+def _funcCsvConvert(str_typecode):
+    '''
+    Return the str to number conversion for the given array.array typecode.
+    '''
+
+    if str_typecode in ('f', 'd'):
+
+        return lambda str_in: float(str_in) if str_in.strip() else float('nan')
+
+    else:
+
+        return int
+
+
+
+def _extendCsvCols(list_data, list_batch, func_convert):
+    '''
+    Append a batch of row tuples to the column data, column by column.
+    '''
+
+    if not list_batch:
+
+        return
+
+    else:
+
+        pass
+
+    for (data, tuple_col) in zip(list_data, zip(*list_batch)):
+
+        if func_convert:
+
+            data.extend(map(func_convert, tuple_col))
+
+        else:
+
+            data.extend(tuple_col)
+# ===========================================================================================
+# </Function: get multiple CSV columns in one pass>
+# ===========================================================================================
+
+
+
+# ===========================================================================================
+# <Class: memory-mapped CSV file with a row-offset index>
+# ===========================================================================================
+class CsvFile(object):
+    '''
+    .. _CsvFile :
+
+    This class gives random access to the rows of a CSV file.
+
+    The file is memory-mapped once, and the offsets of all the lines are kept in a row-offset
+    index. The index is saved in a sidecar file (str_path + '.idx' by default), which is only
+    reused if the size and the mtime of the CSV file are unchanged. So opening a large file again
+    does not rescan it.
+
+    Rows are lines, i.e. quoted values must not contain line breaks. Row 0 is the first row after
+    the header (if bool_header).
+
+    Parameters
+    ----------
+    str_path : str
+        The full file path of the CSV file.
+
+    str_delimiter : str
+        The delimiter of the CSV file. Default = ','
+
+    str_encoding : str
+        The encoding of the CSV file. Default = 'utf-8'
+
+    bool_header : bool
+        Whether the first line is the header. Default = True
+
+    str_path_index : str
+        The full file path of the sidecar index file. Default = '' (str_path + '.idx')
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> with CsvFile(str_path) as csv_file:
+        ...     len(csv_file)
+        ...     csv_file.list_header
+        ...     csv_file[1000000]
+        ...     csv_file[20:22]
+        ...     bytes(csv_file.mvLine(20))
+        ...
+        5000000
+        ['Bus', 'Voltage']
+        ['1000000', '1.02']
+        [['20', '0.99'], ['21', '1.01']]
+        b'20,0.99'
+        >>>
+    '''
+
+    # magic, size, mtime_ns, number of offsets
+    CONST_STR_INDEX_FORMAT = '<8sQqQ'
+
+    CONST_BYTES_INDEX_MAGIC = b'MYCSVIDX'
+
+    def __init__(self, str_path, str_delimiter=',', str_encoding='utf-8', bool_header=True, str_path_index=''):
+
+        self.str_path = str_path
+
+        self.str_delimiter = str_delimiter
+
+        self.str_encoding = str_encoding
+
+        self.str_path_index = str_path_index if str_path_index else str_path + '.idx'
+
+        self._fin = open(str_path, 'rb')
+
+        stat = os.fstat(self._fin.fileno())
+
+        # an empty file cannot be mapped
+        if stat.st_size > 0:
+
+            self._mm = mmap.mmap(self._fin.fileno(), 0, access=mmap.ACCESS_READ)
+
+        else:
+
+            self._mm = b''
+
+        self._mv = memoryview(self._mm)
+
+        self.array_offsets = self._arrayLoadIndex(stat.st_size, stat.st_mtime_ns)
+
+        if self.array_offsets is None:
+
+            self.array_offsets = self._arrayBuildIndex()
+
+            self._saveIndex(stat.st_size, stat.st_mtime_ns)
+
+        else:
+
+            pass
+
+        self._int_first = 1 if bool_header else 0
+
+        if bool_header and (len(self.array_offsets) > 1):
+
+            self.list_header = self._listParse(self._mvRawLine(0))
+
+        else:
+
+            self.list_header = []
+
+    def __len__(self):
+
+        return max(0, len(self.array_offsets) - 1 - self._int_first)
+
+    def __getitem__(self, index):
+
+        if isinstance(index, slice):
+
+            return [self._listParse(self.mvLine(i)) for i in range(*index.indices(len(self)))]
+
+        else:
+
+            return self._listParse(self.mvLine(index))
+
+    def __iter__(self):
+
+        for i in range(0, len(self)):
+
+            yield self._listParse(self.mvLine(i))
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *args):
+
+        self.close()
+
+    def mvLine(self, int_row):
+        '''
+        Return the raw bytes of the given row as a memoryview of the mapped file (zero-copy),
+        without the line break.
+        '''
+
+        int_len = len(self)
+
+        if int_row < 0:
+
+            int_row = int_row + int_len
+
+        else:
+
+            pass
+
+        if not (0 <= int_row < int_len):
+
+            raise IndexError('Row index out of range.')
+
+        else:
+
+            pass
+
+        return self._mvRawLine(int_row + self._int_first)
+
+    def close(self):
+        '''
+        Unmap and close the file. Release all the memoryviews from mvLine first.
+        '''
+
+        self._mv.release()
+
+        if isinstance(self._mm, mmap.mmap):
+
+            self._mm.close()
+
+        else:
+
+            pass
+
+        self._fin.close()
+
+    def _mvRawLine(self, int_line):
+
+        int_start = self.array_offsets[int_line]
+
+        int_end = self.array_offsets[int_line + 1]
+
+        # strip the line break
+        if (int_end > int_start) and (self._mm[int_end - 1] == 10):
+
+            int_end = int_end - 1
+
+            if (int_end > int_start) and (self._mm[int_end - 1] == 13):
+
+                int_end = int_end - 1
+
+            else:
+
+                pass
+
+        else:
+
+            pass
+
+        return self._mv[int_start:int_end]
+
+    def _listParse(self, mv_line):
+
+        return next(csv.reader([str(mv_line, self.str_encoding)], delimiter=self.str_delimiter), [])
+
+    def _arrayBuildIndex(self):
+
+        array_offsets = array('Q')
+
+        int_size = len(self._mm)
+
+        if int_size > 0:
+
+            array_offsets.append(0)
+
+        else:
+
+            pass
+
+        mm_find = self._mm.find
+
+        int_pos = mm_find(b'\n')
+
+        while (int_pos >= 0) and (int_pos + 1 < int_size):
+
+            array_offsets.append(int_pos + 1)
+
+            int_pos = mm_find(b'\n', int_pos + 1)
+
+        # the end of the last line
+        array_offsets.append(int_size)
+
+        return array_offsets
+
+    def _arrayLoadIndex(self, int_size, int_mtime_ns):
+
+        int_header = struct.calcsize(self.CONST_STR_INDEX_FORMAT)
+
+        try:
+
+            with open(self.str_path_index, 'rb') as fin:
+
+                (bytes_magic, int_size_idx,
+                 int_mtime_idx, int_count) = struct.unpack(self.CONST_STR_INDEX_FORMAT, fin.read(int_header))
+
+                if (bytes_magic != self.CONST_BYTES_INDEX_MAGIC) or (int_size_idx != int_size) \
+                        or (int_mtime_idx != int_mtime_ns):
+
+                    return None
+
+                else:
+
+                    pass
+
+                array_offsets = array('Q')
+
+                array_offsets.fromfile(fin, int_count)
+
+        except (OSError, EOFError, struct.error):
+
+            return None
+
+        if sys.byteorder == 'big':
+
+            array_offsets.byteswap()
+
+        else:
+
+            pass
+
+        return array_offsets
+
+    def _saveIndex(self, int_size, int_mtime_ns):
+
+        array_offsets = self.array_offsets
+
+        if sys.byteorder == 'big':
+
+            array_offsets = array('Q', array_offsets)
+
+            array_offsets.byteswap()
+
+        else:
+
+            pass
+
+        # the index is only a cache, e.g. a read-only dir is fine
+        try:
+
+            with open(self.str_path_index, 'wb') as fout:
+
+                fout.write(struct.pack(self.CONST_STR_INDEX_FORMAT, self.CONST_BYTES_INDEX_MAGIC,
+                                       int_size, int_mtime_ns, len(array_offsets)))
+
+                array_offsets.tofile(fout)
+
+        except OSError:
+
+            pass
+# ===========================================================================================
+# </Class: memory-mapped CSV file with a row-offset index>
+# ===========================================================================================
+
+
+
+# ===========================================================================================
+# <Function: start a file with system default application>
+# ===========================================================================================
+def start(str_path):
+    '''
+    .. start :
+    
+    This function starts a file using the system default application.
+
+    Parameters
+    ----------
+    str_path : str
+        The full file path of the file.
+
+    Returns
+    -------
+    None.
+    '''
+
+    os.startfile(str_path)
+# ===========================================================================================
+# </Function: start a file with system default application>
+# ===========================================================================================
+
+
+# ===========================================================================================
+# <Function: concat CSV files>
+# ===========================================================================================
+def csvConcat(list_csv_file, str_path_out, bool_check_header=False, int_threads=None):
+    '''
+    .. _csvConcat :
+    
+    This function concats CSV files.
+
+    All CSV files are assumed to have the same header and data format.
+
+    Only the header of the first file will be kept. The actual data will be concated. 
+
+    The output offset of each file is precomputed from the file sizes minus the header lengths,
+    the output file is preallocated, and the files are copied in parallel into their slots with
+    os.copy_file_range (falls back to os.sendfile, then to positional writes). The data are
+    copied as bytes without parsing.
+
+    If a file (other than the last one) does not end with a newline, a newline is inserted after
+    it, so its last row is not glued to the first row of the next file.
+
+    Parameters
+    ----------
+    list_csv_file : list
+        A str list of all the full paths of the CSV files.
+
+    str_path_out : str
+        Full file path for the output CSV file (concated).
+
+    bool_check_header : bool
+        Whether to check that all the headers match the header of the first file (line breaks
+        ignored).
+
+        Default = False
+
+    int_threads : int
+        The number of copying threads. Default = None (ThreadPoolExecutor default)
+
+    Raises
+    ----------
+    ValueError :
+        When bool_check_header and a header does not match.
+
+    IO Error :
+        When operation fails.
+
+    Returns
+    -------
+    True : If no exception.
+
+    Reference
+    ----------------------
+    https://stackoverflow.com/questions/2512386/how-to-merge-200-csv-files-in-python
+    https://stackoverflow.com/questions/44791212/concatenating-multiple-csv-files-into-a-single-csv-with-the-same-header-python/44791368
+    '''
+
+    try:
+
+        # plan the copies: (path, source offset, count, output offset, newline needed)
+        list_copy = []
+
+        bytes_header = None
+
+        int_total = 0
+
+        for (i, fname) in enumerate(list_csv_file):
+
+            with open(fname, 'rb') as infile:
+
+                bytes_first_line = infile.readline()
+
+                int_size = os.fstat(infile.fileno()).st_size
+
+                if int_size > 0:
+
+                    infile.seek(int_size - 1)
+
+                    bool_newline = infile.read(1) == b'\n'
+
+                else:
+
+                    bool_newline = True
+
+            if i == 0:
+
+                bytes_header = bytes_first_line.rstrip(b'\r\n')
+
+            elif bool_check_header and (bytes_first_line.rstrip(b'\r\n') != bytes_header):
+
+                raise ValueError('The header of ' + fname + ' does not match the header of ' + list_csv_file[0])
+
+            else:
+
+                pass
+
+            # throw away header on all but first file
+            int_start = 0 if i == 0 else len(bytes_first_line)
+
+            int_count = int_size - int_start
+
+            bool_add_newline = (int_count > 0) and (not bool_newline) and (i < len(list_csv_file) - 1)
+
+            list_copy.append((fname, int_start, int_count, int_total, bool_add_newline))
+
+            int_total = int_total + int_count + (1 if bool_add_newline else 0)
+
+        # preallocate the output
+        with open(str_path_out, 'wb') as fout:
+
+            fout.truncate(int_total)
+
+        futures = _loadModule('concurrent.futures')
+
+        # block copy the files into their slots without parsing
+        with futures.ThreadPoolExecutor(max_workers=int_threads) as executor:
+
+            list_futures = [executor.submit(_copyToOffset, i, str_path_out) for i in list_copy if i[2] > 0]
+
+            for i in futures.as_completed(list_futures):
+
+                i.result()
+
+        return True
+
+    except ValueError:
+
+        raise
+
+    except:
+
+        raise IOError('Failed to concat CSV files.')
+
+
+
+def _copyToOffset(tuple_copy, str_path_out):
+    '''
+    Copy a byte range of a file into the given offset of the output file. Run in a thread.
+    '''
+
+    (str_path, int_start, int_count, int_dst, bool_add_newline) = tuple_copy
+
+    int_flag = getattr(os, 'O_BINARY', 0)
+
+    int_fd_in = os.open(str_path, os.O_RDONLY | int_flag)
+
+    # each thread has its own output fd, so the file positions do not interfere
+    int_fd_out = os.open(str_path_out, os.O_WRONLY | int_flag)
+
+    try:
+
+        int_done = 0
+
+        # in kernel copy, positional
+        if hasattr(os, 'copy_file_range'):
+
+            try:
+
+                while int_done < int_count:
+
+                    int_temp = os.copy_file_range(int_fd_in, int_fd_out, int_count - int_done,
+                                                  int_start + int_done, int_dst + int_done)
+
+                    if int_temp == 0:
+
+                        break
+
+                    else:
+
+                        int_done = int_done + int_temp
+
+            except OSError:
+
+                pass
+
+        else:
+
+            pass
+
+        # in kernel copy from the current output position
+        if (int_done < int_count) and hasattr(os, 'sendfile'):
+
+            try:
+
+                os.lseek(int_fd_out, int_dst + int_done, os.SEEK_SET)
+
+                while int_done < int_count:
+
+                    int_temp = os.sendfile(int_fd_out, int_fd_in, int_start + int_done, int_count - int_done)
+
+                    if int_temp == 0:
+
+                        break
+
+                    else:
+
+                        int_done = int_done + int_temp
+
+            except OSError:
+
+                pass
+
+        else:
+
+            pass
+
+        # user space copy
+        if int_done < int_count:
+
+            os.lseek(int_fd_in, int_start + int_done, os.SEEK_SET)
+
+            while int_done < int_count:
+
+                bytes_temp = os.read(int_fd_in, min(1024 * 1024, int_count - int_done))
+
+                if not bytes_temp:
+
+                    raise IOError('Unexpected end of file: ' + str_path)
+
+                else:
+
+                    pass
+
+                _writeAllAt(int_fd_out, bytes_temp, int_dst + int_done)
+
+                int_done = int_done + len(bytes_temp)
+
+        else:
+
+            pass
+
+        if bool_add_newline:
+
+            _writeAllAt(int_fd_out, b'\n', int_dst + int_count)
+
+        else:
+
+            pass
+
+    finally:
+
+        os.close(int_fd_in)
+
+        os.close(int_fd_out)
+
+
+
+def _writeAllAt(int_fd, bytes_data, int_offset):
+    '''
+    Write all the bytes at the given offset of a file, retrying after short writes.
+    '''
+
+    mv_data = memoryview(bytes_data)
+
+    while mv_data:
+
+        if hasattr(os, 'pwrite'):
+
+            int_temp = os.pwrite(int_fd, mv_data, int_offset)
+
+        else:
+
+            os.lseek(int_fd, int_offset, os.SEEK_SET)
+
+            int_temp = os.write(int_fd, mv_data)
+
+        if int_temp == 0:
+
+            raise IOError('No progress writing at offset ' + str(int_offset))
+
+        else:
+
+            pass
+
+        mv_data = mv_data[int_temp:]
+
+        int_offset = int_offset + int_temp
+# ===========================================================================================
+# </Function: concat CSV files>
+# ===========================================================================================
+
+
+
+# ===========================================================================================
+# <Function: convert two lists into a dict>
+# ===========================================================================================
+def dict2Lists(list_key, list_val):
+    '''
+    .. _dict2Lists :
+    
+    This function converts two lists into one dictionary. Note that if the two lists do not have 
+    the same length, funny things may happen.
+
+    Parameters
+    ----------
+    list_key : list
+        The lists stores all the keys.
+
+    list_val : list
+        The lists stores all the values.
+
+    Returns
+    -------
+    dict_temp : dict
+        The converted dictionary.
+
+    Reference
+    ----------------------
+    https://stackoverflow.com/questions/209840/convert-two-lists-into-a-dictionary
+    '''
+
+    dict_temp = dict(list(zip(list_key, list_val)))
+
+    return dict_temp
+# ===========================================================================================
+# </Function: convert two lists into a dict>
+# ===========================================================================================
+
+
+
+# ===========================================================================================
+# <Class: compiled multi-term replacer>
+# ===========================================================================================
+class TermReplacer(object):
+    '''
+    .. _TermReplacer :
+
+    This class compiles a search/replacement dictionary once into a single regular expression,
+    so every match in a string is replaced in one left-to-right pass, instead of one scan per
+    term. A compiled replacer can be reused across files and pickled to other processes.
+
+    With bool_longest (default), the terms are compiled into a trie shaped expression, e.g.
+    'ab', 'abc' and 'b' become 'ab(?:c)?|b'. At each position at most one branch of the trie
+    can match, so the cost does not grow with the number of terms like a plain alternation.
+    This gives the leftmost-longest semantics of an Aho-Corasick automaton: the match starting
+    first wins, and among matches starting at the same position the longest one wins.
+
+    Without bool_longest, among matches starting at the same position the term coming first in
+    the dictionary wins. The same trie is used, without the terms that can never win: a term is
+    dropped if a shorter term it starts with comes before it in the dictionary. Then the longest
+    match left is the one coming first, so this is as fast as bool_longest.
+
+    In both cases, the replaced text is not searched again, i.e. a replacement is never replaced
+    by another term. Empty terms are ignored.
+
+    Parameters
+    ----------
+    dict_term : dict
+        The dictionary that contains the search/replacement pairs. Both should be str.
+
+    bool_longest : bool
+        Whether to use the leftmost-longest semantics. Default = True
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> replacer = TermReplacer({'ab': 'x', 'abc': 'y', 'b': 'z'})
+        >>> replacer.strReplace('abcab b')
+        'yx z'
+        >>> replacer.tupleReplace('abcab b')
+        ('yx z', 3)
+        >>> TermReplacer({'ab': 'x', 'abc': 'y'}, bool_longest=False).strReplace('abc')
+        'xc'
+        >>>
+    '''
+
+    def __init__(self, dict_term, bool_longest=True):
+
+        self.dict_term = {k: v for (k, v) in dict_term.items() if len(k) > 0}
+
+        self.bool_longest = bool_longest
+
+        self.int_max_len = max([len(i) for i in self.dict_term] or [0])
+
+        self.regex = re.compile(self._strPattern(list(self.dict_term)))
+
+        self._dict_bytes = {}
+
+    def tupleBytes(self, str_encoding='utf-8'):
+        '''
+        Return a tuple of the compiled bytes expression, the bytes search/replacement dictionary
+        and the max term length in bytes, for replacing in encoded data. Cached per encoding.
+        '''
+
+        if str_encoding not in self._dict_bytes:
+
+            dict_term = {k.encode(str_encoding): v.encode(str_encoding) for (k, v) in self.dict_term.items()}
+
+            # latin-1 maps the bytes 1:1 to chars, so the str pattern builder is reused
+            str_pattern = self._strPattern([i.decode('latin-1') for i in dict_term])
+
+            self._dict_bytes[str_encoding] = (re.compile(str_pattern.encode('latin-1')),
+                                              dict_term,
+                                              max([len(i) for i in dict_term] or [0]))
+
+        else:
+
+            pass
+
+        return self._dict_bytes[str_encoding]
+
+    def strReplace(self, str_in):
+        '''
+        Return the string with all the terms replaced.
+        '''
+
+        return self.regex.sub(self._strSub, str_in)
+
+    def tupleReplace(self, str_in):
+        '''
+        Return a tuple of the string with all the terms replaced and the number of replacements.
+        '''
+
+        return self.regex.subn(self._strSub, str_in)
+
+    def _strSub(self, match):
+
+        return self.dict_term[match.group()]
+
+    def _strPattern(self, list_term):
+
+        # never matches
+        if not list_term:
+
+            return '(?!)'
+
+        else:
+
+            pass
+
+        # build the trie, the '' key marks the end of a term and holds its rank in the dictionary
+        dict_trie = {}
+
+        for (int_rank, str_term) in enumerate(list_term):
+
+            dict_node = dict_trie
+
+            for str_char in str_term:
+
+                dict_node = dict_node.setdefault(str_char, {})
+
+            dict_node[''] = int_rank
+
+        if not self.bool_longest:
+
+            # dictionary order, keep a term only if it comes before all the shorter terms it starts with
+            list_keep = []
+
+            for (int_rank, str_term) in enumerate(list_term):
+
+                dict_node = dict_trie
+
+                int_best = int_rank + 1
+
+                for str_char in str_term[:-1]:
+
+                    dict_node = dict_node[str_char]
+
+                    int_best = min(int_best, dict_node.get('', int_best))
+
+                if int_best > int_rank:
+
+                    list_keep.append(str_term)
+
+                else:
+
+                    pass
+
+            dict_trie = {}
+
+            for str_term in list_keep:
+
+                dict_node = dict_trie
+
+                for str_char in str_term:
+
+                    dict_node = dict_node.setdefault(str_char, {})
+
+                dict_node[''] = None
+
+        else:
+
+            pass
+
+        return _strTriePattern(dict_trie)
+
+
+
+def _strTriePattern(dict_node):
+    '''
+    Convert a trie node of TermReplacer to a regular expression.
+    '''
+
+    list_alt = []
+
+    list_char = []
+
+    for (str_char, dict_child) in sorted((k, v) for (k, v) in dict_node.items() if k):
+
+        str_prefix = re.escape(str_char)
+
+        int_len = 1
+
+        # follow the single branch chains iteratively
+        while (len(dict_child) == 1) and ('' not in dict_child):
+
+            (str_char, dict_child) = next(iter(dict_child.items()))
+
+            str_prefix = str_prefix + re.escape(str_char)
+
+            int_len = int_len + 1
+
+        if list(dict_child) == ['']:
+
+            if int_len == 1:
+
+                list_char.append(str_prefix)
+
+            else:
+
+                list_alt.append(str_prefix)
+
+        else:
+
+            list_alt.append(str_prefix + _strTriePattern(dict_child))
+
+    # single char leaves as a char class
+    if len(list_char) == 1:
+
+        list_alt.append(list_char[0])
+
+    elif list_char:
+
+        list_alt.append('[' + ''.join(list_char) + ']')
+
+    else:
+
+        pass
+
+    if not list_alt:
+
+        return ''
+
+    elif '' in dict_node:
+
+        # greedy, so the longer terms are tried first
+        return '(?:' + '|'.join(list_alt) + ')?'
+
+    elif len(list_alt) == 1:
+
+        return list_alt[0]
+
+    else:
+
+        return '(?:' + '|'.join(list_alt) + ')'
+# ===========================================================================================
+# </Class: compiled multi-term replacer>
+# ===========================================================================================
+
+
+
+# ===========================================================================================
+# <Function: search and replace in a txt like file>
+# ===========================================================================================
+def boolFileReplace(dict_term, str_path_in, str_path_out, bool_longest=False):
+    '''
+    .. _boolFileReplace :
+    
+    This function opens a given txt like file, use the given dictionary to search and replace, 
+    then output the results to a new file.
+
+    Note that you need to make sure that the keys and values of the dict_term are both strings. 
+    Otherwise, your out file may be empty.
+
+    The terms are replaced in a single pass per line by a TermReplacer, which can be given
+    instead of the dictionary to reuse it across files. A replacement is not replaced again by
+    another term.
+
+    By default, among terms matching at the same position the one coming first in the
+    dictionary wins. Unlike replacing the terms one after another, each line is scanned once,
+    so the text a term is replaced with is never matched by a later term.
+
+    Parameters
+    ----------
+    dict_term : dict or TermReplacer
+        The dictionary that contains the search/replacement pairs, or a compiled TermReplacer.
+
+    str_path_in : str
+        Full file path of the input file.
+
+    str_path_out : str
+        Full file path of the output file.
+
+    bool_longest : bool
+        Whether the longest of the terms matching at the same position wins instead (see
+        TermReplacer). Not used if a TermReplacer is given.
+
+        Default = False
+
+    Returns
+    -------
+    bool : bool
+        True = no exception; False = on exception
+
+    Reference
+    ----------------------
+    https://stackoverflow.com/questions/13089234/replacing-text-in-a-file-with-python
+    '''
+
+    try:
+
+        if isinstance(dict_term, TermReplacer):
+
+            replacer = dict_term
+
+        else:
+
+            replacer = TermReplacer(dict_term, bool_longest=bool_longest)
+
+        with open(str_path_in, 'r') as fin, open(str_path_out, 'w+') as fout:
+
+            fout.writelines(map(replacer.strReplace, fin))
+
+        return True
+
+    except:
+
+        return False
+# ===========================================================================================
+#/ <Function: search and replace in a txt like file>
+# ===========================================================================================
+
+
+
+# ===========================================================================================
+# <Function: block streaming search and replace in a file>
+# ===========================================================================================
+def intFileReplace(dict_term, str_path_in, str_path_out='', str_encoding='utf-8', int_block=4 * 1024 * 1024,
+                   bool_longest=False):
+    '''
+    .. _intFileReplace :
+
+    This function searches and replaces the terms of a file in large binary blocks, and returns
+    the number of replacements.
+
+    Unlike boolFileReplace, the file does not need to have lines, e.g. minified JSON or a single
+    line XML dump works in bounded memory. A match spanning two blocks is found, because the
+    last bytes of a block that may still start a match are carried over to the next block. The
+    terms are replaced as by TermReplacer (see its semantics), on the encoded bytes.
+
+    If no output file path is given, the input file is rewritten in place atomically: the data
+    are written to a temporary file in the same directory, which then replaces the input file
+    with os.replace.
+
+    Parameters
+    ----------
+    dict_term : dict or TermReplacer
+        The dictionary that contains the search/replacement pairs, or a compiled TermReplacer.
+
+    str_path_in : str
+        Full file path of the input file.
+
+    str_path_out : str
+        Full file path of the output file. Default = '' (rewrite the input file in place)
+
+    str_encoding : str
+        The encoding of the file. It should be self-synchronising (e.g. UTF-8, ASCII or a single
+        byte encoding), so a match of the encoded bytes is a match of the text.
+
+        Default = 'utf-8'
+
+    int_block : int
+        The size in bytes of the blocks read at a time. Default = 4 MB
+
+    bool_longest : bool
+        Whether the longest of the terms matching at the same position wins, instead of the one
+        coming first in the dictionary (see TermReplacer), as in boolFileReplace. Not used if a
+        TermReplacer is given.
+
+        Default = False
+
+    Returns
+    -------
+    int_count : int
+        The number of replacements.
+
+    Raises
+    ----------
+    OSError :
+        When reading or writing fails. An in-place input file is left unchanged.
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> intFileReplace({'foo': 'bar'}, 'c:/dump.xml')
+        1024
+        >>>
+    '''
+
+    if isinstance(dict_term, TermReplacer):
+
+        replacer = dict_term
+
+    else:
+
+        replacer = TermReplacer(dict_term, bool_longest=bool_longest)
+
+    (regex, dict_bytes, int_max_len) = replacer.tupleBytes(str_encoding)
+
+    func_sub = lambda match: dict_bytes[match.group()]
+
+    bool_inplace = (not str_path_out) or (os.path.exists(str_path_out) and os.path.samefile(str_path_in, str_path_out))
+
+    if bool_inplace:
+
+        str_dir = os.path.dirname(os.path.abspath(str_path_in))
+
+        (int_fd, str_path_write) = tempfile.mkstemp(dir=str_dir, prefix='.' + os.path.basename(str_path_in) + '.')
+
+        os.close(int_fd)
+
+    else:
+
+        str_path_write = str_path_out
+
+    int_count = 0
+
+    try:
+
+        with open(str_path_in, 'rb') as fin, open(str_path_write, 'wb') as fout:
+
+            bytes_carry = b''
+
+            while True:
+
+                bytes_block = fin.read(int_block)
+
+                bytes_buf = bytes_carry + bytes_block
+
+                # end of file, replace the rest
+                if not bytes_block:
+
+                    (bytes_temp, int_temp) = regex.subn(func_sub, bytes_buf)
+
+                    fout.write(bytes_temp)
+
+                    int_count = int_count + int_temp
+
+                    break
+
+                else:
+
+                    pass
+
+                # all the matches starting up to here end inside the buffer, so they are final
+                int_limit = len(bytes_buf) - int_max_len
+
+                int_pos = 0
+
+                list_out = []
+
+                for match in regex.finditer(bytes_buf):
+
+                    if match.start() > int_limit:
+
+                        break
+
+                    else:
+
+                        pass
+
+                    list_out.append(bytes_buf[int_pos:match.start()])
+
+                    list_out.append(dict_bytes[match.group()])
+
+                    int_pos = match.end()
+
+                    int_count = int_count + 1
+
+                # carry over the tail that may still start a match
+                int_cut = max(int_pos, int_limit + 1)
+
+                list_out.append(bytes_buf[int_pos:int_cut])
+
+                fout.write(b''.join(list_out))
+
+                bytes_carry = bytes_buf[int_cut:]
+
+        if bool_inplace:
+
+            shutil.copymode(str_path_in, str_path_write)
+
+            os.replace(str_path_write, str_path_in)
+
+        else:
+
+            pass
+
+    except:
+
+        if bool_inplace and os.path.exists(str_path_write):
+
+            os.unlink(str_path_write)
+
+        else:
+
+            pass
+
+        raise
+
+    return int_count
+# ===========================================================================================
+# </Function: block streaming search and replace in a file>
+# ===========================================================================================
+
+
+
+# ===========================================================================================
+# <Function: parallel search and replace in many files>
+# ===========================================================================================
+def dictBatchReplace(dict_term, str_root='', str_filter='*', list_paths=None, str_dir_out='',
+                     str_encoding='utf-8', int_processes=None, int_chunksize=16, bool_longest=False):
+    '''
+    .. _dictBatchReplace :
+
+    This function searches and replaces the terms in many files in a process pool.
+
+    The files are either the ones under str_root matching str_filter (see listGetPathRecursive),
+    or the given list_paths. The terms are compiled once into a TermReplacer, which is sent
+    once to each process, and each file is replaced by intFileReplace.
+
+    Parameters
+    ----------
+    dict_term : dict or TermReplacer
+        The dictionary that contains the search/replacement pairs, or a compiled TermReplacer.
+
+    str_root : str
+        The root directory to search for the files. Default = ''
+
+    str_filter : str
+        The file filter, in the format of '*.filter'. Default = '*'
+
+    list_paths : list
+        The file paths. Used instead of searching str_root if given. Default = None
+
+    str_dir_out : str
+        The output directory. The output files keep their paths relative to str_root (or their
+        filenames, if no str_root is given).
+
+        Default = '' (rewrite the files in place)
+
+    str_encoding : str
+        The encoding of the files. Default = 'utf-8'
+
+    int_processes : int
+        The number of processes. If 1, the files are replaced in this process.
+
+        Default = None (the number of CPUs)
+
+    int_chunksize : int
+        The number of files sent to a process at a time. Default = 16
+
+    bool_longest : bool
+        Whether the longest of the terms matching at the same position wins, instead of the one
+        coming first in the dictionary (see TermReplacer), as in boolFileReplace. Not used if a
+        TermReplacer is given.
+
+        Default = False
+
+    Returns
+    -------
+    dict_result : dict
+        The tuple of (int_count, str_error) of each file path. The int_count is the number of
+        replacements; the str_error is '' on success, or the error message (with int_count = 0).
+
+    Raises
+    ------
+    ValueError :
+        When two files would be written to the same path (e.g. the same filename in different
+        directories of list_paths without str_root, or a file given twice), before any file is
+        replaced.
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> dict_result = dictBatchReplace({'$HOST$': 'srv01'}, 'c:/configs', '*.ini')
+        >>> [k for (k, v) in dict_result.items() if v[1]]
+        []
+        >>>
+    '''
+
+    if isinstance(dict_term, TermReplacer):
+
+        replacer = dict_term
+
+    else:
+
+        replacer = TermReplacer(dict_term, bool_longest=bool_longest)
+
+    # compile the bytes expression once, it is sent with the replacer
+    replacer.tupleBytes(str_encoding)
+
+    if list_paths is None:
+
+        list_paths = listGetPathRecursive(str_root, str_filter)
+
+    else:
+
+        pass
+
+    list_args = []
+
+    # the files written, each at most once
+    dict_written = {}
+
+    for str_path in list_paths:
+
+        if not str_dir_out:
+
+            str_path_out = ''
+
+        elif str_root:
+
+            str_path_out = os.path.join(str_dir_out, os.path.relpath(str_path, str_root))
+
+        else:
+
+            str_path_out = os.path.join(str_dir_out, os.path.basename(str_path))
+
+        str_written = os.path.normcase(os.path.abspath(str_path_out if str_path_out else str_path))
+
+        if str_written in dict_written:
+
+            raise ValueError('Both "' + dict_written[str_written] + '" and "' + str_path + '" would be written to "'
+                             + (str_path_out if str_path_out else str_path) + '".')
+
+        else:
+
+            dict_written[str_written] = str_path
+
+        list_args.append((str_path, str_path_out, str_encoding))
+
+    if int_processes == 1:
+
+        _initReplaceWorker(replacer)
+
+        list_result = list(map(_tupleReplaceWorker, list_args))
+
+    else:
+
+        futures = _loadModule('concurrent.futures')
+
+        with futures.ProcessPoolExecutor(max_workers=int_processes,
+                                                    initializer=_initReplaceWorker,
+                                                    initargs=(replacer,)) as executor:
+
+            list_result = list(executor.map(_tupleReplaceWorker, list_args, chunksize=int_chunksize))
+
+    dict_result = dict(zip(list_paths, list_result))
+
+    return dict_result
+
+
+
+# the replacer of the current process, set by _initReplaceWorker
+_replacer_worker = None
+
+
+
+def _initReplaceWorker(replacer):
+    '''
+    Keep the replacer of dictBatchReplace in the process.
+    '''
+
+    global _replacer_worker
+
+    _replacer_worker = replacer
+
+
+
+def _tupleReplaceWorker(tuple_args):
+    '''
+    Replace the terms in one file of dictBatchReplace. Run in the process pool.
+    '''
+
+    (str_path, str_path_out, str_encoding) = tuple_args
+
+    try:
+
+        if str_path_out:
+
+            str_dir = os.path.dirname(str_path_out)
+
+            if str_dir:
+
+                os.makedirs(str_dir, exist_ok=True)
+
+            else:
+
+                pass
+
+        int_count = intFileReplace(_replacer_worker, str_path, str_path_out, str_encoding=str_encoding)
+
+        return (int_count, '')
+
+    except Exception as e:
+
+        return (0, str(e) or e.__class__.__name__)
+# ===========================================================================================
+# </Function: parallel search and replace in many files>
+# ===========================================================================================
+
+
+
+# =============================================================================
+# <Function: get system local time and date>
+# =============================================================================
+def strLocalTime(str_format):
+    """
+    .. _strLocalTime :
+    
+    Return the system local date and time as a string according to the given format.
+
+    Parameters
+    ----------
+    str_format : str
+        Date/Time code format.
+
+        Example: '%Y-%m-%d, %H:%M:%S'
+
+
+    Returns
+    -------
+    str_date_time : str
+        Formatted system local date time string.
+    """
+
+    str_date_time = time.strftime(str_format, time.localtime())
+
+    return str_date_time
+# =============================================================================
+# </Function: get system local time and date>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: find all the positions of a substring in a string>
+# =============================================================================
+def listPosInStr(str_in, str_sub):
+    '''
+    .. _listPosInStr :
+    
+    This function finds the positions of the str_sub in the str_in and returns them as a list.
+
+    Parameters
+    ----------
+    str_in : str
+        The original string for searching.
+
+    str_sub : str
+        The substring to be searched.
+
+    Returns
+    -------
+    list_temp : list
+        The list that contains the positions of the str_sub
+
+    Reference
+    ----------------------
+    https://stackoverflow.com/questions/2294493/how-to-get-the-position-of-a-character-in-python/32794963#32794963
+    '''
+
+    list_temp = [pos for pos, char in enumerate(str_in) if char == str_sub]
+
+    return list_temp
+# =============================================================================
+# </Function: find all the positions of a substring in a string>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: natural sort>
+# =============================================================================
+# the digit runs of a string, kept by re.split
+_regex_natural = re.compile('([0-9]+)')
+
+
+
+def tupleNaturalKey(str_in):
+    '''
+    .. _tupleNaturalKey :
+
+    This function returns the natural sort key of a string.
+
+    The string is split into its digit runs and the text between them, with the precompiled
+    tokenizer. The key is a tuple of the lower case text and the int values in turns, always
+    starting with a text (maybe empty). So the same position of two keys always holds the same
+    type, and the keys of any two strings can be compared.
+
+    Parameters
+    ----------
+    str_in : str
+        The string.
+
+    Returns
+    -------
+    tuple :
+        The natural sort key.
+
+    Example
+    -------
+    .. code:: python
+
+        >>> tupleNaturalKey('File10b.txt')
+        ('file', 10, 'b.txt')
+        >>> tupleNaturalKey('2x')
+        ('', 2, 'x')
+        >>>
+    '''
+
+    # lowering does not touch the digits, so lower once before splitting
+    list_temp = _regex_natural.split(str_in.lower())
+
+    list_temp[1::2] = map(int, list_temp[1::2])
+
+    return tuple(list_temp)
+
+
+
+# memoised tupleNaturalKey, for repeated sorts of the same strings
+tupleNaturalKeyCached = lru_cache(maxsize=1024 * 1024)(tupleNaturalKey)
+
+
+
+def listNaturalSort(l, key=None, bool_reverse=False, bool_cache=False):
+    '''
+    .. _listNaturalSort :
+
+    This function sorts strings (or records by a string field) in the natural order, e.g.
+    'file2' before 'file10'. The sort key is tupleNaturalKey.
+
+    Parameters
+    ----------
+    l : iterable
+        The strings or records to sort.
+
+    key : callable
+        The function returning the string of a record to sort by, as in sorted().
+
+        Default = None (sort the strings themselves)
+
+    bool_reverse : bool
+        Whether to sort in descending order. Default = False
+
+    bool_cache : bool
+        Whether to memoise the keys (see tupleNaturalKeyCached). This speeds up repeated sorts
+        of the same strings.
+
+        Default = False
+
+    Returns
+    -------
+    list :
+        The sorted list.
+
+    Reference
+    ---------
+    https://stackoverflow.com/questions/4836710/does-python-have-a-built-in-function-for-string-natural-sort
+
+    Example
+    -------
+    .. code:: python
+
+        >>> listNaturalSort(['a10', 'A2', 'a1'])
+        ['a1', 'A2', 'a10']
+        >>> listNaturalSort([('a10', 1), ('a2', 2)], key=lambda i: i[0])
+        [('a2', 2), ('a10', 1)]
+        >>>
+    '''
+
+    func_key = tupleNaturalKeyCached if bool_cache else tupleNaturalKey
+
+    if key is not None:
+
+        func_natural = func_key
+
+        func_key = lambda i: func_natural(key(i))
+
+    else:
+
+        pass
+
+    return sorted(l, key=func_key, reverse=bool_reverse)
+# =============================================================================
+# </Function: natural sort>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: top k in natural order>
+# =============================================================================
+def listNaturalTopK(iter_in, int_k, key=None, bool_reverse=False, bool_cache=False):
+    '''
+    .. _listNaturalTopK :
+
+    This function returns the first int_k items of an iterable in the natural order, i.e. the
+    same as listNaturalSort(iter_in, ...)[:int_k], without sorting (or holding) all of them.
+
+    The items are streamed through a heap of int_k items (heapq.nsmallest / heapq.nlargest),
+    so it takes O(n log k) time and O(k) memory, e.g. the first 1000 names of a manifest file
+    of 100M lines.
+
+    Parameters
+    ----------
+    iter_in : iterable
+        The strings or records, e.g. an opened file.
+
+    int_k : int
+        The number of items to return.
+
+    key, bool_reverse, bool_cache :
+        See listNaturalSort.
+
+    Returns
+    -------
+    list :
+        The first int_k items, sorted.
+
+    Example
+    -------
+    .. code:: python
+
+        >>> listNaturalTopK(['a10', 'a2', 'a1', 'a3'], 2)
+        ['a1', 'a2']
+        >>> listNaturalTopK(['a10', 'a2', 'a1', 'a3'], 2, bool_reverse=True)
+        ['a10', 'a3']
+        >>>
+    '''
+
+    func_key = tupleNaturalKeyCached if bool_cache else tupleNaturalKey
+
+    if key is not None:
+
+        func_natural = func_key
+
+        func_key = lambda i: func_natural(key(i))
+
+    else:
+
+        pass
+
+    if bool_reverse:
+
+        return heapq.nlargest(int_k, iter_in, key=func_key)
+
+    else:
+
+        return heapq.nsmallest(int_k, iter_in, key=func_key)
+# =============================================================================
+# </Function: top k in natural order>
+# =============================================================================
+
+
+
+# =============================================================================
+# <Function: external (on-disk) merge sort of lines>
+# =============================================================================
+def genExternalSort(iter_lines, key=None, int_max_memory=CONST_INT_MAX_MEMORY, str_dir_tmp=None,
+                    bool_reverse=False):
+    '''
+    .. _genExternalSort :
+
+    This function sorts lines with a bounded memory budget and yields them in order.
+
+    The lines are collected until the memory budget is used up, sorted and spilled to a
+    temporary file (a run). The runs are then merged lazily with heapq.merge. If all the lines
+    fit into the budget, no temporary file is written.
+
+    A line without the trailing newline (e.g. the last line of a file) gets one appended.
+
+    Parameters
+    ----------
+    iter_lines : iterable
+        The str lines to be sorted, e.g. an opened file.
+
+    key : callable
+        The sort key, as in sorted(). Default = None
+
+    int_max_memory : int
+        The approximate memory budget in bytes of the lines held in memory.
+
+        Default = CONST_INT_MAX_MEMORY
+
+    str_dir_tmp : str
+        The directory for the temporary run files. Default = None (system temp dir)
+
+    bool_reverse : bool
+        Whether to sort in descending order. The sort is stable either way. Default = False
+
+    Returns
+    -------
+    generator :
+        The sorted lines.
+
+    Examples
+    --------
+    .. code:: python
+
+        with open(str_path_in, 'r') as fin, open(str_path_out, 'w') as fout:
+
+            fout.writelines(genExternalSort(fin, int_max_memory=256 * 1024**2))
+    '''
+
+    with tempfile.TemporaryDirectory(dir=str_dir_tmp) as str_dir:
+
+        list_runs = []
+
+        list_buf = []
+
+        int_size = 0
+
+        for str_line in iter_lines:
+
+            if not str_line.endswith('\n'):
+
+                str_line = str_line + '\n'
+
+            list_buf.append(str_line)
+
+            # the line, its list slot and its sort key
+            int_size = int_size + 2 * sys.getsizeof(str_line) + 8
+
+            if int_size >= int_max_memory:
+
+                list_buf.sort(key=key, reverse=bool_reverse)
+
+                list_runs.append(_strWriteRun(list_buf, str_dir, len(list_runs)))
+
+                list_buf = []
+
+                int_size = 0
+
+        list_buf.sort(key=key, reverse=bool_reverse)
+
+        # all fit into memory
+        if not list_runs:
+
+            yield from list_buf
+
+            return
+
+        else:
+
+            pass
+
+        if list_buf:
+
+            list_runs.append(_strWriteRun(list_buf, str_dir, len(list_runs)))
+
+        list_buf = None
+
+        # merge in passes to limit the number of opened files; each group of adjacent runs is
+        # merged into one run at its place, so the runs stay in input order and the sort stable
+        int_count = len(list_runs)
+
+        while len(list_runs) > CONST_INT_MAX_RUNS:
+
+            list_merged = []
+
+            for i in range(0, len(list_runs), CONST_INT_MAX_RUNS):
+
+                list_temp = list_runs[i:i + CONST_INT_MAX_RUNS]
+
+                if len(list_temp) == 1:
+
+                    list_merged.append(list_temp[0])
+
+                    continue
+
+                else:
+
+                    pass
+
+                list_fin = _listOpenRuns(list_temp, int_max_memory)
+
+                try:
+
+                    list_merged.append(_strWriteRun(heapq.merge(*list_fin, key=key, reverse=bool_reverse),
+                                                    str_dir, int_count))
+
+                finally:
+
+                    for fin in list_fin:
+
+                        fin.close()
+
+                int_count = int_count + 1
+
+                for str_path in list_temp:
+
+                    os.unlink(str_path)
+
+            list_runs = list_merged
+
+        list_fin = _listOpenRuns(list_runs, int_max_memory)
+
+        try:
+
+            yield from heapq.merge(*list_fin, key=key, reverse=bool_reverse)
+
+        finally:
+
+            for fin in list_fin:
+
+                fin.close()
+
+
+
+def _strWriteRun(iter_lines, str_dir, int_index):
+    '''
+    Write a sorted run of genExternalSort and return its path.
+    '''
+
+    str_path = os.path.join(str_dir, 'run_' + str(int_index) + '.txt')
+
+    with open(str_path, 'w', encoding='utf-8', errors='surrogatepass', newline='\n') as fout:
+
+        fout.writelines(iter_lines)
+
+    return str_path
+
+
+
+def _listOpenRuns(list_runs, int_max_memory):
+    '''
+    Open the runs of genExternalSort with buffers sharing the memory budget.
+    '''
+
+    int_buffer = max(8192, int_max_memory // (2 * len(list_runs)))
+
+    return [open(i, 'r', buffering=int_buffer, encoding='utf-8', errors='surrogatepass', newline='\n')
+            for i in list_runs]
+# =============================================================================
+# </Function: external (on-disk) merge sort of lines>
+# =============================================================================
 
-    else:
 
-        print('Source directory not found.')
 
-        return list()
-# =============================================================================
-# </Function: get all file paths with filter>
 # =============================================================================
+# <Function: natural sort the lines of a file>
+# =============================================================================
+def intNaturalSortFile(str_path_in, str_path_out, bool_reverse=False, int_top=0, str_encoding='utf-8',
+                       int_max_memory=CONST_INT_MAX_MEMORY, str_dir_tmp=None):
+    '''
+    .. _intNaturalSortFile :
+
+    This function sorts the lines of a text file in the natural order (see listNaturalSort)
+    with a bounded memory budget, and writes them to another file.
+
+    The lines are sorted with genExternalSort, i.e. in sorted runs spilled to temporary files
+    and merged, so a file much larger than the memory can be sorted. With int_top, only the
+    first int_top lines are kept, with listNaturalTopK (no temporary file).
+
+    The line endings are not part of the sort key. The lines are written with '\n'.
+
+    Parameters
+    ----------
+    str_path_in : str
+        The path of the file to sort.
+
+    str_path_out : str
+        The path of the sorted file.
 
+    bool_reverse : bool
+        Whether to sort in descending order. Default = False
 
+    int_top : int
+        The number of first lines to write. Default = 0 (all)
 
-# =============================================================================
-# <Function: get parent path>
-# =============================================================================
-def strGetParPath(str_scr):
-    '''
-    .. _strGetParPath :
-    
-    This function returns the parent path of the given path.
+    str_encoding : str
+        The encoding of the file. Undecodable bytes are written back as they are.
 
-    Parameters
-    ----------
-    str_scr : str
-        The given path.
+        Default = 'utf-8'
 
-    Returns
-    -------
-    str_temp : str
-        The parent path of the given path.
+    int_max_memory : int
+        The approximate memory budget in bytes. Default = CONST_INT_MAX_MEMORY
 
-    Reference
-    ---------
-    https://stackoverflow.com/questions/19153462/get-excel-style-column-names-from-column-number
+    str_dir_tmp : str
+        The directory for the temporary files. Default = None (system temp dir)
 
-    Example
+    Returns
     -------
+    int :
+        The number of lines written.
+
+    Examples
+    --------
     .. code:: python
 
-        >>> str_par = os.path.join('c:/', 'parent', 'scr')
-        >>> str_par
-        'c:/parent\\scr'
-        >>> strGetParPath(str_par)
-        'c:\\parent'
+        >>> intNaturalSortFile('c:/manifest.txt', 'c:/manifest_sorted.txt', int_max_memory=512 * 1024**2)
+        100000000
         >>>
     '''
 
-    str_temp = os.path.abspath(os.path.join(str_scr, os.pardir))
+    int_count = 0
 
-    return str_temp
-# =============================================================================
-# </Function: get parent path>
-# =============================================================================
+    with open(str_path_in, 'r', encoding=str_encoding, errors='surrogateescape') as fin, \
+         open(str_path_out, 'w', encoding=str_encoding, errors='surrogateescape', newline='\n') as fout:
+
+        if int_top > 0:
+
+            iter_lines = listNaturalTopK(fin, int_top, key=_strStripNewline, bool_reverse=bool_reverse)
+
+        else:
+
+            iter_lines = genExternalSort(fin, key=_tupleNaturalLineKey, int_max_memory=int_max_memory,
+                                         str_dir_tmp=str_dir_tmp, bool_reverse=bool_reverse)
+
+        for str_line in iter_lines:
+
+            if not str_line.endswith('\n'):
+
+                str_line = str_line + '\n'
+
+            else:
+
+                pass
+
+            fout.write(str_line)
 
+            int_count = int_count + 1
 
+    return int_count
 
+
+
+def _strStripNewline(str_line):
+    '''
+    Return a line without its trailing newline.
+    '''
+
+    return str_line.rstrip('\n')
+
+
+
+def _tupleNaturalLineKey(str_line):
+    '''
+    The natural sort key of a line of genExternalSort, which always ends with a newline.
+    '''
+
+    return tupleNaturalKey(str_line[:-1])
 # =============================================================================
-# <Function: convert a string of numbers to a list>
+# </Function: natural sort the lines of a file>
 # =============================================================================
-def listNumStr2List(str_in, str_delimit=',', str_type='int'):
+
+
+
+# ===========================================================================================
+# <Class: compact set of 64-bit digests>
+# ===========================================================================================
+class DigestSet(object):
     '''
-    .. _listNumStr2List :
-    
-    This function converts a delimited, numericable string into a list.
+    .. _DigestSet :
 
-    Supports all int or all float.
+    This class is a compact set of items, which keeps only a 64-bit digest of each item (see
+    intItemDigest) in an open addressing hash table backed by an array('Q'). The table is
+    doubled when more than FLOAT_MAX_LOAD (0.7) of its 8-byte slots are used, so it takes about
+    11.5 bytes per item when full and up to about 23 right after doubling, whatever the size of
+    the items, i.e. about 4 to 8 times less than a set of short str (about 90 bytes per item
+    with the str), and the items themselves are never held.
+
+    Two different items with the same digest are taken as the same item. The chance of any
+    such collision among n items is about n**2 / 2**65, e.g. 1/1000 for 200M items. Use the
+    exact mode of genUnique if it matters.
 
     Parameters
     ----------
-    str_in : str
-        The input string.
+    int_capacity : int
+        The expected number of items. The table grows when needed.
 
-    str_delimit : str
-        The delimiter. Default = ','
+        Default = CONST_INT_DEDUPE_CAPACITY
 
-    str_type : str
-        Specify the number type. Default = 'int'
+    Examples
+    --------
+    .. code:: python
 
-        If not default, this function would try to convert the string to float.
-        
-    Returns
-    -------
-    list_temp : list
-        The converted list.
+        >>> set_seen = DigestSet()
+        >>> set_seen.add('a')
+        True
+        >>> set_seen.add('a')
+        False
+        >>> 'a' in set_seen, 'b' in set_seen, len(set_seen)
+        (True, False, 1)
+        >>>
+    '''
 
-    Reference
-    ---------
-    https://stackoverflow.com/questions/19153462/get-excel-style-column-names-from-column-number
+    # max ratio of the used slots of the table
+    FLOAT_MAX_LOAD = 0.7
 
-    Example
-    -------
-    .. code:: python
+    def __init__(self, int_capacity=CONST_INT_DEDUPE_CAPACITY):
 
-        >>> a = '1, 2, 3, 4, 5,     0'
-        >>> listNumStr2List(a)
-        [1, 2, 3, 4, 5, 0]
-        >>> a = '1.0,2.0,3.0'
-        >>> listNumStr2List(a)
-        Traceback (most recent call last):
-        File "<stdin>", line 1, in <module>
-        File "...\gsyMain.py", line 819, in listNumStr2List
+        int_size = 8
 
-        ValueError: invalid literal for int() with base 10: '1.0'
-        >>> listNumStr2List(a, str_type='float')
-        [1.0, 2.0, 3.0]
-        >>> b = '1|2|3'
-        >>> listNumStr2List(b, '|')
-        [1, 2, 3]
+        while int_size * self.FLOAT_MAX_LOAD < int_capacity:
+
+            int_size = int_size * 2
+
+        # 0 marks an empty slot, the digest 0 is stored as 1
+        self._array = array('Q', [0]) * int_size
+
+        self._int_len = 0
+
+    def __len__(self):
+
+        return self._int_len
+
+    def __contains__(self, item):
+
+        return self.boolHasDigest(intItemDigest(item))
+
+    def add(self, item):
+        '''
+        Add an item. Return True if it was not in the set.
+        '''
+
+        return self.boolAddDigest(intItemDigest(item))
+
+    def boolHasDigest(self, int_digest):
+        '''
+        Return whether a digest (see intItemDigest) is in the set.
+        '''
+
+        int_digest = (int_digest & 0xFFFFFFFFFFFFFFFF) or 1
+
+        array_slot = self._array
+
+        int_mask = len(array_slot) - 1
+
+        i = int_digest & int_mask
+
+        while True:
+
+            int_slot = array_slot[i]
+
+            if int_slot == int_digest:
+
+                return True
+
+            elif int_slot == 0:
+
+                return False
+
+            else:
+
+                i = (i + 1) & int_mask
+
+    def boolAddDigest(self, int_digest):
+        '''
+        Add a digest (see intItemDigest). Return True if it was not in the set.
+        '''
+
+        int_digest = (int_digest & 0xFFFFFFFFFFFFFFFF) or 1
+
+        array_slot = self._array
+
+        int_mask = len(array_slot) - 1
+
+        i = int_digest & int_mask
+
+        # linear probing
+        while True:
+
+            int_slot = array_slot[i]
+
+            if int_slot == int_digest:
+
+                return False
+
+            elif int_slot == 0:
+
+                break
+
+            else:
+
+                i = (i + 1) & int_mask
+
+        array_slot[i] = int_digest
+
+        self._int_len = self._int_len + 1
+
+        if self._int_len > len(array_slot) * self.FLOAT_MAX_LOAD:
+
+            self._grow()
+
+        else:
+
+            pass
+
+        return True
+
+    def _grow(self):
+        '''
+        Double the table and insert the digests again.
+        '''
+
+        array_old = self._array
+
+        self._array = array('Q', [0]) * (2 * len(array_old))
+
+        self._int_len = 0
+
+        for i in array_old:
+
+            if i:
+
+                self.boolAddDigest(i)
+
+            else:
+
+                pass
+# ===========================================================================================
+# </Class: compact set of 64-bit digests>
+# ===========================================================================================
+
+
+
+# ===========================================================================================
+# <Class: Bloom filter>
+# ===========================================================================================
+class BloomFilter(object):
+    '''
+    .. _BloomFilter :
+
+    This class is a Bloom filter, i.e. a bit array answering whether an item may have been
+    added (with a false positive rate) or has surely not been added (never wrong).
+
+    The number of bits and of hash functions are chosen for int_capacity items at the false
+    positive rate float_fp_rate, e.g. 1.2 bytes per item at 1% and 1.8 bytes per item at 0.1%.
+    Adding more items than int_capacity raises the false positive rate. The bit positions are
+    derived from the 128-bit item digest by double hashing (see intItemDigest).
+
+    A filter can be saved to a file (a small header and the raw bits) and loaded back. By
+    default the loaded bits are memory-mapped read-only, so a filter of a huge reference set is
+    built once and then opened instantly, shared by the page cache of all processes.
+
+    Parameters
+    ----------
+    int_capacity : int
+        The expected number of items. Default = CONST_INT_DEDUPE_CAPACITY
+
+    float_fp_rate : float
+        The false positive rate at int_capacity items. Default = 0.01
+
+    Examples
+    --------
+    .. code:: python
+
+        >>> bloom = BloomFilter(1000, 0.01)
+        >>> bloom.add('a')
+        True
+        >>> 'a' in bloom, 'b' in bloom
+        (True, False)
+        >>> bloom.save('c:/ref.bloom')
+        >>> with BloomFilter.load('c:/ref.bloom') as bloom_ref:
+        ...     'a' in bloom_ref
+        True
         >>>
     '''
 
-    list_temp = []
+    # magic, number of bits, number of hashes, number of items
+    CONST_STR_FILE_FORMAT = '<8sQQQ'
+
+    CONST_BYTES_FILE_MAGIC = b'MYBLOOM1'
+
+    def __init__(self, int_capacity=CONST_INT_DEDUPE_CAPACITY, float_fp_rate=0.01):
+
+        int_capacity = max(1, int_capacity)
+
+        self.int_bits = max(64, int(math.ceil(-int_capacity * math.log(float_fp_rate) / math.log(2) ** 2)))
+
+        self.int_hashes = max(1, int(round(self.int_bits / int_capacity * math.log(2))))
+
+        self.int_count = 0
+
+        self._bits = bytearray((self.int_bits + 7) // 8)
+
+        self._mm = None
+
+    @classmethod
+    def fromIterable(cls, iter_in, int_capacity=CONST_INT_DEDUPE_CAPACITY, float_fp_rate=0.01):
+        '''
+        Return a new filter of all the items of an iterable.
+        '''
+
+        bloom = cls(int_capacity, float_fp_rate)
+
+        func_add = bloom.boolAddDigest
+
+        for i in iter_in:
+
+            func_add(intItemDigest(i))
+
+        return bloom
+
+    @classmethod
+    def load(cls, str_path, bool_mmap=True):
+        '''
+        Return the filter saved in a file. With bool_mmap, the bits are memory-mapped read-only
+        (no item can be added) until close(), else they are read into memory.
+        '''
+
+        bloom = cls.__new__(cls)
+
+        int_header = struct.calcsize(cls.CONST_STR_FILE_FORMAT)
+
+        with open(str_path, 'rb') as fin:
+
+            (bytes_magic, bloom.int_bits,
+             bloom.int_hashes, bloom.int_count) = struct.unpack(cls.CONST_STR_FILE_FORMAT, fin.read(int_header))
+
+            if bytes_magic != cls.CONST_BYTES_FILE_MAGIC:
+
+                raise ValueError('Not a Bloom filter file: ' + str_path)
+
+            else:
+
+                pass
+
+            int_len = (bloom.int_bits + 7) // 8
+
+            if bool_mmap:
+
+                bloom._mm = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+
+                bloom._bits = memoryview(bloom._mm)[int_header:int_header + int_len]
+
+            else:
+
+                bloom._mm = None
+
+                bloom._bits = bytearray(fin.read(int_len))
+
+            if len(bloom._bits) != int_len:
+
+                bloom.close()
+
+                raise ValueError('Truncated Bloom filter file: ' + str_path)
+
+            else:
+
+                pass
+
+        return bloom
+
+    def copy(self):
+        '''
+        Return a writable in-memory copy of the filter, e.g. of a memory-mapped one.
+        '''
+
+        bloom = self.__class__.__new__(self.__class__)
+
+        (bloom.int_bits, bloom.int_hashes, bloom.int_count) = (self.int_bits, self.int_hashes, self.int_count)
+
+        bloom._bits = bytearray(self._bits)
+
+        bloom._mm = None
+
+        return bloom
+
+    def save(self, str_path):
+        '''
+        Save the filter to a file.
+        '''
+
+        with open(str_path, 'wb') as fout:
+
+            fout.write(struct.pack(self.CONST_STR_FILE_FORMAT, self.CONST_BYTES_FILE_MAGIC,
+                                   self.int_bits, self.int_hashes, self.int_count))
+
+            fout.write(self._bits)
+
+    def close(self):
+        '''
+        Unmap the bits of a filter loaded with bool_mmap. Nothing to do otherwise.
+        '''
+
+        if self._mm is not None:
+
+            self._bits.release()
+
+            self._mm.close()
+
+            self._mm = None
+
+        else:
+
+            pass
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *args):
+
+        self.close()
+
+    def __len__(self):
+
+        return self.int_count
 
-    if str_type == 'int':
+    def __contains__(self, item):
 
-        list_temp = list(map(int, str_in.split(str_delimit)))
+        return self.boolHasDigest(intItemDigest(item))
 
-    else:
+    def add(self, item):
+        '''
+        Add an item. Return True if it was surely not in the filter.
+        '''
 
-        list_temp = list(map(float, str_in.split(str_delimit)))
+        return self.boolAddDigest(intItemDigest(item))
 
-    return list_temp
-# =============================================================================
-# </Function: convert a string of numbers to a list>
-# =============================================================================
+    def boolHasDigest(self, int_digest):
+        '''
+        Return whether a digest (see intItemDigest) may be in the filter.
+        '''
 
+        bytearray_bits = self._bits
 
+        int_bits = self.int_bits
 
-# =============================================================================
-# <Function: increase the given char by 1>
-# =============================================================================
-def strAdd1(str_in):
-    '''
-    .. _strAdd1 :
-    
-    This function increase the given character by one and returns the next character.
+        int_h1 = int_digest & 0xFFFFFFFFFFFFFFFF
 
-    Parameters
-    ----------
-    str_in : str
-        The input character. Only 1 character. Do not input strings.
-        
-    Returns
-    -------
-    str_temp : str
-        The character follows the given character.
+        int_h2 = (int_digest >> 64) | 1
 
-    Reference
-    ---------
-    https://stackoverflow.com/questions/19153462/get-excel-style-column-names-from-column-number
+        for i in range(self.int_hashes):
 
-    Example
-    -------
-    .. code:: python
+            int_pos = (int_h1 + i * int_h2) % int_bits
 
-        >>> in_1 = 'a'
-        >>> strAdd1(in_1)
-        'b'
-        >>> in_2 = 'z'
-        >>> strAdd1(in_2)
-        '{'
-        >>> in_3 = 'Z'
-        >>> strAdd1(in_3)
-        '['
-        >>> in_4 = 'X'
-        >>> strAdd1(in_4)
-        'Y'
-        >>>
-    '''
+            if not bytearray_bits[int_pos >> 3] & (1 << (int_pos & 7)):
 
-    str_temp = str_in
+                return False
 
-    str_temp = chr(ord(str_temp) + 1)
+            else:
 
-    return str_temp
-# =============================================================================
-# </Function: increase the given char by 1>
-# =============================================================================
+                pass
 
+        return True
 
+    def boolAddDigest(self, int_digest):
+        '''
+        Add a digest (see intItemDigest). Return True if it was surely not in the filter.
+        '''
 
-# =============================================================================
-# <Function: decrease the given char by 1>
-# =============================================================================
-def strMinus1(str_in):
-    '''
-    
-    '''
+        bytearray_bits = self._bits
 
-    str_temp = str_in
+        int_bits = self.int_bits
 
-    str_temp = chr(ord(str_temp) - 1)
+        int_h1 = int_digest & 0xFFFFFFFFFFFFFFFF
 
-    return str_temp
-# =============================================================================
-# </Function: decrease the given char by 1>
-# =============================================================================
+        int_h2 = (int_digest >> 64) | 1
 
+        bool_new = False
 
+        for i in range(self.int_hashes):
 
-# =============================================================================
-# <Function: create Excel column address (string) from column index (int)>
-# =============================================================================
-def strExcelColAddr(int_col):
-    '''
-    1 based index
-    '''
+            int_pos = (int_h1 + i * int_h2) % int_bits
 
-    str_col = []
+            int_mask = 1 << (int_pos & 7)
 
-    int_rem = 0
+            if not bytearray_bits[int_pos >> 3] & int_mask:
 
-    while int_col:
+                bytearray_bits[int_pos >> 3] |= int_mask
 
-        int_col, int_rem = divmod(int_col - 1, 26)
+                bool_new = True
 
-        str_col[:0] = CONST_STR_LETTERS[int_rem]
+            else:
 
-    str_temp = ''.join(str_col)
+                pass
+
+        if bool_new:
+
+            self.int_count = self.int_count + 1
+
+        else:
+
+            pass
+
+        return bool_new
+# ===========================================================================================
+# </Class: Bloom filter>
+# ===========================================================================================
 
-    return str_temp
-# =============================================================================
-# </Function: create Excel column address (string) from column index (int)>
-# =============================================================================
 
 
 # =============================================================================
-# <Function: create Excel cell address>
+# <Function: digest of an item for the duplicate detection>
 # =============================================================================
-def strExcelAddr(int_row, int_col):
-    """
-    .. _strExcelAddr :
-    
-    This function converts given row number and column number to an Excel-style cell name.
+def intItemDigest(item):
+    '''
+    .. _intItemDigest :
+
+    This function returns the 128-bit digest of an item, with xxhash (xxh3_128) if installed,
+    else with hashlib.blake2b. DigestSet keeps its lower 64 bits.
+
+    A str is hashed by its utf-8 encoding and a bytes object by itself. Any other item is
+    hashed by its repr(), so it needs a repr() identifying its value (e.g. int, float, tuple
+    of those). Items of different types never have the same input, e.g. 1 and '1'.
 
     Parameters
     ----------
-    *dicts : multiple given dictionaries.
-        
+    item : str, bytes or other
+        The item.
+
     Returns
     -------
-    int_row : int
-        The row number.
+    int :
+        The digest, 0 <= digest < 2**128.
+    '''
 
-    int_col : int
-        The column number.
+    return _intBytesDigest(_bytesItem(item))
 
-    Reference
-    ---------
-    https://stackoverflow.com/questions/19153462/get-excel-style-column-names-from-column-number
 
-    Example
-    -------
-    .. code:: python
 
-        >>> int_row = 2
-        >>> int_col = 10
-        >>> strExcelAddr(int_row, int_col)
-        'J2'
-        >>> int_row = 1
-        >>> int_col = 1
-        >>> strExcelAddr(int_row, int_col)
-        'A1'
-        >>> 
-    """
-    
-    # LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+def _bytesItem(item):
+    '''
+    Return the bytes identifying an item, the input of its digest.
+    '''
 
-    # result = []
+    if isinstance(item, str):
 
-    # while int_col:
+        return b's' + item.encode('utf-8', 'surrogatepass')
 
-    #     int_col, rem = divmod(int_col - 1, 26)
+    elif isinstance(item, bytes):
 
-    #     result[:0] = CONST_STR_LETTERS[rem]
+        return b'b' + item
 
-    str_col = strExcelColAddr(int_col)
+    else:
 
-    # return ''.join(result) + str(int_row)
+        return b'r' + repr(item).encode('utf-8', 'surrogatepass')
 
-    return str_col + str(int_row)
+
+
+def _intBytesDigest(bytes_item):
+    '''
+    Return the 128-bit digest of some bytes.
+    '''
+
+    if func_digest is None:
+
+        _loadDigest()
+
+    else:
+
+        pass
+
+    return func_digest(bytes_item)
 # =============================================================================
-# </Function: create Excel cell address>
+# </Function: digest of an item for the duplicate detection>
 # =============================================================================
 
 
 
 # =============================================================================
-# <Function: calculate Excel column index>
+# <Function: remove duplicates from a list>
 # =============================================================================
-def intExcelColIndex(str_Col, int_limit=16384):
+def listRmDupe(list_in):
     '''
+    https://www.w3schools.com/python/python_howto_remove_duplicates.asp
     '''
 
-    str_Col = str_Col.upper()
+    list_out = list(dict.fromkeys(list_in))
 
-    # reverse the input string for easier manipulation
-    str_Col = str_Col[::-1]
+    return list_out
+# =============================================================================
+# </Function: remove duplicates from a list>
+# =============================================================================
 
-    int_len = len(str_Col)
 
-    i = 0
 
-    int_index = 0
+# =============================================================================
+# <Function: check if all elements are unique in a 1-D list>
+# =============================================================================
+def boolAllUnique(list_in, bool_compact=False, filter_in=None):
+    '''
+    https://stackoverflow.com/questions/5278122/checking-if-all-elements-in-a-list-are-unique
 
-    for i in range(0, int_len):
+    list_in may be any iterable. With bool_compact, the seen items are kept in a DigestSet
+    instead of a set (11.5 to 23 bytes per item), at the very small chance of a digest collision
+    reporting False for unique items (see DigestSet).
+
+    With filter_in, a BloomFilter sized for the number of items (normally empty), the items are
+    added to a private copy of the filter and the ones it may have seen are collected. Then
+    list_in (which must be iterable twice, e.g. a list, not a generator, and hold hashable
+    items) is read again to check the collected ones exactly. The result is exact, and the
+    memory is the filter and the collected items. filter_in itself is not changed, so a loaded
+    (read-only) filter can be given too; the items already in it are just collected and checked
+    as well.
+    '''
 
-        str_temp = str_Col[i]
+    if filter_in is not None:
 
-        if str_temp in CONST_STR_LETTERS:
+        func_add = filter_in.copy().add
 
-            pass
+        set_candidate = {i for i in list_in if not func_add(i)}
 
-        else:
+        if not set_candidate:
 
-            str_msg = 'Input column address contains non alphabetical letter.'
+            return True
 
-            raise ValueError(str_msg)
+        else:
+
+            pass
 
-        int_pos = CONST_STR_LETTERS.index(str_temp)
+        seen = set()
 
-        int_pos = int_pos + 1
+        return not any(i in seen or seen.add(i) for i in list_in if i in set_candidate)
 
-        int_index = int_index + int_pos * (26**i)
+    elif bool_compact:
 
-    if int_index <= int_limit:
+        set_seen = DigestSet()
 
-        return int_index
+        return all(set_seen.add(i) for i in list_in)
 
     else:
 
-        str_Col = str_Col[::-1]
+        pass
 
-        str_msg = ('The input column address '
-                    +'"'
-                    + str_Col
-                    + ' ('
-                    + str(int_index)
-                    + ') '
-                    + '"' +
-                    ' is larger than the limit '
-                    + str(int_limit))
+    seen = set()
 
-        raise ValueError(str_msg)
+    return not any(i in seen or seen.add(i) for i in list_in)
 # =============================================================================
-# </Function: calculate Excel column index>
+# <Function: check if all elements are unique in a 1-D list>
 # =============================================================================
 
 
 
 # =============================================================================
-# <Function: merge dictionaries>
+# <Function: Get the duplicated elements and their indexes>
 # =============================================================================
-def dictMerge(*dicts):
+def genDupe(seq):
+    '''
+    https://stackoverflow.com/questions/5419204/index-of-duplicates-items-in-a-python-list
     '''
-    .. _dictMerge :
-    
-    This function mergers given dictionaries.
 
-    Parameters
-    ----------
-    *dicts : multiple given dictionaries.
+    tally = defaultdict(list)
+
+    for i,item in enumerate(seq):
+
+        tally[item].append(i)
         
-    Returns
-    -------
-    dict_temp : dictionary
-        The merged dictionary.
+    return ((key,locs) for key,locs in list(tally.items()) if len(locs)>1)
+# =============================================================================
+# </Function: Get the duplicated elements and their indexes>
+# =============================================================================
 
-    Example
-    -------
-    .. code:: python
 
-        >>> aa = {'a':1, 'b':2}
-        >>> cc = {'c':3, 'd':4}
-        >>> dictMerge(aa, cc)
-        {'a': 1, 'c': 3, 'b': 2, 'd': 4}
-        >>> dictMerge(aa)
-        {'a': 1, 'b': 2}
-        >>> ee = {1:100, 2:200}
-        >>> dictMerge(aa, cc, ee)
-        {'a': 1, 1: 100, 'c': 3, 'b': 2, 'd': 4, 2: 200}
-        >>>
+
+# =============================================================================
+# <Function: Check if two lists have any shared element>
+# =============================================================================
+def boolHaveShare(list_a, list_b, filter_a=None):
     '''
+    https://stackoverflow.com/questions/3170055/test-if-lists-share-any-items-in-python
 
-    # initialisation
-    dict_temp = {}
+    With filter_a, a BloomFilter of the items of list_a (e.g. BloomFilter.load() of a large
+    reference set), no set of list_a is built. The items of list_b the filter may contain are
+    collected, and list_a (any iterable, e.g. an opened file) is streamed once to confirm them
+    exactly, only if there is any. With list_a None, the unconfirmed answer of the filter is
+    returned, which may be a false positive.
+    '''
 
-    # loop through all the input parameters and merge them
-    for i in dicts:
+    if filter_a is None:
+
+        return not set(list_a).isdisjoint(list_b)
+
+    else:
+
+        pass
+
+    set_candidate = {i for i in list_b if i in filter_a}
+
+    if not set_candidate:
+
+        # the filter has no false negatives
+        return False
+
+    elif list_a is None:
 
-        dict_temp.update(i)
+        return True
 
-    return dict_temp
+    else:
+
+        return not set_candidate.isdisjoint(list_a)
 # =============================================================================
-# </Function: merge dictionaries>
+# </Function: Check if two lists have any shared element>
 # =============================================================================
 
 
 
 # =============================================================================
-# <Function: get an pseudo random int that is not in the list>
+# <Function: streaming duplicate detection>
 # =============================================================================
-def intGet(list_range):
+def genUnique(iter_in, key=None, bool_exact=False, int_capacity=CONST_INT_DEDUPE_CAPACITY,
+              float_fp_rate=0.001, str_dir_tmp=None):
     '''
-    .. _intGet :
-    
-    This function returns a pseudo randomly generated int that is not in the given list.
+    .. _genUnique :
 
-    This function would first try to get an int inside the min and max of the given list
-    but not in the list. After len(list_range) attempts, the max would be doubled to allow
-    a wider range for randoming.
+    This function yields the first occurrence of each item of an iterable, in order, i.e. the
+    streaming counterpart of listRmDupe. The input is never held in memory.
 
-    This function was originally written using recursion. But then I hit the limit of the 
-    stack. So I changed it to use iteration, which is limited by the size of memory.
+    By default, the seen items are kept in a DigestSet (11.5 to 23 bytes per distinct item), and
+    two items with the same 64-bit digest are taken as the same item (see DigestSet).
+
+    With bool_exact, the seen items are kept in a temporary SQLite table on disk, and a
+    BloomFilter sized for int_capacity distinct items (1.8 bytes per item at 0.1%) in memory.
+    Only the items the filter may have seen are looked up on disk, so for mostly unique input
+    the disk is mostly written in batches. The result is exact.
 
     Parameters
     ----------
-    list_range : list
-        A list of int. The return int will not be in this list.
+    iter_in : iterable
+        The items (see intItemDigest), e.g. an opened file.
 
-    Returns
-    -------
-    i : int
-        A pseudo randomly generated int that is not in the given list.
+    key : callable
+        The function returning the value identifying an item. Default = None (the item itself)
 
-    Example
-    -------
-    .. code:: python
+    bool_exact : bool
+        Whether to verify the possible duplicates exactly on disk. Default = False
 
-        >>> a = [1, 2, 3, 4, 5, 10]
-        >>> intGet(a)
-        7
-        >>> a = [1, 2, 3]
-        >>> intGet(a)
-        5
-        >>>
-    '''
+    int_capacity : int
+        The expected number of distinct items. Default = CONST_INT_DEDUPE_CAPACITY
 
-    # get min of the list
-    int_min = min(list_range)
+    float_fp_rate : float
+        The false positive rate of the filter of the exact mode. Default = 0.001
 
-    # get max of the list
-    int_max = max(list_range)
+    str_dir_tmp : str
+        The directory for the temporary table of the exact mode.
 
-    # get random
-    i = randint(int_min, int_max)
+        Default = None (system temp dir)
 
-    # iteration, limited by the size of memory
-    j = 0
+    Returns
+    -------
+    generator :
+        The unique items.
 
-    while i in list_range:
+    Examples
+    --------
+    .. code:: python
 
-        i = randint(int_min, int_max)
+        >>> list(genUnique(['b', 'a', 'b', 'c', 'a']))
+        ['b', 'a', 'c']
+        >>>
+    '''
 
-        j = j + 1
+    for (bool_first, item) in _genFlagFirst(iter_in, key, bool_exact, int_capacity, float_fp_rate, str_dir_tmp):
 
-        # this is to jump out of loop
-        if j > len(list_range):
+        if bool_first:
 
-            int_max = max(list_range) * 2
+            yield item
 
-    return i
-# =============================================================================
-# </Function: get an pseudo random int that is not in the list>
-# =============================================================================
+        else:
 
+            pass
 
 
-# =============================================================================
-# <Function: check if a process is running>
-# =============================================================================
-def boolProcessExists(str_process_fullname):
+
+def genDupeIndex(iter_in, key=None, bool_exact=False, int_capacity=CONST_INT_DEDUPE_CAPACITY,
+                 float_fp_rate=0.001, str_dir_tmp=None):
     '''
-    .. _boolProcessExists :
-    
-    This function checks whether a given process is running or not.
+    .. _genDupeIndex :
+
+    This function yields the index and the item of every repeated occurrence of an item of an
+    iterable, i.e. all but the first occurrence. It is the streaming counterpart of genDupe,
+    which keeps the indexes of all the items in memory.
 
     Parameters
     ----------
-    str_process_fullname : string
-        The fullname of the process
+    See genUnique.
 
     Returns
     -------
-    bool_temp : bool
-        True = process found; False = process not found
-
-    Reference
-    ---------
-    # https://stackoverflow.com/questions/7787120/python-check-if-a-process-is-running-or-not
+    generator :
+        The tuples (index, item) of the duplicates.
 
-    Example
-    -------
+    Examples
+    --------
     .. code:: python
 
-        >>> from gsyMain import *
-        >>> s = 'EXCEL.EXE'
-        >>> boolProcessExists(s)
-        True
-        >>> s = 'excel.exe'
-        >>> boolProcessExists(s)
-        True
-        >>> s = 'nosuchprocess.exe'
-        >>> boolProcessExists(s)
-        False
+        >>> list(genDupeIndex(['b', 'a', 'b', 'c', 'a']))
+        [(2, 'b'), (4, 'a')]
         >>>
     '''
 
-    call = 'TASKLIST', '/FI', 'imagename eq %s' % str_process_fullname
+    iter_flag = _genFlagFirst(iter_in, key, bool_exact, int_capacity, float_fp_rate, str_dir_tmp)
 
-    # use buildin check_output right away
-    output = subprocess.check_output(call)
+    for (i, (bool_first, item)) in enumerate(iter_flag):
 
-    # check in last line for process name
-    last_line = output.strip().split('\r\n')[-1]
+        if not bool_first:
 
-    last_line = last_line.lower()
+            yield (i, item)
 
-    bool_temp = last_line.startswith(str_process_fullname.lower())
+        else:
 
-    return bool_temp
-# =============================================================================
-# </Function: check if a process is running>
-# =============================================================================
+            pass
 
 
 
-# =============================================================================
-# <Function: get the first smallest value in a list>
-# =============================================================================
-def intFirstMin(list_numeric):
+def intRmDupeFile(str_path_in, str_path_out, bool_exact=False, int_capacity=CONST_INT_DEDUPE_CAPACITY,
+                  float_fp_rate=0.001, str_dir_tmp=None):
     '''
-    .. _intLastMin :
-    
-    This function scans the list from the start; finds the first smallest value and then returns
-    its index.
+    .. _intRmDupeFile :
+
+    This function removes the duplicated lines of a text file, keeping the first occurrence of
+    each line in order, and writes the result to another file (see genUnique).
+
+    The lines are compared as bytes, without their line endings, so no decoding is needed.
 
     Parameters
     ----------
-    list_numeric : list
-        The list to be scanned.
+    str_path_in : str
+        The path of the input file.
 
-        Ideally a numeric list (int or float). String lists also seems to work, but you need to know
-        what it means for string lists.
+    str_path_out : str
+        The path of the output file.
+
+    Others :
+        See genUnique.
 
     Returns
     -------
-    j : int
-        The index of the first smallest element in the input list.
+    int :
+        The number of lines removed.
 
     Examples
     --------
     .. code:: python
 
-        >>> from gsyMain import *
-        >>> a = [4, 3, 2, 1, 5, 0, 6]
-        >>> b = intFirstMin(a)
-        >>> b
-        3
-        >>> a[b]
-        1
+        >>> intRmDupeFile('c:/ids.txt', 'c:/ids_unique.txt', bool_exact=True, int_capacity=500 * 10**6)
+        1024
         >>>
     '''
 
-    # begin from the first element
-    i = 0
+    int_removed = 0
 
-    # initialisation
-    j = 0
+    with open(str_path_in, 'rb') as fin, open(str_path_out, 'wb') as fout:
 
-    # while loop search
-    while i <= (len(list_numeric) - 2):
+        iter_flag = _genFlagFirst(fin, _bytesStripNewline, bool_exact, int_capacity, float_fp_rate, str_dir_tmp)
 
-        # set old value as the current indexed one
-        old = list_numeric[i]
+        for (bool_first, bytes_line) in iter_flag:
 
-        # new value as the one behind the old one
-        new = list_numeric[i + 1]
+            if bool_first:
 
-        # if the new value is smaller than the old one, 
-        # need to look for the next one
-        if new < old:
+                if not bytes_line.endswith(b'\n'):
 
-            # since the new is smaller than the old, 
-            # set the var holding the stat to the index
-            # of the one before the old
-            j = i + 1
+                    bytes_line = bytes_line + b'\n'
 
-            pass
+                else:
 
-        # if the new value if bigger than the old one,
-        # that means the last smallest is found, break loop
-        else:
+                    pass
 
-            # since the old one is smaller the new one, 
-            # set the state var to the old one's index
-            j = i
-            
-            break
+                fout.write(bytes_line)
 
-        # index increment
-        i += 1
+            else:
 
-    # return the index found
-    return j
-# =============================================================================
-# </Function: get the first smallest value in a list>
-# =============================================================================
+                int_removed = int_removed + 1
 
+    return int_removed
 
 
-# =============================================================================
-# <Function: get the last smallest value in a list>
-# =============================================================================
-def intLastMin(list_numeric):
-    '''
-    .. _intLastMin :
-    
-    This function scans the list from the end; finds the first smallest value and then returns
-    its index.
 
-    Parameters
-    ----------
-    list_numeric : list
-        The list to be scanned.
+def _bytesStripNewline(bytes_line):
+    '''
+    Return a line without its line ending.
+    '''
 
-        Ideally a numeric list (int or float). String lists also seems to work, but you need to know
-        what it means for string lists.
+    return bytes_line.rstrip(b'\r\n')
 
-    Returns
-    -------
-    j : int
-        The index of the last smallest element in the input list.
 
-    Examples
-    --------
-    .. code:: python
 
-        >>> from gsyMain import *
-        >>> a = [1, 2, 3, 1, 4]
-        >>> b = intLastMin(a)
-        >>> b
-        3
-        >>> a[b]
-        1
-        >>>
+def _genFlagFirst(iter_in, key, bool_exact, int_capacity, float_fp_rate, str_dir_tmp):
+    '''
+    Yield (whether first occurrence, item) for each item. See genUnique.
     '''
 
-    # begin from the last element
-    i = len(list_numeric) - 1
-
-    # initialisation
-    j = 0
+    if not bool_exact:
 
-    # while loop search
-    while i >= 1:
+        set_seen = DigestSet(int_capacity)
 
-        # set old value as the current indexed one
-        old = list_numeric[i]
+        for item in iter_in:
 
-        # new value as the one before the old one
-        new = list_numeric[i - 1]
+            yield (set_seen.boolAddDigest(intItemDigest(item if key is None else key(item))), item)
 
-        # if the new value is smaller than the old one, 
-        # need to look for the next one
-        if new < old:
-            
-            # since the new is smaller than the old, 
-            # set the var holding the stat to the index
-            # of the one before the old
-            j = i - 1
+        return
 
-            pass
+    else:
 
-        # if the new value if bigger than the old one,
-        # that means the last smallest is found, break loop
-        else:
-            
-            # since the old one is smaller the new one, 
-            # set the state var to the old one's index
-            j = i
-            
-            break
+        pass
 
-        # index decrement
-        i -= 1
+    bloom = BloomFilter(int_capacity, float_fp_rate)
 
-    # return the index found
-    return j
-# =============================================================================
-# </Function: get the last smallest value in a list>
-# =============================================================================
+    sqlite3 = _loadModule('sqlite3')
 
+    with tempfile.TemporaryDirectory(dir=str_dir_tmp) as str_dir:
 
+        conn = sqlite3.connect(os.path.join(str_dir, 'seen.db'))
 
-# =============================================================================
-# <Function: convert a string to a list>
-# =============================================================================
-def listStr2List(str_in, str_delimiter=','):
-    '''
-    .. listStr2List :
-    
-    This function converts a string into a list.
+        try:
 
-    Parameters
-    ----------
-    str_in : string
-        The input string to be converted.
+            conn.execute('PRAGMA journal_mode = OFF')
 
-    str_delimiter : string
-        The delimiter of the string. The default is the comma.
+            conn.execute('PRAGMA synchronous = OFF')
 
-        Default = ','
+            conn.execute('CREATE TABLE seen (h INTEGER, v BLOB)')
 
-    Returns
-    -------
-    list_temp : list
-        The list results from conversion.
+            conn.execute('CREATE INDEX seen_h ON seen (h)')
 
-    Examples
-    --------
-    .. code:: python
+            # new items not yet written, written in batches
+            set_pending = set()
 
-        >>> a = 'abc|xyz'
-        >>> listStr2List(a, '|')
-        ['abc', 'xyz']
-        >>>
-    '''
+            list_pending = []
 
-    list_temp = str_in.split(str_delimiter)
+            for item in iter_in:
 
-    return list_temp
-# =============================================================================
-# </Function: convert a string to a list>
-# =============================================================================
+                bytes_item = _bytesItem(item if key is None else key(item))
 
+                int_digest = _intBytesDigest(bytes_item)
 
+                # signed 64-bit for SQLite
+                int_h = (int_digest & 0xFFFFFFFFFFFFFFFF) - (1 << 63)
 
-# =============================================================================
-# <Function: create a dir>
-# =============================================================================
-def boolMakeDir(str_dir):
-    '''
-    .. boolMakeDir :
-    
-    This function would attempt to create a directory.
+                if bloom.boolAddDigest(int_digest):
 
-    If the directory already exists, this function would do nothing and
-    returns False.
+                    bool_first = True
 
-    This function would also returns False on exception.
+                elif bytes_item in set_pending:
 
-    Parameters
-    ----------
-    str_dir : string
-        The directory path that this function would try to create.
+                    bool_first = False
 
-    Returns
-    -------
-    bool_temp : bool
-        True = dir not already exists and creation process has no exception.
+                else:
 
-        False = dir already exists or exception during creation.
-    '''
+                    bool_first = conn.execute('SELECT 1 FROM seen WHERE h = ? AND v = ? LIMIT 1',
+                                              (int_h, bytes_item)).fetchone() is None
 
-    bool_temp = boolPathExists(str_dir, True)
+                if bool_first:
 
-    # dir already exists
-    if bool_temp:
+                    set_pending.add(bytes_item)
 
-        print('The directory already exists.')
+                    list_pending.append((int_h, bytes_item))
 
-        return False
+                    if len(list_pending) >= 65536:
 
-    else:
+                        conn.executemany('INSERT INTO seen VALUES (?, ?)', list_pending)
 
-        try:
+                        set_pending = set()
 
-            os.makedirs(str_dir)
+                        list_pending = []
 
-        except:
+                    else:
 
-            print('Error during directory make.')
+                        pass
 
-            return False
+                else:
 
-        return True
-# =============================================================================
-# </Function: create a dir>
-# =============================================================================
+                    pass
 
+                yield (bool_first, item)
 
+        finally:
 
+            conn.close()
 # =============================================================================
-# <Function: prompt a yes no message box>
+# </Function: streaming duplicate detection>
 # =============================================================================
-def boolMsgYesno(str_title='', str_msg=''):
+
+
+
+def saveAsTxt(str_txt='', str_path_txt=''):
     '''
     '''
 
-    root = tk.Tk()
+    with open(str_path_txt, 'w+') as fout:
 
-    root.withdraw()
+        fout.write(str_txt)
 
-    bool_temp = False
 
-    bool_temp = msgbox.askyesno(str_title, str_msg)
 
-    root.destroy()
 
-    return bool_temp
 # =============================================================================
-# </Function: prompt a yes no message box>
+# <Function: form the diff search key of a CSV line>
 # =============================================================================
+def strCsvKey(str_line, str_delimiter=',', int_delimiter_index=2):
+    '''
+    .. _strCsvKey :
 
+    This function forms the search key of a CSV line for diffing.
 
+    The key is the string up to and include the indexed delimiter, i.e. the values of the first
+    int_delimiter_index + 1 cols and their delimiters.
 
-# =============================================================================
-# <Function: ask user to input an int
-# =============================================================================
-def intAskInt(str_title='', str_lbl=''):
-    '''
-    '''
+    If the line does not have enough delimiters, the whole line is used as the key.
 
-    root = tk.Tk()
+    Parameters
+    ----------
+    str_line : str
+        The CSV line.
 
-    root.withdraw()
+    str_delimiter : str
+        The delimiter of the CSV line.
 
-    int_temp = tkinter.simpledialog.askinteger(str_title, str_lbl, parent=root)
+        Default = ','
 
-    root.destroy()
+    int_delimiter_index : int
+        Zero based index of the delimiter for forming the key.
 
-    return int_temp
-# =============================================================================
-# </Function: ask user to input an int
-# =============================================================================
+        Default = 2
 
+    Returns
+    -------
+    str_key : str
+        The search key.
 
-# ===========================================================================================
-# <Function: decorator for saving a list (returned by the actual func) as a CSV file>
-# ===========================================================================================
-def savAsCsv(func):
-    '''
+    Examples
+    --------
+    .. code:: python
+
+        >>> strCsvKey('a,b,c,d,e\\n')
+        'a,b,c,'
+        >>> strCsvKey('a,b\\n')
+        'a,b\\n'
+        >>>
     '''
 
-    @wraps(func)
-    def wrapper(*args, **kwargs):
+    list_temp = str_line.split(str_delimiter, int_delimiter_index + 1)
 
-        # prompt file save as diglog
-        str_title = 'Save file as'
+    # not enough delimiters, the whole line is the key
+    if len(list_temp) <= int_delimiter_index + 1:
 
-        list_filter = [('CSV file', '.csv')]
+        return str_line
 
-        str_path_suffix = strSaveAsDialog(str_title=str_title,
-                                          str_init_dir=os.getcwd(),
-                                          str_ext='',
-                                          list_filetypes=list_filter)
+    else:
 
-        if str_path_suffix:
+        pass
 
-            list_temp = func(*args, **kwargs)
+    str_key = str_line[:len(str_line) - len(list_temp[-1])]
 
-            # write to CSV file
-            with open(str_path_suffix, 'w') as fout:
+    return str_key
+# =============================================================================
+# </Function: form the diff search key of a CSV line>
+# =============================================================================
 
-                for i in list_temp:
 
-                    fout.write(','.join(i))
-                    fout.write('\n')
 
-            str_msg = 'Suffix file exported : ' + str_path_suffix
+# =============================================================================
+# <Function: keyed diff engine for two iterables of CSV lines>
+# =============================================================================
+def tupleDiffLines(iter_data1, iter_data2, str_delimiter=',', int_delimiter_index=2):
+    '''
+    .. _tupleDiffLines :
 
-            print(str_msg)
+    This function is the keyed diff engine behind diffCsv.
 
-            return str_msg
+    Both inputs are loaded into insertion ordered hash sets (one copy each), and the 'Changed'
+    lines are found by a hash join on the search key (see strCsvKey). Every line is visited
+    a constant number of times, so the cost is linear in the total number of lines.
 
-        else:
+    A line of the second input that is not in the first input is 'Changed' if its key is also
+    the key of a line removed from the first input; otherwise it is 'Added'. A removed line
+    is 'Removed' only if no 'Changed' line shares its key.
 
-            pass
+    Parameters
+    ----------
+    iter_data1 : iterable
+        The lines of the base data, e.g. an opened file.
 
-    return wrapper
-# ===========================================================================================
-# </Function: decorator for saving a list (returned by the actual func) as a CSV file>
-# ===========================================================================================
+    iter_data2 : iterable
+        The lines of the data to compare against the base.
 
+    str_delimiter : str
+        The delimiter of the lines.
 
+    int_delimiter_index : int
+        Zero based index of the delimiter for forming search keys (see strCsvKey).
 
-# ===========================================================================================
-# <Function: to get the length of an integer>
-# ===========================================================================================
-def intLenInt(int_input):
-    '''
-    https://stackoverflow.com/questions/2189800/length-of-an-integer-in-python
+    Returns
+    -------
+    tuple :
+        (list_added_to_data1, list_changed_in_data1, list_removed_from_data1), without status
+        and in input order.
     '''
 
-    import math
+    # dicts are used as ordered sets
+    dict_data1 = dict.fromkeys(iter_data1)
+    dict_data2 = dict.fromkeys(iter_data2)
 
-    if int_input < 0:
+    list_removed_from_data1 = [i for i in dict_data1 if i not in dict_data2]
 
-        int_input = -1 * int_input
+    # the data are no longer needed once the removed lines are known
+    list_added_to_data1 = [i for i in dict_data2 if i not in dict_data1]
 
-    else:
+    dict_data1 = None
+    dict_data2 = None
 
-        pass
+    # hash index on the keys of the removed lines
+    set_key_removed = {strCsvKey(i, str_delimiter, int_delimiter_index) for i in list_removed_from_data1}
 
-    if (int_input > 0) and (int_input <= 999999999999997):
+    list_changed_in_data1 = []
 
-        int_length = int(math.log10(int_input)) + 1
+    list_temp = []
 
-    elif int_input > 999999999999997:
+    set_key_changed = set()
 
-        int_length = 15
+    # one pass through the added lines to split off the changed ones
+    for i in list_added_to_data1:
 
-        while int_input >= 10**int_length:
+        str_key = strCsvKey(i, str_delimiter, int_delimiter_index)
 
-            int_length += 1
+        if str_key in set_key_removed:
 
-    elif int_input == 0:
+            list_changed_in_data1.append(i)
 
-        int_length = 1
+            set_key_changed.add(str_key)
 
-    else:
+        else:
 
-        raise ValueError('Value Error')
+            list_temp.append(i)
 
-        # int_length = int(math.log10(-int_input)) + 1 # +1 if you don't count the '-' 
+    list_added_to_data1 = list_temp
 
-    return int_length
-# ===========================================================================================
-# </Function: to get the length of an integer>
-# ===========================================================================================
+    # the changed lines are no longer removed
+    list_removed_from_data1 = [i for i in list_removed_from_data1
+                                if strCsvKey(i, str_delimiter, int_delimiter_index) not in set_key_changed]
 
+    return (list_added_to_data1, list_changed_in_data1, list_removed_from_data1)
+# =============================================================================
+# </Function: keyed diff engine for two iterables of CSV lines>
+# =============================================================================
 
 
-# ===========================================================================================
-# <Function: get CSV header>
-# ===========================================================================================
-def listGetCsvHeader(str_path, str_delimiter=','):
-    '''
-    '''
 
-    list_header = []
+# =============================================================================
+# <Function: external (on-disk) diff engine for two iterables of CSV lines>
+# =============================================================================
+def genDiffLinesExternal(iter_data1, iter_data2, str_delimiter=',', int_delimiter_index=2,
+                         int_max_memory=CONST_INT_MAX_MEMORY, str_dir_tmp=None):
+    '''
+    .. _genDiffLinesExternal :
 
-    # get header
-    with open(str_path, 'r') as fin:
+    This function is the bounded memory counterpart of tupleDiffLines.
 
-        list_header = next(csv.reader(fin, delimiter=str_delimiter))
+    Both inputs are sorted by the search key into on-disk runs (see genExternalSort) and then
+    walked together key by key, so only the lines sharing one key are held in memory at a time.
+    The status of the lines are the same as in tupleDiffLines.
 
-    return list_header
-# ===========================================================================================
-# </Function: get CSV header>
-# ===========================================================================================
+    Parameters
+    ----------
+    iter_data1 : iterable
+        The lines of the base data, e.g. an opened file.
 
+    iter_data2 : iterable
+        The lines of the data to compare against the base.
 
+    str_delimiter : str
+        The delimiter of the lines.
 
-# ===========================================================================================
-# <Function: get CSV column data by column index>
-# ===========================================================================================
-def listGetCsvCol(str_path, int_indexCol, str_delimiter=','):
-    '''
-    .. _listGetCsvCol :
-    
-    This function gets the column data in the given CSV file by column index.
+    int_delimiter_index : int
+        Zero based index of the delimiter for forming search keys (see strCsvKey).
 
-    Parameters
-    ----------
-    str_path : str
-        The full file path of the CSV file.
+    int_max_memory : int
+        The approximate memory budget in bytes for sorting each input.
 
-    int_indexCol : int
-        The column index (0 based).
+    str_dir_tmp : str
+        The directory for the temporary run files. Default = None (system temp dir)
 
     Returns
     -------
-    list_data : list
-        The column data.
-
-    Reference
-    ----------
-    https://stackoverflow.com/questions/16503560/read-specific-columns-from-a-csv-file-with-csv-module
+    generator :
+        Tuples of (int_status, str_line) in the order of the search keys. The int_status is the
+        index in the tuple returned by tupleDiffLines, i.e. 0 = added, 1 = changed, 2 = removed.
     '''
 
-    cols = defaultdict(list)
+    func_key = lambda str_line: strCsvKey(str_line, str_delimiter, int_delimiter_index)
 
-    list_header = []
+    iter_group1 = groupby(genExternalSort(iter_data1, key=func_key, int_max_memory=int_max_memory,
+                                          str_dir_tmp=str_dir_tmp), key=func_key)
 
-    # get header
-    with open(str_path, 'r') as fin:
+    iter_group2 = groupby(genExternalSort(iter_data2, key=func_key, int_max_memory=int_max_memory,
+                                          str_dir_tmp=str_dir_tmp), key=func_key)
 
-        list_header = next(csv.reader(fin, delimiter=str_delimiter))
+    tuple_group1 = next(iter_group1, None)
+    tuple_group2 = next(iter_group2, None)
 
-    with open(str_path, 'r') as fin:
+    while (tuple_group1 is not None) or (tuple_group2 is not None):
 
-        reader = csv.DictReader(fin, delimiter=str_delimiter)
+        # key only in data1, removed
+        if (tuple_group2 is None) or ((tuple_group1 is not None) and (tuple_group1[0] < tuple_group2[0])):
 
-        for row in reader:
+            for i in dict.fromkeys(tuple_group1[1]):
 
-            for (k, v) in list(row.items()):
+                yield (2, i)
 
-                cols[k].append(v)
+            tuple_group1 = next(iter_group1, None)
 
-    list_data = cols[list_header[int_indexCol]]
+        # key only in data2, added
+        elif (tuple_group1 is None) or (tuple_group2[0] < tuple_group1[0]):
 
-    return list_data
-# ===========================================================================================
-# </Function: get CSV column data by column index>
-# ===========================================================================================
+            for i in dict.fromkeys(tuple_group2[1]):
 
+                yield (0, i)
 
+            tuple_group2 = next(iter_group2, None)
 
-# ===========================================================================================
-# <Function: start a file with system default application>
-# ===========================================================================================
-def start(str_path):
-    '''
-    .. start :
-    
-    This function starts a file using the system default application.
+        # key in both
+        else:
 
-    Parameters
-    ----------
-    str_path : str
-        The full file path of the file.
+            dict_data1 = dict.fromkeys(tuple_group1[1])
+            dict_data2 = dict.fromkeys(tuple_group2[1])
 
-    Returns
-    -------
-    None.
-    '''
+            list_removed = [i for i in dict_data1 if i not in dict_data2]
+            list_added   = [i for i in dict_data2 if i not in dict_data1]
 
-    os.startfile(str_path)
-# ===========================================================================================
-# </Function: start a file with system default application>
-# ===========================================================================================
+            if list_removed and list_added:
 
+                for i in list_added:
 
-# ===========================================================================================
-# <Function: concat CSV files using shutil>
-# ===========================================================================================
-def csvConcat(list_csv_file, str_path_out):
-    '''
-    .. _csvConcat :
-    
-    This function concats CSV files using shutil.
+                    yield (1, i)
 
-    All CSV files are assumed to have the same header and data format.
+            else:
 
-    Only the header of the first file will be kept. The actual data will be concated. 
+                for i in list_removed:
 
-    Parameters
-    ----------
-    list_csv_file : list
-        A str list of all the full paths of the CSV files.
+                    yield (2, i)
 
-    str_path_out : str
-        Full file path for the output CSV file (concated).
+                for i in list_added:
 
-    Raises
-    ----------
-    IO Error :
-        When operation fails.
+                    yield (0, i)
 
-    Returns
-    -------
-    None.
+            tuple_group1 = next(iter_group1, None)
+            tuple_group2 = next(iter_group2, None)
+# =============================================================================
+# </Function: external (on-disk) diff engine for two iterables of CSV lines>
+# =============================================================================
 
-    Reference
-    ----------------------
-    https://stackoverflow.com/questions/2512386/how-to-merge-200-csv-files-in-python
-    https://stackoverflow.com/questions/44791212/concatenating-multiple-csv-files-into-a-single-csv-with-the-same-header-python/44791368
+
+
+def _genLineEnded(iter_lines):
+    '''
+    Yield the lines, with a newline appended to the one without (the last line of a file).
     '''
 
-    try:
+    for str_line in iter_lines:
+
+        if str_line.endswith('\n'):
+
+            yield str_line
 
-        # use the shell utility to concate
-        with open(str_path_out, 'wb') as fout:
+        else:
 
-            for i, fname in enumerate(list_csv_file):
+            yield str_line + '\n'
 
-                # Throw away header on all but first file
-                with open(fname, 'rb') as infile:
 
-                    if i != 0:
 
-                        infile.readline()
+# =============================================================================
+# <Function: multi-process partitioned diff engine for two CSV files>
+# =============================================================================
+def listDiffFilesParallel(str_path_csv1, str_path_csv2, str_delimiter=',', int_delimiter_index=2,
+                          tuple_status=('Added', 'Changed', 'Removed'), bool_sort=True,
+                          int_processes=None, str_dir_tmp=None):
+    '''
+    .. _listDiffFilesParallel :
 
-                    # Block copy rest of file from input to output without parsing
-                    shutil.copyfileobj(infile, fout)
+    This function diffs two files in a process pool. It is the parallel mode of diffCsv.
 
-        return True
+    First, both files are cut into byte ranges on line boundaries, and each range is
+    hash-partitioned by the search key (see strCsvKey) into int_processes shards in the pool.
+    Lines sharing a key always fall into the same shard. Then each shard pair is diffed by
+    tupleDiffLines in the pool, and the status are added and sorted there as well.
 
-    except:
+    Parameters
+    ----------
+    str_path_csv1 : str
+        Full file path of the base file.
 
-        raise IOError('Failed to concat CSV files.')
-# ===========================================================================================
-# </Function: concat CSV files using shutil>
-# ===========================================================================================
+    str_path_csv2 : str
+        Full file path of the file to compare against the base.
 
+    str_delimiter : str
+        The delimiter of the lines.
 
+    int_delimiter_index : int
+        Zero based index of the delimiter for forming search keys (see strCsvKey).
 
-# ===========================================================================================
-# <Function: convert two lists into a dict>
-# ===========================================================================================
-def dict2Lists(list_key, list_val):
-    '''
-    .. _dict2Lists :
-    
-    This function converts two lists into one dictionary. Note that if the two lists do not have 
-    the same length, funny things may happen.
+    tuple_status : tuple
+        The status strings for 'Added', 'Changed' and 'Removed', in this order.
 
-    Parameters
-    ----------
-    list_key : list
-        The lists stores all the keys.
+    bool_sort : bool
+        Whether to natural sort the lines of each status in each shard.
 
-    list_val : list
-        The lists stores all the values.
+    int_processes : int
+        The number of processes and shards. Default = None (the number of CPUs)
+
+    str_dir_tmp : str
+        The directory for the temporary shard files. Default = None (system temp dir)
 
     Returns
     -------
-    dict_temp : dict
-        The converted dictionary.
-
-    Reference
-    ----------------------
-    https://stackoverflow.com/questions/209840/convert-two-lists-into-a-dictionary
+    list_shards : list
+        One tuple of (list_added_to_data1, list_changed_in_data1, list_removed_from_data1) per
+        shard, with the status added. Merge them with heapq.merge(..., key=tupleNaturalKey) if
+        sorted.
     '''
 
-    dict_temp = dict(list(zip(list_key, list_val)))
+    if not int_processes:
 
-    return dict_temp
-# ===========================================================================================
-# </Function: convert two lists into a dict>
-# ===========================================================================================
+        int_processes = os.cpu_count() or 1
 
+    else:
 
+        pass
 
-# ===========================================================================================
-# <Function: search and replace in a txt like file>
-# ===========================================================================================
-def boolFileReplace(dict_term, str_path_in, str_path_out):
-    '''
-    .. _boolFileReplace :
-    
-    This function opens a given txt like file, use the given dictionary to search and replace, 
-    then output the results to a new file.
+    str_encoding = locale.getpreferredencoding(False)
 
-    Note that you need to make sure that the keys and values of the dict_term are both strings. 
-    Otherwise, your out file may be empty.
+    futures = _loadModule('concurrent.futures')
 
-    Parameters
-    ----------
-    dict_term : dict
-        The dictionary that contains the search/replacement pairs.
+    with tempfile.TemporaryDirectory(dir=str_dir_tmp) as str_dir, \
+         futures.ProcessPoolExecutor(max_workers=int_processes) as executor:
 
-    str_path_in : str
-        Full file path of the input file.
+        # partition the byte ranges of both files
+        list_args = []
 
-    str_path_out : str
-        Full file path of the output file.
+        for (int_file, str_path) in enumerate((str_path_csv1, str_path_csv2)):
 
-    Returns
-    -------
-    bool : bool
-        True = no exception; False = on exception
+            for (int_chunk, (int_start, int_end)) in enumerate(_listFileChunks(str_path, int_processes)):
 
-    Reference
-    ----------------------
-    https://stackoverflow.com/questions/13089234/replacing-text-in-a-file-with-python
-    '''
+                str_prefix = os.path.join(str_dir, 'f' + str(int_file) + '_c' + str(int_chunk))
 
-    try:
+                list_args.append((str_path, int_start, int_end, str_encoding, str_delimiter,
+                                  int_delimiter_index, int_processes, str_prefix))
 
-        with open(str_path_in, 'r') as fin, open(str_path_out, 'w+') as fout:
+            if int_file == 0:
 
-            for line in fin:
+                int_count1 = len(list_args)
 
-                for src, target in dict_term.items():
+            else:
 
-                    if src in line:
+                pass
 
-                        line = line.replace(src, target)
+        list_prefix = list(executor.map(_listPartitionChunk, list_args))
 
-                    else:
+        list_prefix1 = list_prefix[:int_count1]
+        list_prefix2 = list_prefix[int_count1:]
 
-                        pass
+        # diff the shard pairs
+        list_args = [(list_prefix1, list_prefix2, i, str_delimiter, int_delimiter_index, tuple_status, bool_sort)
+                     for i in range(0, int_processes)]
 
-                fout.write(line)
+        list_shards = list(executor.map(_tupleDiffShard, list_args))
 
-        return True
+    return list_shards
 
-    except:
 
-        return False
-# ===========================================================================================
-#/ <Function: search and replace in a txt like file>
-# ===========================================================================================
 
+def _listFileChunks(str_path, int_chunks):
+    '''
+    Cut a file into about int_chunks byte ranges on line boundaries.
+    '''
 
+    int_size = os.path.getsize(str_path)
 
-# =============================================================================
-# <Function: get system local time and date>
-# =============================================================================
-def strLocalTime(str_format):
-    """
-    .. _strLocalTime :
-    
-    Return the system local date and time as a string according to the given format.
+    list_pos = [0]
 
-    Parameters
-    ----------
-    str_format : str
-        Date/Time code format.
+    with open(str_path, 'rb') as fin:
 
-        Example: '%Y-%m-%d, %H:%M:%S'
+        for i in range(1, int_chunks):
 
+            int_pos = int_size * i // int_chunks
 
-    Returns
-    -------
-    str_date_time : str
-        Formatted system local date time string.
-    """
+            if int_pos <= list_pos[-1]:
 
-    str_date_time = time.strftime(str_format, time.localtime())
+                continue
 
-    return str_date_time
-# =============================================================================
-# </Function: get system local time and date>
-# =============================================================================
+            else:
 
+                pass
 
+            # move to the start of the next line
+            fin.seek(int_pos - 1)
 
-# =============================================================================
-# <Function: find all the positions of a substring in a string>
-# =============================================================================
-def listPosInStr(str_in, str_sub):
-    '''
-    .. _listPosInStr :
-    
-    This function finds the positions of the str_sub in the str_in and returns them as a list.
+            fin.readline()
 
-    Parameters
-    ----------
-    str_in : str
-        The original string for searching.
+            int_pos = fin.tell()
 
-    str_sub : str
-        The substring to be searched.
+            if list_pos[-1] < int_pos < int_size:
 
-    Returns
-    -------
-    list_temp : list
-        The list that contains the positions of the str_sub
+                list_pos.append(int_pos)
 
-    Reference
-    ----------------------
-    https://stackoverflow.com/questions/2294493/how-to-get-the-position-of-a-character-in-python/32794963#32794963
-    '''
+            else:
 
-    list_temp = [pos for pos, char in enumerate(str_in) if char == str_sub]
+                pass
 
-    return list_temp
-# =============================================================================
-# </Function: find all the positions of a substring in a string>
-# =============================================================================
+    list_pos.append(int_size)
 
+    return list(zip(list_pos[:-1], list_pos[1:]))
 
 
-# =============================================================================
-# <Function: natural sort>
-# =============================================================================
-def listNaturalSort(l): 
+
+def _listPartitionChunk(tuple_args):
     '''
-    https://stackoverflow.com/questions/4836710/does-python-have-a-built-in-function-for-string-natural-sort
+    Partition the lines of one byte range by key into shard files. Run in the process pool.
     '''
-    convert = lambda text: int(text) if text.isdigit() else text.lower() 
 
-    alphanum_key = lambda key: [ convert(c) for c in re.split('([0-9]+)', key) ] 
+    (str_path, int_start, int_end, str_encoding, str_delimiter,
+     int_delimiter_index, int_shards, str_prefix) = tuple_args
 
-    return sorted(l, key = alphanum_key)
-# =============================================================================
-# </Function: natural sort>
-# =============================================================================
+    with open(str_path, 'rb') as fin:
 
+        fin.seek(int_start)
 
+        bytes_data = fin.read(int_end - int_start)
 
-# =============================================================================
-# <Function: remove duplicates from a list>
-# =============================================================================
-def listRmDupe(list_in):
-    '''
-    https://www.w3schools.com/python/python_howto_remove_duplicates.asp
-    '''
+    # same newline translation as opening the file in text mode
+    fin = io.StringIO(bytes_data.decode(str_encoding), newline=None)
 
-    list_out = list(dict.fromkeys(list_in))
+    bytes_data = None
 
-    return list_out
-# =============================================================================
-# </Function: remove duplicates from a list>
-# =============================================================================
+    list_shards = [[] for i in range(0, int_shards)]
 
+    for str_line in _genLineEnded(fin):
 
+        str_key = strCsvKey(str_line, str_delimiter, int_delimiter_index)
 
-# =============================================================================
-# <Function: check if all elements are unique in a 1-D list>
-# =============================================================================
-def boolAllUnique(list_in):
-    '''
-    https://stackoverflow.com/questions/5278122/checking-if-all-elements-in-a-list-are-unique
-    '''
+        int_shard = zlib.crc32(str_key.encode('utf-8', 'surrogatepass')) % int_shards
 
-    seen = set()
+        list_shards[int_shard].append(str_line)
 
-    return not any(i in seen or seen.add(i) for i in list_in)
-# =============================================================================
-# <Function: check if all elements are unique in a 1-D list>
-# =============================================================================
+    pickle = _loadModule('pickle')
 
+    for (i, list_lines) in enumerate(list_shards):
 
+        with open(str_prefix + '_s' + str(i) + '.pkl', 'wb') as fout:
 
-# =============================================================================
-# <Function: Get the duplicated elements and their indexes>
-# =============================================================================
-def genDupe(seq):
+            pickle.dump(list_lines, fout, pickle.HIGHEST_PROTOCOL)
+
+    return str_prefix
+
+
+
+def _genLoadShard(list_prefix, int_shard):
     '''
-    https://stackoverflow.com/questions/5419204/index-of-duplicates-items-in-a-python-list
+    Yield the lines of one shard from the shard files of all byte ranges, in file order.
     '''
 
-    tally = defaultdict(list)
+    pickle = _loadModule('pickle')
 
-    for i,item in enumerate(seq):
+    for str_prefix in list_prefix:
 
-        tally[item].append(i)
-        
-    return ((key,locs) for key,locs in list(tally.items()) if len(locs)>1)
-# =============================================================================
-# </Function: Get the duplicated elements and their indexes>
-# =============================================================================
+        with open(str_prefix + '_s' + str(int_shard) + '.pkl', 'rb') as fin:
 
+            yield from pickle.load(fin)
 
 
-# =============================================================================
-# <Function: Check if two lists have any shared element>
-# =============================================================================
-def boolHaveShare(list_a, list_b):
+
+def _tupleDiffShard(tuple_args):
     '''
-    https://stackoverflow.com/questions/3170055/test-if-lists-share-any-items-in-python
+    Diff one shard pair, add the status and sort. Run in the process pool.
     '''
 
-    return not set(list_a).isdisjoint(list_b)
-# =============================================================================
-# </Function: Check if two lists have any shared element>
-# =============================================================================
+    (list_prefix1, list_prefix2, int_shard, str_delimiter,
+     int_delimiter_index, tuple_status, bool_sort) = tuple_args
 
+    tuple_data = tupleDiffLines(_genLoadShard(list_prefix1, int_shard),
+                                _genLoadShard(list_prefix2, int_shard),
+                                str_delimiter=str_delimiter,
+                                int_delimiter_index=int_delimiter_index)
 
+    list_temp = []
 
-def saveAsTxt(str_txt='', str_path_txt=''):
-    '''
-    '''
+    for (str_status, list_data) in zip(tuple_status, tuple_data):
 
-    with open(str_path_txt, 'w+') as fout:
+        list_data = [str_status + str_delimiter + i for i in list_data]
 
-        fout.write(str_txt)
+        if bool_sort:
+
+            list_data = listNaturalSort(list_data)
+
+        else:
+
+            pass
 
+        list_temp.append(list_data)
+
+    return tuple(list_temp)
+# =============================================================================
+# </Function: multi-process partitioned diff engine for two CSV files>
+# =============================================================================
 
 
 
@@ -2344,7 +8640,7 @@ def saveAsTxt(str_txt='', str_path_txt=''):
 def diffCsv(str_path_csv1, str_path_csv2, str_path_out='', str_delimiter=',', 
             int_delimiter_index=2,
             str_status_added='Added',str_status_rmed='Removed',str_status_chnged='Changed',
-            bool_sort=True):
+            bool_sort=True, int_max_memory=0, str_dir_tmp=None, int_processes=1):
     '''
     .. _diffCsv :
     
@@ -2352,9 +8648,24 @@ def diffCsv(str_path_csv1, str_path_csv2, str_path_out='', str_delimiter=',',
 
     The base file is the first input file. The status are 'Added', 'Changed' and 'Removed'.
 
+    The 'Changed' lines are found by a hash join on the search keys (see tupleDiffLines), so the
+    diffing is linear in the number of lines.
+
     If an valid output file path is provided the data will be write to the file. 
     Otherwise, the data will be returned as a tuple.
 
+    If int_max_memory is given, the files are diffed in the external (on-disk) mode, see
+    genDiffLinesExternal. Both files are sorted by the search keys into temporary runs and merged,
+    and the rows are written to str_path_out as they are produced, so the files can be larger
+    than the memory. The same rows are output as in the default mode.
+
+    In all the modes, a last line without the trailing newline gets one before diffing, so it
+    matches the same line ending with a newline in the other file.
+
+    If int_processes is larger than 1, the files are diffed in the parallel mode, see
+    listDiffFilesParallel. Both files are hash-partitioned by the search keys into shards, the
+    shard pairs are diffed in a process pool, and the results are merged in the natural sort order.
+
     Parameters
     ----------
     str_path_csv1 : str
@@ -2402,6 +8713,26 @@ def diffCsv(str_path_csv1, str_path_csv2, str_path_out='', str_delimiter=',',
 
         Default = True
 
+    int_max_memory : int
+        The approximate memory budget in bytes for the external mode. The external mode is
+        used if it is larger than 0.
+
+        Only the rows written to str_path_out are bounded by the budget. If no output file path
+        is given, the rows are still returned as lists.
+
+        Default = 0 (diff in memory)
+
+    str_dir_tmp : str
+        The directory for the temporary files of the external mode.
+
+        Default = None (system temp dir)
+
+    int_processes : int
+        The number of processes (and shards) for the parallel mode. The parallel mode is used if
+        it is larger than 1 and int_max_memory is not given.
+
+        Default = 1 (diff in this process)
+
     Returns
     -------
     None : If the input argument str_path_out is valid. The data will be written to the file.
@@ -2412,101 +8743,126 @@ def diffCsv(str_path_csv1, str_path_csv2, str_path_out='', str_delimiter=',',
 
     list_header = listGetCsvHeader(str_path_csv1, str_delimiter=str_delimiter)
 
-    list_data1 = []
-    list_data2 = []
+    list_header = ['Status'] + list_header
 
-    with open(str_path_csv1, 'r') as fin1, open(str_path_csv2, 'r') as fin2:
+    str_header = str_delimiter.join(list_header) + '\n'
 
-        list_data1 = list(fin1)
+    tuple_status = (str_status_added, str_status_chnged, str_status_rmed)
 
-        list_data2 = list(fin2)
+    # external (on-disk) mode
+    if int_max_memory > 0:
 
-    set_data1 = set(list_data1)
-    set_data2 = set(list_data2)
+        with open(str_path_csv1, 'r') as fin1, open(str_path_csv2, 'r') as fin2:
 
-    set_removed_from_data1 = set_data1 - set_data2
-    set_added_to_data1     = set_data2 - set_data1
+            iter_diff = genDiffLinesExternal(_genLineEnded(fin1), _genLineEnded(fin2),
+                                             str_delimiter=str_delimiter,
+                                             int_delimiter_index=int_delimiter_index,
+                                             int_max_memory=int_max_memory,
+                                             str_dir_tmp=str_dir_tmp)
 
-    list_removed_from_data1 = list(set_removed_from_data1)
-    list_added_to_data1     = list(set_added_to_data1)
+            if str_path_out:
 
-    # form search keys
-    list_key = []
+                iter_data = (tuple_status[i] + str_delimiter + j for (i, j) in iter_diff)
 
-    for i in range(0, len(list_removed_from_data1)):
+                if bool_sort:
 
-        str_temp = list_removed_from_data1[i]
+                    iter_data = genExternalSort(iter_data, key=tupleNaturalKey,
+                                                int_max_memory=int_max_memory, str_dir_tmp=str_dir_tmp)
 
-        # find the positions of the delimiter
-        list_pos = [j.start() for j in re.finditer(str_delimiter, str_temp)]
+                else:
 
-        str_temp = str_temp[:list_pos[int_delimiter_index]+1]
+                    pass
 
-        list_key.append(str_temp)
+                # rows go to the file as they are produced
+                with open(str_path_out, 'w+') as fout:
 
+                    fout.write(str_header)
 
-    # search for the changed in the added to data1
-    # store the indices
-    list_index_changed_in_added_to = []
+                    fout.writelines(iter_data)
 
-    for i in list_key:
+                return
 
-        for k, v in enumerate(list_added_to_data1):
+            else:
 
-            if i in v:
+                tuple_data = ([], [], [])
 
-                list_index_changed_in_added_to.append(k)
+                for (i, j) in iter_diff:
 
-            else:
+                    tuple_data[i].append(tuple_status[i] + str_delimiter + j)
 
-                pass
+                (list_added_to_data1, list_changed_in_data1, list_removed_from_data1) = tuple_data
+
+        if bool_sort:
 
-    # get the changed data
-    list_changed_in_data1 = [list_added_to_data1[i] for i in list_index_changed_in_added_to]
+            list_added_to_data1     = listNaturalSort(list_added_to_data1)
+            list_changed_in_data1   = listNaturalSort(list_changed_in_data1)
+            list_removed_from_data1 = listNaturalSort(list_removed_from_data1)
 
-    # delete the changed in the added to data1
-    list_index_changed_in_added_to = sorted(list_index_changed_in_added_to, reverse=True)
+        else:
 
-    for i in list_index_changed_in_added_to:
+            pass
 
-        del list_added_to_data1[i]
+        return (list_added_to_data1, list_changed_in_data1, list_removed_from_data1)
 
-    # update the search key
-    list_key = []
+    # parallel mode
+    elif int_processes > 1:
 
-    for i in range(0, len(list_changed_in_data1)):
+        list_shards = listDiffFilesParallel(str_path_csv1, str_path_csv2,
+                                            str_delimiter=str_delimiter,
+                                            int_delimiter_index=int_delimiter_index,
+                                            tuple_status=tuple_status,
+                                            bool_sort=bool_sort,
+                                            int_processes=int_processes,
+                                            str_dir_tmp=str_dir_tmp)
 
-        str_temp = list_changed_in_data1[i]
+        # per status, in the order of 'Added', 'Changed' and 'Removed'
+        list_temp = [[i[j] for i in list_shards] for j in range(0, 3)]
 
-        # find the positions of the delimiter
-        list_pos = [j.start() for j in re.finditer(str_delimiter, str_temp)]
+        if bool_sort:
 
-        str_temp = str_temp[:list_pos[int_delimiter_index]+1]
+            list_temp = [list(heapq.merge(*i, key=tupleNaturalKey)) for i in list_temp]
 
-        list_key.append(str_temp)
+        else:
 
-    # search for the changed in the added to data1
-    # store the indices
-    list_index_changed_in_removed_from = []
+            list_temp = [[k for j in i for k in j] for i in list_temp]
 
-    for i in list_key:
+        (list_added_to_data1, list_changed_in_data1, list_removed_from_data1) = list_temp
 
-        for k, v in enumerate(list_removed_from_data1):
+        if str_path_out:
 
-            if i in v:
+            if bool_sort:
 
-                list_index_changed_in_removed_from.append(k)
+                iter_data = heapq.merge(list_removed_from_data1, list_added_to_data1, list_changed_in_data1,
+                                        key=tupleNaturalKey)
 
             else:
 
-                pass
+                iter_data = list_removed_from_data1 + list_added_to_data1 + list_changed_in_data1
+
+            with open(str_path_out, 'w+') as fout:
+
+                fout.write(str_header)
+
+                fout.writelines(iter_data)
+
+            return
+
+        else:
+
+            return (list_added_to_data1, list_changed_in_data1, list_removed_from_data1)
 
-    # delete the changed in the removed from data1
-    list_index_changed_in_removed_from = sorted(list_index_changed_in_removed_from, reverse=True)
+    else:
+
+        pass
 
-    for i in list_index_changed_in_removed_from:
+    # keyed diff in one linear pass
+    with open(str_path_csv1, 'r') as fin1, open(str_path_csv2, 'r') as fin2:
 
-        del list_removed_from_data1[i]
+        (list_added_to_data1,
+         list_changed_in_data1,
+         list_removed_from_data1) = tupleDiffLines(_genLineEnded(fin1), _genLineEnded(fin2),
+                                                   str_delimiter=str_delimiter,
+                                                   int_delimiter_index=int_delimiter_index)
 
     # add status
     for i in range(0, len(list_removed_from_data1)):
@@ -2531,10 +8887,6 @@ def diffCsv(str_path_csv1, str_path_csv2, str_path_out='', str_delimiter=',',
 
         pass
 
-    list_header = ['Status'] + list_header
-
-    str_header = str_delimiter.join(list_header) + '\n'
-
     list_data = [str_header] + list_data
 
     if str_path_out: